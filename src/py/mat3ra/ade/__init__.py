@@ -1,17 +1,33 @@
-from mat3ra.ade.application import Application
-from mat3ra.ade.executable import Executable
-from mat3ra.ade.flavor import Flavor, FlavorInput
-from mat3ra.ade.template import (
-    ContextProvider,
-    Template,
-)
-from mat3ra.ade.context.json_schema_data_provider import (
-    JSONSchemaDataProvider,
-)
-from mat3ra.ade.context.jinja_context_provider import JinjaContextProvider
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names are imported on first access, so that e.g. `from mat3ra.ade import Application`
+# does not load Jinja and the template rendering machinery.
+_MODULES_BY_NAME = {
+    "Application": "mat3ra.ade.application",
+    "ApplicationRegistry": "mat3ra.ade.application_registry",
+    "Executable": "mat3ra.ade.executable",
+    "Flavor": "mat3ra.ade.flavor",
+    "FlavorInput": "mat3ra.ade.flavor",
+    "Template": "mat3ra.ade.template",
+    "ContextProvider": "mat3ra.ade.context.context_provider",
+    "JinjaContextProvider": "mat3ra.ade.context.jinja_context_provider",
+    "JSONSchemaDataProvider": "mat3ra.ade.context.json_schema_data_provider",
+}
+
+if TYPE_CHECKING:
+    from mat3ra.ade.application import Application
+    from mat3ra.ade.application_registry import ApplicationRegistry
+    from mat3ra.ade.context.context_provider import ContextProvider
+    from mat3ra.ade.context.jinja_context_provider import JinjaContextProvider
+    from mat3ra.ade.context.json_schema_data_provider import JSONSchemaDataProvider
+    from mat3ra.ade.executable import Executable
+    from mat3ra.ade.flavor import Flavor, FlavorInput
+    from mat3ra.ade.template import Template
 
 __all__ = [
     "Application",
+    "ApplicationRegistry",
     "Executable",
     "Flavor",
     "FlavorInput",
@@ -20,3 +36,17 @@ __all__ = [
     "JinjaContextProvider",
     "JSONSchemaDataProvider",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _MODULES_BY_NAME.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    # only the public names, not the imports and names of this module
+    return sorted(__all__)
@@ -1,8 +1,10 @@
 from mat3ra.code.entity import InMemoryEntitySnakeCase
 from mat3ra.esse.models.software.application import ApplicationSchemaBase
 
+from .trusted_construction import TrustedConstructionMixin
 
-class Application(ApplicationSchemaBase, InMemoryEntitySnakeCase):
+
+class Application(ApplicationSchemaBase, InMemoryEntitySnakeCase, TrustedConstructionMixin):
     """
     Application class representing a software application.
 
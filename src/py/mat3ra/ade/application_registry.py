@@ -0,0 +1,213 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .application import Application
+from .executable import Executable
+from .flavor import Flavor
+from .template import Template
+
+Definitions = Mapping[str, Any]
+ApplicationKey = Tuple[str, Optional[str], Optional[str]]
+
+
+class ApplicationRegistry:
+    """
+    Registry of application, executable, flavor and template definitions, mirroring `ApplicationRegistry` in JS.
+    Definitions are loaded once, on first use, and indexed so that lookups do not scan the definition lists.
+    The registry can be used from several threads.
+
+    Definitions are a mapping with the following keys:
+        applications: Application data by name, each with `defaultVersion`, a list of `versions`
+            (with `version`, `build` and optionally `isDefault`) and any other application fields
+        executables: Executable configs by application name and executable name, each holding its
+            `flavors` by flavor name and optionally `supportedApplicationVersions`
+        templates: List of template configs with `applicationName`, `executableName`, `name` and `content`
+
+    Executables, flavors and templates of the registry are shared between calls.
+    Clone them before modifying, `get_input_as_templates` returns copies already.
+
+    Args:
+        definitions: Definitions or a function returning them, called on first use
+    """
+
+    def __init__(self, definitions: Union[Definitions, Callable[[], Definitions]]):
+        self._definitions = definitions
+        self._is_built = False
+        self._build_lock = Lock()
+        self.applications_tree: Dict[str, Dict[str, Any]] = {}
+        self.applications_array: List[Dict[str, Any]] = []
+        self._application_configs: Dict[ApplicationKey, Dict[str, Any]] = {}
+        self._default_builds: Dict[Tuple[str, str], str] = {}
+        self._executables: Dict[str, Dict[str, Executable]] = {}
+        self._executables_by_version: Dict[Tuple[str, Optional[str]], List[Executable]] = {}
+        self._default_executables: Dict[str, Executable] = {}
+        self._flavors_by_executable: Dict[int, Tuple[Executable, Dict[str, Flavor]]] = {}
+        self._templates: Dict[Tuple[str, str], List[Template]] = {}
+
+    def _build(self) -> None:
+        if self._is_built:
+            return
+        with self._build_lock:
+            # built by another thread while this one waited for the lock
+            if self._is_built:
+                return
+            definitions = self._definitions() if callable(self._definitions) else self._definitions
+            for name, application_data in definitions.get("applications", {}).items():
+                self._add_application(name, application_data)
+            for application_name, executables in definitions.get("executables", {}).items():
+                for executable_name, config in executables.items():
+                    self._add_executable(application_name, executable_name, config)
+            for config in definitions.get("templates", []):
+                template = Template(**config)
+                self._templates.setdefault((template.applicationName, template.executableName), []).append(template)
+            self._is_built = True
+
+    def _add_application(self, name: str, application_data: Mapping[str, Any]) -> None:
+        versions = application_data.get("versions", [])
+        data = {key: value for key, value in application_data.items() if key not in ("versions", "defaultVersion")}
+        tree_item: Dict[str, Any] = {"defaultVersion": application_data.get("defaultVersion")}
+        for version_info in versions:
+            version = version_info.get("version")
+            build = version_info.get("build")
+            config = {**data, "name": name, **version_info}
+            tree_item.setdefault(version, {})[build] = config
+            self.applications_array.append(config)
+            self._application_configs[(name, version, build)] = config
+            if version_info.get("isDefault") or (name, version) not in self._default_builds:
+                self._default_builds[(name, version)] = build
+        self.applications_tree[name] = tree_item
+
+    def _add_executable(self, application_name: str, executable_name: str, config: Mapping[str, Any]) -> None:
+        executable = Executable(**{**config, "name": executable_name})
+        self._executables.setdefault(application_name, {})[executable_name] = executable
+        if executable.isDefault or application_name not in self._default_executables:
+            self._default_executables[application_name] = executable
+        flavors = {
+            flavor_name: Flavor(
+                **{
+                    "applicationName": application_name,
+                    "executableName": executable_name,
+                    **flavor_config,
+                    "name": flavor_name,
+                }
+            )
+            for flavor_name, flavor_config in config.get("flavors", {}).items()
+        }
+        self._flavors_by_executable[id(executable)] = (executable, flavors)
+
+    def get_unique_available_application_names(self) -> List[str]:
+        self._build()
+        return list(self.applications_tree)
+
+    def get_all_applications(self) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return applications as a tree by name, version and build, and as a list of configs."""
+        self._build()
+        return self.applications_tree, self.applications_array
+
+    def get_application_config(
+        self, name: str, version: Optional[str] = None, build: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the config of an application.
+
+        Args:
+            name: Name of the application
+            version: Version of the application, defaults to the default version
+            build: Build of the application, defaults to the default build of the version
+
+        Raises:
+            ValueError: if the application is not found
+        """
+        self._build()
+        tree_item = self.applications_tree.get(name)
+        if tree_item is None:
+            raise ValueError(f"Application {name} not found")
+        version_ = version or tree_item["defaultVersion"]
+        build_ = build or self._default_builds.get((name, version_))
+        return self._application_configs.get((name, version_, build_))
+
+    def create_application(self, name: str, version: Optional[str] = None, build: Optional[str] = None) -> Application:
+        config = self.get_application_config(name, version, build) or {}
+        return Application(
+            **{
+                **config,
+                "name": name,
+                **({"version": version} if version else {}),
+                **({"build": build} if build else {}),
+            }
+        )
+
+    def get_executables(self, name: str, version: Optional[str] = None) -> List[Executable]:
+        """Get executables of an application, skipping those that do not support the given version."""
+        self._build()
+        key = (name, version)
+        if key not in self._executables_by_version:
+            self._executables_by_version[key] = [
+                executable
+                for executable in self._executables.get(name, {}).values()
+                if not getattr(executable, "supportedApplicationVersions", None)
+                or (version and version in executable.supportedApplicationVersions)
+            ]
+        return list(self._executables_by_version[key])
+
+    def get_executable_by_name(self, application_name: str, executable_name: Optional[str] = None) -> Executable:
+        """
+        Get an executable of an application by name, or the default one if no name is given.
+
+        Raises:
+            ValueError: if the executable is not found
+        """
+        self._build()
+        if executable_name is None:
+            executable = self._default_executables.get(application_name)
+        else:
+            executable = self._executables.get(application_name, {}).get(executable_name)
+        if executable is None:
+            raise ValueError(f"Executable {executable_name or 'default'} not found for application {application_name}")
+        return executable
+
+    def _get_flavors(self, executable: Executable) -> Dict[str, Flavor]:
+        self._build()
+        indexed = self._flavors_by_executable.get(id(executable))
+        if indexed is not None and indexed[0] is executable:
+            return indexed[1]
+        # executables created outside the registry carry their flavors as configs
+        flavors = getattr(executable, "flavors", None) or {}
+        return {name: Flavor(**{**config, "name": name}) for name, config in flavors.items()}
+
+    def get_executable_flavors(self, executable: Executable) -> List[Flavor]:
+        return list(self._get_flavors(executable).values())
+
+    def get_flavor_by_name(self, executable: Executable, name: Optional[str] = None) -> Optional[Flavor]:
+        """Get a flavor of an executable by name, or the default one if no name is given."""
+        flavors = self._get_flavors(executable)
+        if name is not None:
+            return flavors.get(name)
+        return next((flavor for flavor in flavors.values() if flavor.isDefault), None)
+
+    def get_all_flavors_for_application(self, application_name: str, version: Optional[str] = None) -> List[Flavor]:
+        return [
+            flavor
+            for executable in self.get_executables(application_name, version)
+            for flavor in self.get_executable_flavors(executable)
+        ]
+
+    def get_input_as_templates(self, flavor: Flavor) -> List[Template]:
+        """Get copies of the templates for the flavor's input, named after the resulting input files."""
+        self._build()
+        return flavor.get_input_templates(self._templates.get((flavor.applicationName, flavor.executableName), []))
+
+    def iterate_input_as_rendered_templates(
+        self, flavor: Flavor, context: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Render the templates for the flavor's input one at a time.
+        Pass the result to `write_json` to stream the rendered input to a file without holding all of it.
+        """
+        for template in self.get_input_as_templates(flavor):
+            yield template.get_rendered_dict(context)
+
+    def get_input_as_rendered_templates(
+        self, flavor: Flavor, context: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return list(self.iterate_input_as_rendered_templates(flavor, context))
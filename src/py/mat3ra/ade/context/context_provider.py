@@ -1,10 +1,48 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from mat3ra.code.entity import InMemoryEntitySnakeCase
 from mat3ra.esse.models.context_provider import ContextProviderSchema
+from pydantic import PrivateAttr, field_serializer
 
+from ..model_equality import fields_equal
+from ..rendering.fingerprint import get_structural_fingerprint
+from ..rendering.merge import merge_rendering_data_list
+from ..trusted_construction import TrustedConstructionMixin
+from .schema_validation import to_json_data
 
-class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase):
+
+def merge_rendering_data(result: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """
+    Merge rendering data yielded by a provider into result dictionary.
+    Merges keys if they are objects, otherwise overrides them.
+    """
+    for key, value in data.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = {**result[key], **value}
+        else:
+            result[key] = value
+
+
+def merge_providers_context_data(
+    result: Dict[str, Any],
+    providers: Iterable["ContextProvider"],
+    provider_context: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Merge rendering context data of the providers in order into result dictionary,
+    with the result of calling `merge_context_data` of each provider.
+    Objects that several providers contribute to are built once, so the cost is linear in the number of providers.
+
+    Args:
+        result: Dictionary to merge into (modified in place)
+        providers: Context providers to merge data of
+        provider_context: Optional external context to override providers' internal data
+    """
+    data_list = [result, *(provider.yield_data_for_rendering(provider_context) for provider in providers)]
+    result.update(merge_rendering_data_list(data_list))
+
+
+class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase, TrustedConstructionMixin):
     """
     Context provider for a template.
 
@@ -18,22 +56,72 @@ class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase):
         context: Context object for the context provider
     """
 
+    # name the keys were computed for, followed by name_str, is_edited_key and extra_data_key
+    _keys: Optional[Tuple[Any, str, str, str]] = PrivateAttr(default=None)
+    _revision: int = PrivateAttr(default=0)
+    # revision the fingerprint was computed for, followed by the fingerprint
+    _fingerprint: Optional[Tuple[int, str]] = PrivateAttr(default=None)
+
+    def __eq__(self, other: Any) -> bool:
+        # revisions and cached keys differ between providers with equal data
+        return fields_equal(self, other)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self.__pydantic_private__["_revision"] += 1
+
+    @field_serializer("data", "extraData", "context", when_used="json")
+    def serialize_json_data(self, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # numpy values, which data may hold for rendering, are saved as lists and Python scalars
+        return to_json_data(value)
+
+    @property
+    def revision(self) -> int:
+        """Incremented whenever a field is assigned, lets templates detect providers with changed data."""
+        return self.__pydantic_private__["_revision"]
+
+    def mark_as_changed(self) -> None:
+        """Call after modifying data, extra_data or context in place, which is not detected otherwise."""
+        self.__pydantic_private__["_revision"] += 1
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the provider's class and fields, equal for providers that yield the same data."""
+        private = self.__pydantic_private__
+        cached = private["_fingerprint"]
+        if cached is None or cached[0] != private["_revision"]:
+            cls = type(self)
+            fingerprint = get_structural_fingerprint([cls.__module__, cls.__qualname__, self.model_dump()])
+            cached = private["_fingerprint"] = (private["_revision"], fingerprint)
+        return cached[1]
+
     @property
     def default_data(self) -> Optional[Any]:
         """Override in subclasses to provide default data."""
         return None
 
+    def _get_keys(self) -> Tuple[Any, str, str, str]:
+        # read private state directly, pydantic's attribute lookup for private attributes is comparatively slow
+        keys = self.__pydantic_private__["_keys"]
+        if keys is None or keys[0] is not self.name:
+            name = self.name
+            name_str = name.value if hasattr(name, "value") else str(name)
+            keys = (name, name_str, f"is{name_str}Edited", f"{name_str}ExtraData")
+            self._keys = keys
+        return keys
+
     @property
     def name_str(self) -> str:
-        return self.name.value if hasattr(self.name, 'value') else str(self.name)
+        return self._get_keys()[1]
 
     @property
     def extra_data_key(self) -> str:
-        return f"{self.name_str}ExtraData"
+        return self._get_keys()[3]
 
     @property
     def is_edited_key(self) -> str:
-        return f"is{self.name_str}Edited"
+        return self._get_keys()[2]
 
     @property
     def is_unit_context_provider(self) -> bool:
@@ -43,12 +131,32 @@ class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase):
     def is_subworkflow_context_provider(self) -> bool:
         return self.entity_name == "subworkflow"
 
+    @property
+    def is_async(self) -> bool:
+        """Whether the provider resolves its data asynchronously, see `yield_data_async`."""
+        return type(self).yield_data_async is not ContextProvider.yield_data_async
+
+    def get_context_keys(self) -> Optional[Tuple[str, ...]]:
+        """
+        Keys of an external context that can change the data yielded for rendering.
+        Returns None when any key may matter, as for subclasses that override data resolution.
+        """
+        cls = type(self)
+        if (
+            cls.yield_data is not ContextProvider.yield_data
+            or cls.yield_data_for_rendering is not ContextProvider.yield_data_for_rendering
+            or self.is_async
+        ):
+            return None
+        return self._get_keys()[1:]
+
     def _get_data_from_context(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if not context:
             return {}
-        data = context.get(self.name_str)
-        is_edited = context.get(self.is_edited_key)
-        extra_data = context.get(self.extra_data_key)
+        _, name_str, is_edited_key, extra_data_key = self._get_keys()
+        data = context.get(name_str)
+        is_edited = context.get(is_edited_key)
+        extra_data = context.get(extra_data_key)
         result = {}
         if data is not None:
             result["data"] = data
@@ -58,29 +166,46 @@ class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase):
             result["extra_data"] = extra_data
         return result
 
+    def _get_effective_values(self, context: Optional[Dict[str, Any]] = None) -> Tuple[Any, Any, Any]:
+        """
+        Resolve data, is_edited and extra_data in a single pass over the context.
+        Values present in the context take precedence over the provider's own fields.
+        """
+        context = context or self.context
+        data = is_edited = extra_data = None
+        if context:
+            _, name_str, is_edited_key, extra_data_key = self._get_keys()
+            data = context.get(name_str)
+            is_edited = context.get(is_edited_key)
+            extra_data = context.get(extra_data_key)
+        if data is None:
+            data = self.data
+        if data is None:
+            data = self.default_data
+        if is_edited is None:
+            is_edited = self.isEdited
+        if extra_data is None:
+            extra_data = self.extraData
+        return data, is_edited, extra_data
+
     def _get_effective_data(self, context: Optional[Dict[str, Any]] = None) -> Any:
-        context_data = self._get_data_from_context(context or self.context)
-        effective_data = context_data.get("data", self.data)
-        return effective_data if effective_data is not None else self.default_data
+        return self._get_effective_values(context)[0]
 
     def _get_effective_is_edited(self, context: Optional[Dict[str, Any]] = None) -> bool:
-        context_data = self._get_data_from_context(context or self.context)
-        return context_data.get("is_edited", self.is_edited)
+        return self._get_effective_values(context)[1]
 
     def _get_effective_extra_data(self, context: Optional[Dict[str, Any]] = None) -> Optional[Any]:
-        context_data = self._get_data_from_context(context or self.context)
-        return context_data.get("extra_data", self.extra_data)
+        return self._get_effective_values(context)[2]
 
     def yield_data(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        data = self._get_effective_data(context)
-        is_edited = self._get_effective_is_edited(context)
-        extra_data = self._get_effective_extra_data(context)
+        data, is_edited, extra_data = self._get_effective_values(context)
+        _, name_str, is_edited_key, extra_data_key = self._get_keys()
         result = {
-            self.name_str: data,
-            self.is_edited_key: is_edited,
+            name_str: data,
+            is_edited_key: is_edited,
         }
         if extra_data:
-            result[self.extra_data_key] = extra_data
+            result[extra_data_key] = extra_data
         return result
 
     def yield_data_for_rendering(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -90,17 +215,33 @@ class ContextProvider(ContextProviderSchema, InMemoryEntitySnakeCase):
         """
         Merge this provider's rendering context data into result dictionary.
         Merges context keys if they are objects, otherwise overrides them.
+        Use `merge_providers_context_data` to merge data of many providers.
 
         Args:
             result: Dictionary to merge into (modified in place)
             provider_context: Optional external context to override provider's internal data
         """
-        context = self.yield_data_for_rendering(provider_context)
-        for key, value in context.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = {**result[key], **value}
-            else:
-                result[key] = value
+        merge_rendering_data(result, self.yield_data_for_rendering(provider_context))
+
+    async def yield_data_async(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Override in subclasses whose data comes from I/O, such as a database or an object store.
+        Used by `Template.arender`, which awaits the providers of a template concurrently.
+        Synchronous rendering keeps using `yield_data`.
+        """
+        return self.yield_data(context)
+
+    async def yield_data_for_rendering_async(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if not self.is_async:
+            # providers without asynchronous data resolution are resolved as in synchronous rendering
+            return self.yield_data_for_rendering(context)
+        return await self.yield_data_async(context)
+
+    async def amerge_context_data(
+        self, result: Dict[str, Any], provider_context: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Asynchronous version of `merge_context_data`."""
+        merge_rendering_data(result, await self.yield_data_for_rendering_async(provider_context))
 
     def get_data(self) -> Any:
         return self.data if self.data is not None else self.default_data
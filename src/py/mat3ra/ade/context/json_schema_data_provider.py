@@ -1,9 +1,153 @@
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import Field
+from jsonschema.protocols import Validator
+from pydantic import Field, PrivateAttr
 
+from ..rendering.fingerprint import get_stable_fingerprint
 from .jinja_context_provider import JinjaContextProvider
+from .schema_validation import (
+    SchemaValidationError,
+    ValidationErrorDict,
+    get_schema_hash,
+    get_validation_errors,
+    validator_cache,
+)
 
 
 class JSONSchemaDataProvider(JinjaContextProvider):
+    """
+    Context provider with a JSON schema of its data.
+
+    Data is validated against the schema by `validate_data` and `validate_many`, and when it is resolved for rendering
+    unless `validate_on_render` is turned off. Data is validated only when it changed:
+    the provider's revision, the data object or the schema object differ from the previous validation.
+    Data modified in place is validated again after `mark_as_changed`.
+    Numpy arrays and scalars in the data are validated as the lists and numbers they convert to.
+    Validators are created once per schema and shared by all providers, see `validator_cache`.
+
+    Attributes:
+        json_schema: JSON schema of the data
+        validate_on_render: Whether data is validated when it is resolved for rendering, not serialized
+    """
+
     json_schema: Optional[Dict[str, Any]] = Field(default=None, description="JSON schema for this provider")
+
+    validate_on_render: bool = Field(
+        default=True, exclude=True, description="Whether data is validated when it is resolved for rendering"
+    )
+
+    # schema object the hash was computed for, followed by the hash
+    _schema_hash: Optional[Tuple[Dict[str, Any], str]] = PrivateAttr(default=None)
+    # revision, data object and schema object of the last successful validation
+    _validated: Optional[Tuple[int, Any, Any]] = PrivateAttr(default=None)
+
+    @property
+    def schema_hash(self) -> Optional[str]:
+        """Hash of json_schema, None without a schema."""
+        schema = self.json_schema
+        if schema is None:
+            return None
+        private = self.__pydantic_private__
+        cached = private["_schema_hash"]
+        if cached is None or cached[0] is not schema:
+            cached = private["_schema_hash"] = (schema, get_schema_hash(schema))
+        return cached[1]
+
+    def _is_validated(self, data: Any, schema: Optional[Dict[str, Any]]) -> bool:
+        private = self.__pydantic_private__
+        validated = private["_validated"]
+        return (
+            validated is not None
+            and validated[0] == private["_revision"]
+            and validated[1] is data
+            and validated[2] is schema
+        )
+
+    def _set_validated(self, data: Any, schema: Optional[Dict[str, Any]]) -> None:
+        private = self.__pydantic_private__
+        private["_validated"] = (private["_revision"], data, schema)
+
+    def get_validation_errors(self, data: Any = None) -> List[ValidationErrorDict]:
+        """
+        Return the errors of data against json_schema, empty if data is valid or there is no schema.
+
+        Args:
+            data: Data to validate, the provider's data if not provided
+
+        Raises:
+            jsonschema.SchemaError: if json_schema is not a valid JSON schema
+        """
+        if self.json_schema is None:
+            return []
+        validator = validator_cache.get(self.json_schema, self.schema_hash)
+        return get_validation_errors(validator, self.get_data() if data is None else data)
+
+    def validate_data(self, data: Any = None) -> None:
+        """
+        Validate data against json_schema, skipped if it did not change since the last successful validation.
+        Providers without data or without a schema are valid.
+
+        Args:
+            data: Data to validate, the provider's data if not provided
+
+        Raises:
+            SchemaValidationError: if data does not match the schema
+            jsonschema.SchemaError: if json_schema is not a valid JSON schema
+        """
+        if data is None:
+            data = self.get_data()
+        schema = self.json_schema
+        if data is None or schema is None or self._is_validated(data, schema):
+            return
+        errors = self.get_validation_errors(data)
+        if errors:
+            raise SchemaValidationError(self.name_str, errors)
+        self._set_validated(data, schema)
+
+    def _get_effective_values(self, context: Optional[Dict[str, Any]] = None) -> Tuple[Any, Any, Any]:
+        values = super()._get_effective_values(context)
+        if self.validate_on_render:
+            self.validate_data(values[0])
+        return values
+
+    @staticmethod
+    def validate_many(providers: Iterable["JSONSchemaDataProvider"]) -> List[ValidationErrorDict]:
+        """
+        Validate the data of many providers, e.g. all providers of a definition set, without raising on errors.
+        Each schema is looked up once, providers whose data did not change since a successful validation are skipped,
+        and equal data of providers with equal schemas, e.g. defaults repeated across definitions, is validated once.
+
+        Args:
+            providers: Providers to validate
+
+        Returns:
+            Errors of all providers, each with the index and name of its provider added
+
+        Raises:
+            jsonschema.SchemaError: if a schema is not a valid JSON schema
+        """
+        errors: List[ValidationErrorDict] = []
+        validators: Dict[str, Validator] = {}
+        # errors by schema hash and data fingerprint
+        results: Dict[Tuple[str, str], List[ValidationErrorDict]] = {}
+        for index, provider in enumerate(providers):
+            schema = provider.json_schema
+            data = provider.get_data()
+            if data is None or schema is None or provider._is_validated(data, schema):
+                continue
+            schema_hash = provider.schema_hash
+            data_fingerprint = get_stable_fingerprint(data)
+            key = (schema_hash, data_fingerprint) if data_fingerprint is not None else None
+            provider_errors = results.get(key) if key is not None else None
+            if provider_errors is None:
+                validator = validators.get(schema_hash)
+                if validator is None:
+                    validator = validators[schema_hash] = validator_cache.get(schema, schema_hash)
+                provider_errors = get_validation_errors(validator, data)
+                if key is not None:
+                    results[key] = provider_errors
+            if provider_errors:
+                errors.extend({"index": index, "name": provider.name_str, **error} for error in provider_errors)
+            else:
+                provider._set_validated(data, schema)
+        return errors
@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Mapping, Optional
+
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+from ..rendering.fingerprint import get_stable_fingerprint, get_structural_fingerprint
+
+DEFAULT_CACHE_SIZE = 256
+
+# path of the invalid value in the data, message and name of the failed schema keyword, e.g.
+# {"path": ["dimensions", 0], "message": "'4' is not of type 'integer'", "validator": "type"}
+ValidationErrorDict = Dict[str, Any]
+
+
+def get_schema_hash(schema: Mapping[str, Any]) -> str:
+    # schemas are JSON and have a stable hash, other values are hashed by their structure
+    return get_stable_fingerprint(schema) or get_structural_fingerprint(schema)
+
+
+def to_json_data(data: Any) -> Any:
+    """
+    Return data with numpy arrays and scalars, which JSON schema types do not match, turned into lists and Python
+    scalars. Data without numpy values is returned as is.
+    """
+    if isinstance(data, dict):
+        converted = {key: to_json_data(value) for key, value in data.items()}
+        return data if all(converted[key] is value for key, value in data.items()) else converted
+    if isinstance(data, (list, tuple)):
+        items = [to_json_data(item) for item in data]
+        return data if all(item is original for item, original in zip(items, data)) else items
+    if hasattr(data, "tolist"):
+        return data.tolist()
+    return data
+
+
+def get_validation_errors(validator: Validator, data: Any) -> List[ValidationErrorDict]:
+    """Return the errors of data against the schema of validator, empty if data is valid."""
+    return [
+        {"path": list(error.absolute_path), "message": error.message, "validator": error.validator}
+        for error in validator.iter_errors(to_json_data(data))
+    ]
+
+
+class SchemaValidationError(ValueError):
+    """
+    Data of a context provider does not match its JSON schema.
+
+    Attributes:
+        errors: Errors found in the data, see `ValidationErrorDict`
+    """
+
+    def __init__(self, name: str, errors: List[ValidationErrorDict]):
+        self.errors = errors
+        details = "; ".join(f"{'/'.join(map(str, error['path'])) or '<root>'}: {error['message']}" for error in errors)
+        super().__init__(f"Data of {name} does not match its schema: {details}")
+
+
+class ValidatorCache:
+    """
+    LRU cache of JSON schema validators keyed by the hash of their schema.
+    Schemas are checked and validators created once, and shared by all providers with equal schemas.
+
+    Attributes:
+        max_size: Maximum number of validators kept in the cache
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that required creating a validator
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._validators: "OrderedDict[str, Validator]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def get(self, schema: Mapping[str, Any], schema_hash: Optional[str] = None) -> Validator:
+        """
+        Return the validator of schema, creating and caching it on a miss.
+
+        Args:
+            schema: JSON schema
+            schema_hash: Precomputed hash of schema, computed if not provided
+
+        Raises:
+            jsonschema.SchemaError: if schema is not a valid JSON schema
+        """
+        key = schema_hash or get_schema_hash(schema)
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                self.hits += 1
+                return validator
+            self.misses += 1
+
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+
+        with self._lock:
+            self._validators[key] = validator
+            while len(self._validators) > max(self.max_size, 0):
+                self._validators.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._validators),
+            "max_size": self.max_size,
+        }
+
+
+# Shared by all providers in the process
+validator_cache = ValidatorCache()
@@ -0,0 +1,295 @@
+import mmap
+import struct
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type
+
+from mat3ra.code.entity import InMemoryEntitySnakeCase
+
+from .application import Application
+from .executable import Executable
+from .flavor import Flavor
+from .rendering.atomic_file import open_atomic
+from .template import Template
+
+MAGIC = b"ADEDEFS1"
+KINDS = ("applications", "executables", "flavors", "templates")
+ENTITY_CLASSES: Dict[str, Type[InMemoryEntitySnakeCase]] = {
+    "applications": Application,
+    "executables": Executable,
+    "flavors": Flavor,
+    "templates": Template,
+}
+# fields stored in a fixed-width key table to look records up without decoding them
+KEY_FIELDS = ("name", "applicationName", "executableName")
+
+NO_STRING = 0xFFFFFFFF
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STRING, TAG_LIST, TAG_DICT = range(8)
+
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+KEY_ROW = struct.Struct("<" + "I" * len(KEY_FIELDS))
+# magic, string count, string offsets position, then record count, offsets position and key table position per kind
+HEADER = struct.Struct("<8sIQ" + "IQQ" * len(KINDS))
+
+
+class _StringTable:
+    def __init__(self):
+        self.indices: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        index = self.indices.get(value)
+        if index is None:
+            index = self.indices[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _encode(value: Any, strings: _StringTable, out: bytearray, field: str = "") -> None:
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int):
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError(f"Cannot store integer {value} of {field or 'value'}, it does not fit into 64 bits")
+        out.append(TAG_INT)
+        out += I64.pack(value)
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out += F64.pack(value)
+    elif isinstance(value, str):
+        out.append(TAG_STRING)
+        out += U32.pack(strings.intern(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(TAG_LIST)
+        out += U32.pack(len(value))
+        for index, item in enumerate(value):
+            _encode(item, strings, out, f"{field}[{index}]")
+    elif isinstance(value, Mapping):
+        out.append(TAG_DICT)
+        out += U32.pack(len(value))
+        for key, item in value.items():
+            out += U32.pack(strings.intern(str(key)))
+            _encode(item, strings, out, f"{field}.{key}" if field else str(key))
+    else:
+        raise TypeError(f"Cannot store value of type {type(value).__name__} of {field or 'value'}")
+
+
+def flatten_definitions(definitions: Mapping[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Turn definitions in the `ApplicationRegistry` format into lists of entity configs per kind."""
+    applications = []
+    for name, application_data in definitions.get("applications", {}).items():
+        data = {key: value for key, value in application_data.items() if key not in ("versions", "defaultVersion")}
+        applications.extend({**data, "name": name, **version_info} for version_info in application_data["versions"])
+
+    executables, flavors = [], []
+    for application_name, executable_configs in definitions.get("executables", {}).items():
+        for executable_name, config in executable_configs.items():
+            executables.append({**config, "name": executable_name, "applicationName": application_name})
+            for flavor_name, flavor_config in config.get("flavors", {}).items():
+                flavors.append(
+                    {
+                        "applicationName": application_name,
+                        "executableName": executable_name,
+                        **flavor_config,
+                        "name": flavor_name,
+                    }
+                )
+    return {
+        "applications": applications,
+        "executables": executables,
+        "flavors": flavors,
+        "templates": list(definitions.get("templates", [])),
+    }
+
+
+def write_definition_store(path: str, configs: Mapping[str, Sequence[Mapping[str, Any]]]) -> None:
+    """
+    Write entity configs into a compact binary snapshot for `DefinitionStore`.
+    All strings, including dictionary keys and template content, are stored once in a shared string table.
+    The file is replaced atomically.
+
+    Args:
+        path: Destination file
+        configs: Lists of configs by kind, see `KINDS` and `flatten_definitions`
+    """
+    strings = _StringTable()
+    sections: List[Tuple[int, bytes, bytes, bytes]] = []
+    for kind in KINDS:
+        records = bytearray()
+        offsets = bytearray()
+        key_rows = bytearray()
+        kind_configs = configs.get(kind, [])
+        for config in kind_configs:
+            offsets += U64.pack(len(records))
+            _encode(config, strings, records)
+            key_rows += KEY_ROW.pack(
+                *(
+                    strings.intern(config[field]) if isinstance(config.get(field), str) else NO_STRING
+                    for field in KEY_FIELDS
+                )
+            )
+        offsets += U64.pack(len(records))
+        sections.append((len(kind_configs), bytes(offsets), bytes(key_rows), bytes(records)))
+
+    encoded_strings = [value.encode("utf-8") for value in strings.strings]
+
+    position = HEADER.size
+    header_values: List[Any] = [MAGIC, len(encoded_strings), position]
+    position += U64.size * (len(encoded_strings) + 1) + sum(len(value) for value in encoded_strings)
+    for count, offsets, key_rows, records in sections:
+        # record offsets are relative to the records, which follow the offsets and the key table
+        header_values += [count, position, position + len(offsets)]
+        position += len(offsets) + len(key_rows) + len(records)
+
+    with open_atomic(path, "wb") as file:
+        file.write(HEADER.pack(*header_values))
+        string_position = HEADER.size + U64.size * (len(encoded_strings) + 1)
+        for value in encoded_strings:
+            file.write(U64.pack(string_position))
+            string_position += len(value)
+        file.write(U64.pack(string_position))
+        for value in encoded_strings:
+            file.write(value)
+        for _, offsets, key_rows, records in sections:
+            file.write(offsets)
+            file.write(key_rows)
+            file.write(records)
+
+
+class DefinitionStore:
+    """
+    Read-only, memory-mapped view of a definition snapshot written by `write_definition_store`.
+    The mapped file is shared between all processes that open it. Entities are decoded and
+    materialized into `Application`, `Executable`, `Flavor` and `Template` objects only when accessed,
+    and each access returns a new object.
+
+    Args:
+        path: Snapshot file
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._buffer, 0)
+        if header[0] != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a definition store")
+        self._string_count = header[1]
+        self._string_offsets_position = header[2]
+        # record count, offsets position and key table position by kind
+        self._sections = {kind: header[3 + 3 * index : 6 + 3 * index] for index, kind in enumerate(KINDS)}
+        # record indices by name, then by application name and executable name, per kind
+        self._key_indexes: Dict[str, Dict[str, Dict[Tuple[Optional[str], Optional[str]], List[int]]]] = {}
+
+    def __enter__(self) -> "DefinitionStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def count(self, kind: str) -> int:
+        return self._sections[kind][0]
+
+    def _get_string(self, index: int) -> str:
+        start, end = struct.unpack_from("<QQ", self._buffer, self._string_offsets_position + U64.size * index)
+        return self._buffer[start:end].decode("utf-8")
+
+    def _decode(self, position: int) -> Tuple[Any, int]:
+        buffer = self._buffer
+        tag = buffer[position]
+        position += 1
+        if tag == TAG_NONE:
+            return None, position
+        if tag == TAG_TRUE:
+            return True, position
+        if tag == TAG_FALSE:
+            return False, position
+        if tag == TAG_INT:
+            return I64.unpack_from(buffer, position)[0], position + I64.size
+        if tag == TAG_FLOAT:
+            return F64.unpack_from(buffer, position)[0], position + F64.size
+        if tag == TAG_STRING:
+            return self._get_string(U32.unpack_from(buffer, position)[0]), position + U32.size
+        length = U32.unpack_from(buffer, position)[0]
+        position += U32.size
+        if tag == TAG_LIST:
+            items = []
+            for _ in range(length):
+                item, position = self._decode(position)
+                items.append(item)
+            return items, position
+        result = {}
+        for _ in range(length):
+            key = self._get_string(U32.unpack_from(buffer, position)[0])
+            result[key], position = self._decode(position + U32.size)
+        return result, position
+
+    def get_config(self, kind: str, index: int) -> Dict[str, Any]:
+        count, offsets_position, key_table_position = self._sections[kind]
+        if not 0 <= index < count:
+            raise IndexError(f"{kind} index {index} out of range")
+        records_position = key_table_position + KEY_ROW.size * count
+        offset = U64.unpack_from(self._buffer, offsets_position + U64.size * index)[0]
+        return self._decode(records_position + offset)[0]
+
+    def get(self, kind: str, index: int) -> InMemoryEntitySnakeCase:
+        return ENTITY_CLASSES[kind](**self.get_config(kind, index))
+
+    def get_application(self, index: int) -> Application:
+        return self.get("applications", index)
+
+    def get_executable(self, index: int) -> Executable:
+        return self.get("executables", index)
+
+    def get_flavor(self, index: int) -> Flavor:
+        return self.get("flavors", index)
+
+    def get_template(self, index: int) -> Template:
+        return self.get("templates", index)
+
+    def iterate(self, kind: str) -> Iterator[InMemoryEntitySnakeCase]:
+        for index in range(self.count(kind)):
+            yield self.get(kind, index)
+
+    def _get_key_index(self, kind: str) -> Dict[str, Dict[Tuple[Optional[str], Optional[str]], List[int]]]:
+        if kind not in self._key_indexes:
+            count, _, key_table_position = self._sections[kind]
+            index: Dict[str, Dict[Tuple[Optional[str], Optional[str]], List[int]]] = {}
+            key_table = self._buffer[key_table_position : key_table_position + KEY_ROW.size * count]
+            for position, row in enumerate(KEY_ROW.iter_unpack(key_table)):
+                name, application_name, executable_name = (
+                    None if value == NO_STRING else self._get_string(value) for value in row
+                )
+                if name is not None:
+                    index.setdefault(name, {}).setdefault((application_name, executable_name), []).append(position)
+            self._key_indexes[kind] = index
+        return self._key_indexes[kind]
+
+    def find(
+        self, kind: str, name: str, application_name: Optional[str] = None, executable_name: Optional[str] = None
+    ) -> List[int]:
+        """
+        Return indices of the records of a kind with the given name, in the order they were written.
+        Records are also filtered by application name and executable name when these are given,
+        omitted ones match records with any value.
+        """
+        records = self._get_key_index(kind).get(name, {})
+        if application_name is not None and executable_name is not None:
+            return list(records.get((application_name, executable_name), []))
+        return sorted(
+            position
+            for (record_application_name, record_executable_name), positions in records.items()
+            if application_name in (None, record_application_name)
+            and executable_name in (None, record_executable_name)
+            for position in positions
+        )
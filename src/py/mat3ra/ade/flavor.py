@@ -1,10 +1,17 @@
-from typing import List
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from mat3ra.code.entity import InMemoryEntitySnakeCase
-from mat3ra.esse.models.software.flavor import FlavorSchema, \
-    ExecutionUnitInputIdItemSchemaForPhysicsBasedSimulationEngines
+from mat3ra.esse.models.software.flavor import (
+    ExecutionUnitInputIdItemSchemaForPhysicsBasedSimulationEngines,
+    FlavorSchema,
+)
 from pydantic import Field
 
+if TYPE_CHECKING:
+    from .template import Template
+
 
 class FlavorInput(ExecutionUnitInputIdItemSchemaForPhysicsBasedSimulationEngines):
     """
@@ -39,3 +46,64 @@ class Flavor(FlavorSchema, InMemoryEntitySnakeCase):
     """
 
     input: List[FlavorInput] = Field(default_factory=list, description="Input templates for this flavor")
+
+    def get_input_templates(self, templates: Iterable["Template"]) -> List["Template"]:
+        """
+        Select the templates for this flavor's input, in input order.
+        Each template is a copy named after the resulting input file.
+
+        Args:
+            templates: Candidate templates, matched by template name and, when set, application and executable names
+
+        Raises:
+            ValueError: if no template is found for an input
+        """
+        templates_by_name = {}
+        for template in templates:
+            if self.applicationName and template.applicationName not in (None, self.applicationName):
+                continue
+            if self.executableName and template.executableName not in (None, self.executableName):
+                continue
+            templates_by_name.setdefault(template.name, template)
+
+        input_templates = []
+        for flavor_input in self.input:
+            template_name = flavor_input.templateName or flavor_input.name
+            template = templates_by_name.get(template_name)
+            if template is None:
+                raise ValueError(f"Template {template_name} not found for flavor {self.name}")
+            input_templates.append(template.fork(name=flavor_input.name or template.name))
+        return input_templates
+
+    def write_input_files(
+        self,
+        templates: Iterable["Template"],
+        directory: str,
+        external_context: Optional[Dict[str, Any]] = None,
+        keep_rendered: bool = False,
+        use_session: bool = True,
+    ) -> List["Template"]:
+        """
+        Render this flavor's input templates straight into files in a directory, named after the input files.
+        Data of context providers shared between the templates is resolved once, see `RenderSession`.
+
+        Args:
+            templates: Candidate templates, see `get_input_templates`
+            directory: Directory to write the files to, created if missing
+            external_context: Context passed to Jinja and to the context providers
+            keep_rendered: Also set the rendered text to `rendered` of the returned templates
+            use_session: Render in a new `RenderSession`, otherwise providers are resolved per template, or shared
+                by a session the caller already entered
+
+        Returns:
+            Input templates, in input order
+        """
+        # imported here, so that importing Flavor does not load the rendering machinery
+        from .rendering.render_session import RenderSession
+
+        os.makedirs(directory, exist_ok=True)
+        input_templates = self.get_input_templates(templates)
+        with RenderSession() if use_session else nullcontext():
+            for template in input_templates:
+                template.render_to(os.path.join(directory, template.name), external_context, keep_rendered)
+        return input_templates
@@ -0,0 +1,18 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def fields_equal(first: BaseModel, second: Any) -> bool:
+    """
+    Compare models as pydantic does, by class, fields and extra values, without private attributes,
+    which hold caches and rendering state of each instance rather than its data.
+    Returns NotImplemented for other objects, to be returned from `__eq__`.
+    """
+    if not isinstance(second, BaseModel):
+        return NotImplemented
+    return (
+        type(first) is type(second)
+        and (first.__pydantic_extra__ or {}) == (second.__pydantic_extra__ or {})
+        and first.__dict__ == second.__dict__
+    )
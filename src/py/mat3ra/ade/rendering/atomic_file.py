@@ -0,0 +1,54 @@
+import os
+import stat
+import uuid
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Tuple
+
+# permissions requested for new files, narrowed by the process umask as for files created with `open`
+NEW_FILE_PERMISSIONS = 0o666
+
+
+def _create_temporary_file(path: str, prefix: str) -> Tuple[str, int]:
+    directory = os.path.dirname(os.path.abspath(path))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temporary_path = os.path.join(directory, f"{prefix}{uuid.uuid4().hex[:16]}.tmp")
+        try:
+            return temporary_path, os.open(temporary_path, flags, NEW_FILE_PERMISSIONS)
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def open_atomic(path: str, mode: str = "w", prefix: str = ".tmp-", **kwargs: Any) -> Iterator[IO]:
+    """
+    Open a temporary file next to path, which replaces path when the block exits without an error
+    and is removed otherwise, so that readers never see a partially written file.
+    The file gets the permissions of the file it replaces, or those of a file created with `open`.
+
+    Args:
+        path: Destination file
+        mode: Writing mode of `open`, e.g. "w" or "wb"
+        prefix: Prefix of the temporary file name
+        kwargs: Other arguments of `open`, e.g. encoding
+    """
+    temporary_path, descriptor = _create_temporary_file(path, prefix)
+    try:
+        try:
+            file = open(descriptor, mode, **kwargs)
+        except BaseException:
+            os.close(descriptor)
+            raise
+        with file:
+            yield file
+        try:
+            os.chmod(temporary_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.unlink(temporary_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,145 @@
+import fnmatch
+import json
+import os
+import sys
+import tempfile
+from threading import Lock
+from typing import FrozenSet, List, Optional, Tuple
+
+import jinja2
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+# sets the directory of the bytecode cache of the shared compiled template cache, e.g. for spawned worker processes
+BYTECODE_CACHE_DIR_ENV_VARIABLE = "MAT3RA_ADE_BYTECODE_CACHE_DIR"
+FILENAME_PREFIX = "mat3ra_ade_"
+
+
+def _get_version() -> str:
+    # bytecode is specific to the Jinja and Python versions, files of other versions are left for the cleanup
+    return f"jinja{jinja2.__version__}_py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+class DiskBytecodeCache(FileSystemBytecodeCache):
+    """
+    Jinja bytecode of compiled templates stored in a directory, shared between processes,
+    so that templates are not compiled again in every new worker process.
+    The variables that templates take from the rendering context are stored next to the bytecode,
+    first renders in a fresh process then neither compile nor parse the content.
+
+    Files are named after the content hash, Jinja and Python versions. They are written to a temporary file
+    and moved into place, so that many processes may write at once and readers never see partial files.
+    When the files grow over `max_size`, the least recently used ones are removed.
+
+    Bytecode depends on the settings of the Jinja environment that compiled it,
+    a directory must only be shared by caches with equally configured environments.
+
+    Usage:
+        compiled_template_cache.set_bytecode_cache(DiskBytecodeCache("~/.cache/mat3ra/bytecode"))
+
+    Args:
+        directory: Directory of the cache files, created if missing
+        max_size: Maximum total size of the files, in bytes
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory, f"{FILENAME_PREFIX}{_get_version()}_%s.cache")
+        self.max_size = max_size
+        self._variables_pattern = f"{FILENAME_PREFIX}{_get_version()}_%s.variables"
+        self._lock = Lock()
+
+    def get_cache_key(self, name: str, filename: Optional[str] = None) -> str:
+        # templates are named after the hash of their content
+        return name
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self._touch(self._get_cache_filename(bucket))
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        super().dump_bytecode(bucket)
+        # files are only written on misses, which are rare once the cache is warm
+        self.cleanup()
+
+    def load_required_variables(self, content_hash: str) -> Optional[FrozenSet[str]]:
+        """Return the stored variables of content with the hash, None on a miss."""
+        path = os.path.join(self.directory, self._variables_pattern % (content_hash,))
+        try:
+            with open(path) as file:
+                variables = frozenset(json.load(file))
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return variables
+
+    def dump_required_variables(self, content_hash: str, variables: FrozenSet[str]) -> None:
+        path = os.path.join(self.directory, self._variables_pattern % (content_hash,))
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=os.path.basename(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(sorted(variables), file)
+            os.replace(temporary_path, path)
+        except OSError:
+            # another process may have cleared the directory
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+        self.cleanup()
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _get_files(self) -> List[Tuple[float, int, str]]:
+        """Return modification time, size and path of the cache files of all versions."""
+        files = []
+        for filename in fnmatch.filter(os.listdir(self.directory), f"{FILENAME_PREFIX}*"):
+            if filename.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def get_size(self) -> int:
+        """Total size of the cache files, in bytes."""
+        return sum(size for _, size, _ in self._get_files())
+
+    def cleanup(self) -> None:
+        """Remove the least recently used files until the cache fits into `max_size`."""
+        with self._lock:
+            files = self._get_files()
+            excess = sum(size for _, size, _ in files) - self.max_size
+            for _, size, path in sorted(files):
+                if excess <= 0:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    # removed by another process
+                    pass
+                excess -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._get_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def get_default_bytecode_cache() -> Optional[DiskBytecodeCache]:
+    """Return a cache in the directory set by the environment variable, None if it is not set."""
+    directory = os.environ.get(BYTECODE_CACHE_DIR_ENV_VARIABLE)
+    return DiskBytecodeCache(directory) if directory else None
@@ -0,0 +1,166 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+from jinja2 import Environment
+from jinja2 import Template as JinjaTemplate
+from jinja2 import TemplateSyntaxError, meta
+
+from .bytecode_cache import DiskBytecodeCache, get_default_bytecode_cache
+from .filters import create_environment
+
+DEFAULT_CACHE_SIZE = 512
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_rendering_error_message(error: Exception, content: str, context: Mapping[str, Any]) -> str:
+    """Same message as `mat3ra.utils.extra.jinja.render_jinja_with_error_handling` produces."""
+    return f"Error rendering template: {str(error)}\nTemplate content:\n{content}\nTemplate variables:\n{dict(context)}"
+
+
+class CompiledTemplateCache:
+    """
+    LRU cache of compiled Jinja templates keyed by the hash of their content.
+    With a bytecode cache, templates missing here are loaded from disk before they are compiled.
+
+    Attributes:
+        environment: Jinja environment used to compile templates, by default one with the array filters
+        max_size: Maximum number of compiled templates kept in the cache
+        bytecode_cache: Cache of bytecode and required variables shared between processes
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that required compilation
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        environment: Optional[Environment] = None,
+        bytecode_cache: Optional[DiskBytecodeCache] = None,
+    ):
+        self.environment = environment or create_environment()
+        self.max_size = max_size
+        self.bytecode_cache = bytecode_cache
+        self.hits = 0
+        self.misses = 0
+        self._templates: "OrderedDict[str, JinjaTemplate]" = OrderedDict()
+        self._variables: "OrderedDict[str, Optional[FrozenSet[str]]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._templates
+
+    def get(self, content: str, content_hash: Optional[str] = None) -> JinjaTemplate:
+        """
+        Return the compiled template for content, compiling and caching it on a miss.
+
+        Args:
+            content: Template source
+            content_hash: Precomputed hash of content, computed if not provided
+
+        Raises:
+            jinja2.TemplateSyntaxError: if content cannot be compiled
+        """
+        key = content_hash or get_content_hash(content)
+        with self._lock:
+            compiled = self._templates.get(key)
+            if compiled is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = self._compile(content, key)
+
+        with self._lock:
+            self._templates[key] = compiled
+            self._templates.move_to_end(key)
+            self._evict()
+        return compiled
+
+    def get_required_variables(self, content: str, content_hash: Optional[str] = None) -> Optional[FrozenSet[str]]:
+        """
+        Return names of the variables that content takes from the rendering context, found by static analysis.
+        Returns None if content cannot be parsed.
+
+        Args:
+            content: Template source
+            content_hash: Precomputed hash of content, computed if not provided
+        """
+        key = content_hash or get_content_hash(content)
+        with self._lock:
+            if key in self._variables:
+                self._variables.move_to_end(key)
+                return self._variables[key]
+
+        variables = self._find_required_variables(content, key)
+
+        with self._lock:
+            self._variables[key] = variables
+            self._evict()
+        return variables
+
+    def _compile(self, content: str, key: str) -> JinjaTemplate:
+        """Same as `Environment.from_string`, with the bytecode taken from and stored in the bytecode cache."""
+        if self.bytecode_cache is None:
+            return self.environment.from_string(content)
+        bucket = self.bytecode_cache.get_bucket(self.environment, key, None, content)
+        code = bucket.code
+        if code is None:
+            code = self.environment.compile(content)
+            bucket.code = code
+            self.bytecode_cache.set_bucket(bucket)
+        return self.environment.template_class.from_code(self.environment, code, self.environment.make_globals(None))
+
+    def _find_required_variables(self, content: str, key: str) -> Optional[FrozenSet[str]]:
+        if self.bytecode_cache is not None:
+            variables = self.bytecode_cache.load_required_variables(key)
+            if variables is not None:
+                return variables
+        try:
+            variables = frozenset(meta.find_undeclared_variables(self.environment.parse(content)))
+        except TemplateSyntaxError:
+            return None
+        if self.bytecode_cache is not None:
+            self.bytecode_cache.dump_required_variables(key, variables)
+        return variables
+
+    def set_bytecode_cache(self, bytecode_cache: Optional[DiskBytecodeCache]) -> None:
+        """Set the cache of bytecode shared between processes, None to compile every template in the process."""
+        with self._lock:
+            self.bytecode_cache = bytecode_cache
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._variables.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._templates),
+            "max_size": self.max_size,
+        }
+
+    def _evict(self) -> None:
+        for cache in (self._templates, self._variables):
+            while len(cache) > max(self.max_size, 0):
+                cache.popitem(last=False)
+
+
+# Shared by all templates in the process
+compiled_template_cache = CompiledTemplateCache(bytecode_cache=get_default_bytecode_cache())
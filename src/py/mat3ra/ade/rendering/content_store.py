@@ -0,0 +1,85 @@
+import sys
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from .compiled_template_cache import get_content_hash
+
+DEFAULT_SWEEP_INTERVAL = 1024
+# references to a stored text while the sweep checks it: the store, the local variable and the argument
+_SWEEP_REFERENCES = 3
+
+
+class ContentStore:
+    """
+    Content-addressed store of template content. Equal texts are interned to one string object,
+    so that templates with the same content, e.g. of several application versions, share it.
+
+    Texts are released once nothing else references them. Python's own reference counts are checked
+    every `sweep_interval` interned texts, or when `sweep` is called.
+
+    Attributes:
+        sweep_interval: Number of interned texts between sweeps of unreferenced texts
+    """
+
+    def __init__(self, sweep_interval: int = DEFAULT_SWEEP_INTERVAL):
+        self.sweep_interval = sweep_interval
+        self._texts: Dict[str, str] = {}
+        # hashes of the stored string objects by their id, lets interned texts be recognized without hashing
+        self._hashes: Dict[int, str] = {}
+        self._interned_count = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._texts
+
+    def get(self, content_hash: str) -> Optional[str]:
+        return self._texts.get(content_hash)
+
+    def intern(self, text: str) -> Tuple[str, str]:
+        """
+        Return the stored string equal to text, storing text if there is none, and its content hash.
+        """
+        content_hash = self._hashes.get(id(text))
+        if content_hash is not None:
+            # ids of stored strings are not reused while the store holds them
+            return text, content_hash
+        content_hash = get_content_hash(text)
+        with self._lock:
+            stored = self._texts.get(content_hash)
+            if stored is None:
+                stored = self._texts[content_hash] = text
+                self._hashes[id(text)] = content_hash
+            self._interned_count += 1
+            if self._interned_count % self.sweep_interval == 0:
+                self._sweep()
+        return stored, content_hash
+
+    def _sweep(self) -> None:
+        for content_hash in list(self._texts):
+            text = self._texts[content_hash]
+            if sys.getrefcount(text) <= _SWEEP_REFERENCES:
+                del self._texts[content_hash]
+                del self._hashes[id(text)]
+
+    def sweep(self) -> None:
+        """Release the texts that nothing else references."""
+        with self._lock:
+            self._sweep()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._texts.clear()
+            self._hashes.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._texts),
+                "characters": sum(len(text) for text in self._texts.values()),
+            }
+
+
+content_store = ContentStore()
@@ -0,0 +1,35 @@
+from typing import AbstractSet, Any, Iterator, Mapping
+
+
+class ExcludedKeysView(Mapping):
+    """
+    Read-only view of a mapping that hides some of its keys.
+    Values are shared with the underlying mapping, nothing is copied.
+
+    Args:
+        mapping: Underlying mapping
+        excluded_keys: Keys hidden from the view
+    """
+
+    __slots__ = ("_mapping", "_excluded_keys")
+
+    def __init__(self, mapping: Mapping[str, Any], excluded_keys: AbstractSet[str]):
+        self._mapping = mapping
+        self._excluded_keys = excluded_keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._excluded_keys:
+            raise KeyError(key)
+        return self._mapping[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key not in self._excluded_keys and key in self._mapping
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._mapping if key not in self._excluded_keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
@@ -0,0 +1,125 @@
+"""
+Jinja filters formatting whole arrays of numbers in one call, e.g. atomic positions, lattice vectors or k-points,
+instead of template loops formatting one number at a time. Values may be numpy arrays or nested sequences.
+
+The output equals that of the loop the filter replaces, without the newline after the last row:
+
+    {% for vector in lattice.vectors -%}
+    {{ vector | join(' ') }}
+    {% endfor -%}
+
+is the same as
+
+    {{ lattice.vectors | format_array('%s') }}
+"""
+
+from typing import Any, Iterable, List
+
+from jinja2 import Environment
+
+DEFAULT_FORMAT = "%14.9f"
+
+
+# kinds of numpy values that convert to Python values formatting the same, e.g. float32 values do not
+_CONVERTIBLE_KINDS = frozenset("biuU")
+
+
+def _to_list(value: Any) -> List[Any]:
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and (dtype.kind in _CONVERTIBLE_KINDS or dtype == "float64"):
+        # converting numpy arrays to Python values at once is faster than formatting numpy scalars
+        return value.tolist()
+    return list(value)
+
+
+def _is_sequence(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) or getattr(value, "ndim", 0) > 0
+
+
+def _to_rows(value: Any) -> List[List[Any]]:
+    """Return the rows of a one or two dimensional array as lists of Python numbers."""
+    rows = _to_list(value)
+    if rows and not _is_sequence(rows[0]):
+        return [rows]
+    return [_to_list(row) for row in rows]
+
+
+def _format_rows(rows: List[List[Any]], row_format: str, values: List[Any]) -> str:
+    return "\n".join([row_format] * len(rows)) % tuple(values)
+
+
+def format_array(value: Any, format: str = DEFAULT_FORMAT, separator: str = " ") -> str:
+    """
+    Format numbers of an array, one row per line.
+    Same as formatting each number with `format | format(number)` in a loop, joined with separator.
+
+    Args:
+        value: One or two dimensional array or nested sequence of numbers
+        format: printf-style format of one number
+        separator: Text between the numbers of a row
+
+    Returns:
+        Formatted rows joined by newlines
+    """
+    rows = _to_rows(value)
+    if len({len(row) for row in rows}) > 1:
+        # rows of different lengths are formatted one by one
+        return "\n".join(format_array(row, format, separator) for row in rows)
+    width = len(rows[0]) if rows else 0
+    row_format = separator.replace("%", "%%").join([format] * width)
+    return _format_rows(rows, row_format, [number for row in rows for number in row])
+
+
+def format_table(
+    value: Any,
+    labels: Iterable[Any],
+    format: str = DEFAULT_FORMAT,
+    separator: str = " ",
+    label_format: str = "%s",
+) -> str:
+    """
+    Format numbers of an array one row per line, each row preceded by its label,
+    e.g. atomic positions preceded by the elements, or numbered with `range(1, n + 1)` as labels.
+
+    Args:
+        value: Two dimensional array or nested sequence of numbers
+        labels: Label of each row
+        format: printf-style format of one number
+        separator: Text between the label and the numbers of a row
+        label_format: printf-style format of the labels
+
+    Returns:
+        Formatted rows joined by newlines
+
+    Raises:
+        ValueError: if the number of labels differs from the number of rows
+    """
+    rows = _to_rows(value)
+    labels = _to_list(labels)
+    if len(labels) != len(rows):
+        raise ValueError(f"Expected {len(rows)} labels, got {len(labels)}")
+    separator = separator.replace("%", "%%")
+    if len({len(row) for row in rows}) > 1:
+        return "\n".join(
+            separator.join([label_format, *[format] * len(row)]) % (label, *row) for label, row in zip(labels, rows)
+        )
+    width = len(rows[0]) if rows else 0
+    row_format = separator.join([label_format, *[format] * width])
+    values: List[Any] = []
+    for label, row in zip(labels, rows):
+        values.append(label)
+        values.extend(row)
+    return _format_rows(rows, row_format, values)
+
+
+ARRAY_FILTERS = {
+    "format_array": format_array,
+    "format_table": format_table,
+}
+
+
+def create_environment() -> Environment:
+    """Return a Jinja environment with the array filters registered."""
+    environment = Environment()
+    environment.filters.update(ARRAY_FILTERS)
+    return environment
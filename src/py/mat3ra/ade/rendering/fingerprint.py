@@ -0,0 +1,106 @@
+import hashlib
+import json
+import pickle
+from enum import Enum
+from typing import Any, Mapping, Optional
+
+# prefix of type tags, strings of the data starting with it are escaped by doubling it
+_TAG = "\x00"
+_SCALAR_TYPES = frozenset({int, float, bool, type(None)})
+
+
+def _get_type_name(value: Any) -> str:
+    cls = type(value)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _escape(text: str) -> str:
+    return _TAG + text if text[:1] == _TAG else text
+
+
+def _sort_encoded(items: list) -> list:
+    return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+
+
+def _encode(value: Any, is_stable: bool = False) -> Any:
+    """
+    Turn a nested structure into plain JSON values, tagging the types Jinja renders differently from plain data:
+    tuples, sets, mappings with keys other than strings, enums, subclasses of built-in types, pydantic models
+    and numpy values. Plain JSON values are kept as they are.
+
+    Raises:
+        TypeError: if is_stable is set and the structure contains values that can only be encoded by their repr
+    """
+    value_type = type(value)
+    if value_type is str:
+        return _escape(value)
+    if value_type in _SCALAR_TYPES:
+        return value
+    if value_type is list:
+        if set(map(type, value)) <= _SCALAR_TYPES:
+            return value
+        return [_encode(item, is_stable) for item in value]
+    if value_type is dict or isinstance(value, Mapping):
+        if all(type(key) is str for key in value):
+            return {_escape(key): _encode(item, is_stable) for key, item in value.items()}
+        pairs = [[_encode(key, is_stable), _encode(item, is_stable)] for key, item in value.items()]
+        return [_TAG + "mapping", _sort_encoded(pairs)]
+    if value_type is tuple:
+        return [_TAG + "tuple", [_encode(item, is_stable) for item in value]]
+    if isinstance(value, (set, frozenset)):
+        return [_TAG + "set", _get_type_name(value), _sort_encoded([_encode(item, is_stable) for item in value])]
+    if isinstance(value, Enum):
+        return [_TAG + "enum", _get_type_name(value), value.name]
+    if hasattr(value, "tolist"):
+        # numpy arrays and scalars are told apart from lists of equal numbers, which render differently
+        return [_TAG + "numpy", type(value).__name__, str(getattr(value, "dtype", "")), value.tolist()]
+    if hasattr(value, "model_dump"):
+        return [_TAG + "model", _get_type_name(value), _encode(value.model_dump(), is_stable)]
+    for base in (str, int, float, list, tuple):
+        if isinstance(value, base):
+            # subclasses of built-in types may render differently from their base
+            return [_TAG + "subclass", _get_type_name(value), _encode(base(value), is_stable)]
+    if is_stable:
+        raise TypeError(f"Object of type {value_type.__name__} has no stable encoding")
+    return [_TAG + "repr", _get_type_name(value), repr(value)]
+
+
+def get_structural_fingerprint(value: Any) -> str:
+    """
+    Return a hash of a nested structure of mappings, sequences and scalars.
+    Equal structures give equal fingerprints regardless of mapping key order. Values of types that render
+    differently, e.g. a tuple and a list or keys 1 and "1", give different fingerprints.
+    """
+    encoded = json.dumps(_encode(value), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_snapshot_fingerprint(value: Any) -> str:
+    """
+    Return a hash of a nested structure that tells whether it changed since it was fingerprinted in this process,
+    much cheaper to compute than `get_structural_fingerprint`. The structure is hashed as it is pickled,
+    with the types of all values, so values of types that render differently give different fingerprints.
+    Equal structures with keys in a different order or with objects shared differently may give different
+    fingerprints too. Structures that cannot be pickled are fingerprinted with `get_structural_fingerprint`.
+    """
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, ValueError):
+        return get_structural_fingerprint(value)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def get_stable_fingerprint(value: Any) -> Optional[str]:
+    """
+    Return a hash of a nested structure of mappings, sequences and scalars that is the same in every process,
+    e.g. to key data stored on disk. Values are encoded with their types as in `get_structural_fingerprint`,
+    but never by their repr, which may differ between processes.
+
+    Returns:
+        Hash of the structure, None if it contains values without a stable encoding
+    """
+    try:
+        encoded = json.dumps(_encode(value, is_stable=True), sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
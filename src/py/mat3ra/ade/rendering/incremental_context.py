@@ -0,0 +1,201 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .merge import merge_rendering_data_list, merge_values
+from .render_session import (
+    async_provider_data_resolver,
+    get_current_render_session,
+    provider_data_resolver,
+)
+
+if TYPE_CHECKING:
+    from ..context.context_provider import ContextProvider
+
+_MISSING = object()
+
+# whether the external context was empty, followed by its values for the provider's context keys
+ContextSignature = Optional[Tuple[Any, ...]]
+
+
+def values_equal(first: Any, second: Any) -> bool:
+    if first is second:
+        return True
+    try:
+        return bool(first == second)
+    except (TypeError, ValueError):
+        # element-wise comparison of numpy arrays
+        if type(first) is not type(second) or getattr(first, "shape", None) is None:
+            return False
+        try:
+            return first.shape == second.shape and first.dtype == second.dtype and bool((first == second).all())
+        except (AttributeError, TypeError, ValueError):
+            return False
+
+
+def signatures_equal(first: ContextSignature, second: ContextSignature) -> bool:
+    if first is None or second is None or len(first) != len(second):
+        return False
+    return all(values_equal(a, b) for a, b in zip(first, second))
+
+
+class _ProviderState:
+    __slots__ = ("provider", "revision", "signature", "data")
+
+    def __init__(self, provider: "ContextProvider", revision: int, signature: ContextSignature, data: Dict[str, Any]):
+        self.provider = provider
+        self.revision = revision
+        self.signature = signature
+        self.data = data
+
+
+# provider, its state from the previous call or None if it must be resolved again, its revision and signature
+_ProviderEntry = Tuple["ContextProvider", Optional[_ProviderState], int, ContextSignature]
+
+
+class IncrementalRenderingContext:
+    """
+    Keeps the data yielded by each context provider together with the merged result and recomputes
+    only what changed between calls.
+
+    A provider is dirty when it was added, when it was assigned new field values (see `ContextProvider.revision`)
+    or when the external context changed for any of its context keys (see `ContextProvider.get_context_keys`).
+    Only the keys yielded by dirty providers are merged again, unless the providers or the keys they yield changed.
+    Keys that several providers yield objects for are merged again on every call, so that data modified in place
+    shows up as it does with a single provider, whose objects are passed on as they are.
+    """
+
+    def __init__(self):
+        self._states: List[_ProviderState] = []
+        self._merged: Optional[Dict[str, Any]] = None
+        # keys yielded by more than one provider
+        self._shared_keys: Set[str] = set()
+        self.provider_updates = 0
+
+    def invalidate(self) -> None:
+        self._states = []
+        self._merged = None
+        self._shared_keys = set()
+
+    @staticmethod
+    def get_context_signature(provider: "ContextProvider", provider_context: Dict[str, Any]) -> ContextSignature:
+        keys = provider.get_context_keys()
+        if keys is None:
+            return None
+        # providers fall back to their stored context when the external one is empty
+        return (bool(provider_context), *(provider_context.get(key, _MISSING) for key in keys))
+
+    def _get_outdated(
+        self, providers: Sequence["ContextProvider"], provider_context: Dict[str, Any]
+    ) -> Tuple[List[_ProviderEntry], bool]:
+        """
+        Match providers with the states of the previous call.
+
+        Returns:
+            Entry for each provider, and whether providers were added, removed or reordered
+        """
+        previous_positions = {id(state.provider): index for index, state in enumerate(self._states)}
+        entries = []
+        is_structure_changed = False
+        last_previous_index = -1
+        for provider in providers:
+            position = previous_positions.pop(id(provider), None)
+            state = None if position is None else self._states[position]
+            if position is not None:
+                is_structure_changed = is_structure_changed or position < last_previous_index
+                last_previous_index = position
+            revision = provider.revision
+            signature = self.get_context_signature(provider, provider_context)
+            if state is not None and (state.revision != revision or not signatures_equal(state.signature, signature)):
+                state = None
+            entries.append((provider, state, revision, signature))
+        return entries, is_structure_changed or bool(previous_positions)
+
+    def _update(
+        self,
+        entries: List[_ProviderEntry],
+        is_structure_changed: bool,
+        resolved_data: Iterable[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        previous_states = {id(state.provider): state for state in self._states}
+        resolved = iter(resolved_data)
+        states: List[_ProviderState] = []
+        affected_keys: Set[str] = set()
+        for provider, state, revision, signature in entries:
+            if state is None:
+                data = next(resolved)
+                self.provider_updates += 1
+                previous = previous_states.get(id(provider))
+                # providers added, removed, reordered or yielding different keys change the key order of the result
+                if previous is None or previous.data.keys() != data.keys():
+                    is_structure_changed = True
+                affected_keys.update(data)
+                state = _ProviderState(provider, revision, signature, data)
+            states.append(state)
+
+        self._states = states
+        if self._merged is None or is_structure_changed:
+            self._merged = self._merge_all(states)
+            self._shared_keys = self._get_shared_keys(states)
+        elif affected_keys or self._shared_keys:
+            self._merged = self._merge_keys(states, affected_keys | self._shared_keys, self._merged)
+        return self._merged
+
+    def get_provider_data(
+        self, providers: Sequence["ContextProvider"], provider_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Return data of all providers merged in order. The result is shared between calls and must not be modified.
+
+        Args:
+            providers: Context providers of a template
+            provider_context: External context passed to the providers
+        """
+        entries, is_structure_changed = self._get_outdated(providers, provider_context)
+        session = get_current_render_session()
+        resolve = provider_data_resolver if session is None else session.get_provider_data
+        resolved_data = [resolve(provider, provider_context) for provider, state, _, _ in entries if state is None]
+        return self._update(entries, is_structure_changed, resolved_data)
+
+    async def aget_provider_data(
+        self, providers: Sequence["ContextProvider"], provider_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Asynchronous version of `get_provider_data`, outdated providers are resolved concurrently."""
+        entries, is_structure_changed = self._get_outdated(providers, provider_context)
+        session = get_current_render_session()
+        resolve = async_provider_data_resolver if session is None else session.aget_provider_data
+        resolved_data = await asyncio.gather(
+            *(resolve(provider, provider_context) for provider, state, _, _ in entries if state is None)
+        )
+        return self._update(entries, is_structure_changed, resolved_data)
+
+    @staticmethod
+    def _merge_all(states: List[_ProviderState]) -> Dict[str, Any]:
+        return merge_rendering_data_list(state.data for state in states)
+
+    @staticmethod
+    def _get_shared_keys(states: List[_ProviderState]) -> Set[str]:
+        seen: Set[str] = set()
+        shared: Set[str] = set()
+        for state in states:
+            for key in state.data:
+                if key in seen:
+                    shared.add(key)
+                seen.add(key)
+        return shared
+
+    @staticmethod
+    def _merge_keys(states: List[_ProviderState], keys: Set[str], previous: Dict[str, Any]) -> Dict[str, Any]:
+        merged = dict(previous)
+        for key in keys:
+            merged[key] = merge_values([state.data[key] for state in states if key in state.data])
+        return merged
@@ -0,0 +1,188 @@
+import inspect
+import json
+import re
+import uuid
+from typing import Any, Callable, Iterator, List, Mapping, Optional, TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class _Encoder:
+    """Encodes the parts of a document that are not streamed, with `json` or `orjson`."""
+
+    def __init__(self, use_orjson: bool = False):
+        if use_orjson:
+            try:
+                import orjson
+            except ImportError as e:
+                raise ImportError("orjson is required to serialize with use_orjson=True") from e
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            self.dumps: Callable[[Any], str] = lambda value: orjson.dumps(value, option=options).decode("utf-8")
+            self.item_separator, self.key_separator = ",", ":"
+        else:
+            # same output as `json.dumps` with default arguments, which `to_json` uses
+            self.dumps = json.dumps
+            self.item_separator, self.key_separator = ", ", ": "
+
+    def dumps_key(self, key: Any) -> str:
+        # keys that are not strings are converted to strings as the encoder does for dictionaries
+        encoded = self.dumps({key: None})
+        return encoded[1 : encoded.rindex(self.key_separator)]
+
+
+class _ChunkBuffer:
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+        self.pieces: List[str] = []
+        self.size = 0
+
+    def add(self, piece: str) -> Optional[str]:
+        self.pieces.append(piece)
+        self.size += len(piece)
+        if self.size >= self.chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> str:
+        chunk = "".join(self.pieces)
+        self.pieces, self.size = [], 0
+        return chunk
+
+
+def _is_streamed(value: Any) -> bool:
+    return hasattr(value, "to_dict") or (isinstance(value, Iterator) and not isinstance(value, (str, bytes)))
+
+
+def _replace_long_strings(value: Any, max_length: int, token: str, long_strings: List[str]) -> Any:
+    """Copy a nested structure with strings longer than `max_length` replaced by numbered placeholders."""
+    if isinstance(value, str):
+        if len(value) <= max_length:
+            return value
+        long_strings.append(value)
+        return f"\x00{token}{len(long_strings) - 1}\x00"
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: _replace_long_strings(item, max_length, token, long_strings) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_long_strings(item, max_length, token, long_strings) for item in value]
+    return value
+
+
+def _iter_pieces(value: Any, encoder: _Encoder, chunk_size: int) -> Iterator[str]:
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+
+    if isinstance(value, Iterator) or (isinstance(value, (list, tuple)) and any(map(_is_streamed, value))):
+        # items are serialized one at a time, so entities and generated items are never held together
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield encoder.item_separator
+            yield from _iter_pieces(item, encoder, chunk_size)
+        yield "]"
+        return
+
+    if isinstance(value, Mapping) and any(map(_is_streamed, value.values())):
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield encoder.item_separator
+            yield encoder.dumps_key(key) + encoder.key_separator
+            yield from _iter_pieces(item, encoder, chunk_size)
+        yield "}"
+        return
+
+    # the rest of the structure is encoded at once, except for long strings that are encoded in slices
+    token = uuid.uuid4().hex
+    long_strings: List[str] = []
+    encoded = encoder.dumps(_replace_long_strings(value, chunk_size, token, long_strings))
+    if not long_strings:
+        yield encoded
+        return
+    parts = re.split(rf'"\\u0000{token}(\d+)\\u0000"', encoded)
+    yield parts[0]
+    for index in range(1, len(parts), 2):
+        text = long_strings[int(parts[index])]
+        yield '"'
+        for start in range(0, len(text), chunk_size):
+            yield encoder.dumps(text[start : start + chunk_size])[1:-1]
+        yield '"'
+        yield parts[index + 1]
+
+
+def iter_json_chunks(value: Any, chunk_size: int = DEFAULT_CHUNK_SIZE, use_orjson: bool = False) -> Iterator[str]:
+    """
+    Serialize a value to JSON in chunks of about `chunk_size` characters, without building the whole string.
+
+    Entities, such as templates and flavors, are serialized with `to_dict`. Items of iterators are serialized as
+    a JSON array one at a time, as are items of lists and values of dictionaries that hold entities.
+    Strings longer than `chunk_size` are encoded in slices.
+
+    Args:
+        value: Entity, or a structure of dictionaries, lists, iterators, entities and JSON scalars
+        chunk_size: Approximate size of the chunks
+        use_orjson: Encode with `orjson`, which produces compact UTF-8 output.
+            Otherwise the output is identical to `json.dumps`, as used by `to_json`.
+
+    Yields:
+        JSON text chunks
+    """
+    encoder = _Encoder(use_orjson)
+    chunk_size = max(chunk_size, 1)
+    buffer = _ChunkBuffer(chunk_size)
+    for piece in _iter_pieces(value, encoder, chunk_size):
+        chunk = buffer.add(piece)
+        if chunk is not None:
+            yield chunk
+    if buffer.pieces:
+        yield buffer.flush()
+
+
+def write_json(
+    value: Any,
+    file: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_orjson: bool = False,
+    encoding: Optional[str] = None,
+) -> None:
+    """
+    Write a value as JSON to a file-like object chunk by chunk, see `iter_json_chunks`.
+
+    Args:
+        value: Value to serialize
+        file: Object with a `write` method
+        chunk_size: Approximate size of the chunks
+        use_orjson: Encode with `orjson`
+        encoding: Encoding of the chunks for binary files, chunks are written as text if not set
+    """
+    for chunk in iter_json_chunks(value, chunk_size, use_orjson):
+        file.write(chunk.encode(encoding) if encoding else chunk)
+
+
+async def awrite_json(
+    value: Any,
+    writer: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_orjson: bool = False,
+    encoding: Optional[str] = None,
+) -> None:
+    """
+    Write a value as JSON to an asynchronous writer chunk by chunk, see `iter_json_chunks`.
+    Writers whose `write` returns an awaitable, such as `aiofiles` files, are awaited after each chunk,
+    and writers with a `drain` method, such as `asyncio.StreamWriter`, are drained after each chunk.
+
+    Args:
+        value: Value to serialize
+        writer: Asynchronous writer
+        chunk_size: Approximate size of the chunks
+        use_orjson: Encode with `orjson`
+        encoding: Encoding of the chunks for binary writers, chunks are written as text if not set
+    """
+    drain = getattr(writer, "drain", None)
+    for chunk in iter_json_chunks(value, chunk_size, use_orjson):
+        result = writer.write(chunk.encode(encoding) if encoding else chunk)
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
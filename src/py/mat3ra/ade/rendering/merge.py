@@ -0,0 +1,43 @@
+from typing import Any, Dict, Iterable, List
+
+
+def merge_values(values: Iterable[Any]) -> Any:
+    """
+    Combine values contributed to one key by several providers, as repeated `merge_rendering_data` calls do:
+    objects are merged, other values override. Only the trailing run of objects contributes to the result,
+    which is built once, in time linear in the number of their entries.
+    """
+    values = values if isinstance(values, list) else list(values)
+    start = len(values) - 1
+    if not isinstance(values[start], dict):
+        return values[start]
+    while start > 0 and isinstance(values[start - 1], dict):
+        start -= 1
+    if start == len(values) - 1:
+        return values[start]
+    merged: Dict[str, Any] = {}
+    for value in values[start:]:
+        merged.update(value)
+    return merged
+
+
+def merge_rendering_data_list(data_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge rendering data yielded by several providers in order, with the result of merging them one by one
+    with `merge_rendering_data`. Contributions are collected per key and each merged object is materialized once,
+    instead of being copied for every provider contributing to it.
+    """
+    merged: Dict[str, Any] = {}
+    # all contributions of keys that several providers contribute to
+    contributions: Dict[str, List[Any]] = {}
+    for data in data_list:
+        for key, value in data.items():
+            if key not in merged:
+                merged[key] = value
+            elif key in contributions:
+                contributions[key].append(value)
+            else:
+                contributions[key] = [merged[key], value]
+    for key, values in contributions.items():
+        merged[key] = merge_values(values)
+    return merged
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from jinja2 import TemplateError
+
+from ..flavor import Flavor
+from ..template import Template
+from .compiled_template_cache import compiled_template_cache
+
+DEFAULT_CHUNK_SIZE = 256
+
+# content hash and rendering context with the referenced variables of one rendering
+RenderingTask = Tuple[str, Dict[str, Any]]
+
+
+def _render_chunk(contents: Dict[str, str], tasks: List[RenderingTask]) -> List[Optional[str]]:
+    """
+    Render a chunk of tasks in a worker process, compiled templates are cached per process.
+    Renderings that fail are returned as None, the calling process builds their error message
+    from the full rendering context, which workers do not receive.
+    """
+    results: List[Optional[str]] = []
+    for content_hash, context in tasks:
+        content = contents[content_hash]
+        try:
+            rendered = compiled_template_cache.get(content, content_hash).render(context)
+        except TemplateError:
+            results.append(None)
+            continue
+        results.append(rendered or content)
+    return results
+
+
+class ParallelRenderer:
+    """
+    Renders templates across a pool of worker processes.
+    Provider data is resolved in the calling process, so workers receive only the template content,
+    its hash and the variables of the rendering context that content references. Results are returned in input order.
+
+    The pool is started on the first parallel render and kept, with the templates compiled by its workers,
+    until `close` is called or the `with` block of the renderer exits.
+
+    Usage:
+        with ParallelRenderer() as renderer:
+            rendered = renderer.render(templates, contexts)
+
+    Args:
+        max_workers: Number of worker processes, defaults to the number of CPUs. 1 renders in the calling process.
+        chunk_size: Number of renderings sent to a worker at once
+        mp_context: Multiprocessing context used to start workers
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, mp_context: Optional[Any] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, 1)
+        self.mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelRenderer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the worker processes down, a later parallel render starts a new pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+        return self._pool
+
+    def render(
+        self, templates: Sequence[Template], contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> List[str]:
+        """
+        Render each template against the external context at the same position.
+        Manually changed templates are not rendered and keep their current content, as with `Template.render`.
+
+        Args:
+            templates: Templates to render
+            contexts: External contexts, one per template, no context is used if not provided
+
+        Returns:
+            Rendered content of each template
+        """
+        if contexts is None:
+            contexts = [None] * len(templates)
+        if len(contexts) != len(templates):
+            raise ValueError(f"Expected {len(templates)} contexts, got {len(contexts)}")
+
+        results: List[Optional[str]] = [None] * len(templates)
+        positions: List[int] = []
+        tasks: List[RenderingTask] = []
+        contents: Dict[str, str] = {}
+        for position, (template, context) in enumerate(zip(templates, contexts)):
+            if template.isManuallyChanged:
+                results[position] = template.get_rendered()
+                continue
+            content_hash = template.content_hash
+            contents[content_hash] = template.content
+            positions.append(position)
+            tasks.append((content_hash, template.get_required_rendering_context(context)))
+
+        for position, rendered in zip(positions, self._render_tasks(contents, tasks)):
+            if rendered is None:
+                # same message as `Template.render` sets
+                rendered = templates[position]._get_rendering_error_message(contexts[position])
+            results[position] = rendered
+        return results
+
+    def render_flavor_inputs(
+        self, flavor: Flavor, templates: Sequence[Template], contexts: Sequence[Optional[Dict[str, Any]]]
+    ) -> List[Dict[str, str]]:
+        """
+        Render all inputs of a flavor against each of the external contexts.
+
+        Args:
+            flavor: Flavor whose input templates are rendered
+            templates: Candidate templates, see `Flavor.get_input_templates`
+            contexts: External contexts
+
+        Returns:
+            Rendered content keyed by input file name, one dictionary per context
+        """
+        input_templates = flavor.get_input_templates(templates)
+        if not input_templates:
+            return [{} for _ in contexts]
+        rendered = self.render(
+            [template for _ in contexts for template in input_templates],
+            [context for context in contexts for _ in input_templates],
+        )
+        size = len(input_templates)
+        return [
+            {template.name: text for template, text in zip(input_templates, rendered[start : start + size])}
+            for start in range(0, len(rendered), size)
+        ]
+
+    def _render_tasks(self, contents: Dict[str, str], tasks: List[RenderingTask]) -> List[Optional[str]]:
+        chunks = [tasks[start : start + self.chunk_size] for start in range(0, len(tasks), self.chunk_size)]
+        if self.max_workers == 1 or len(chunks) <= 1:
+            return _render_chunk(contents, tasks)
+
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_render_chunk, {content_hash: contents[content_hash] for content_hash, _ in chunk}, chunk)
+            for chunk in chunks
+        ]
+        results: List[Optional[str]] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
@@ -0,0 +1,180 @@
+import sys
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from threading import Lock
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+# kind, name, phase, seconds and net number of allocated memory blocks of one measurement
+ProfilerHook = Callable[[str, str, str, float, int], None]
+
+_current_profiler: ContextVar[Optional["RenderProfiler"]] = ContextVar("mat3ra_ade_render_profiler", default=None)
+# number of active profilers in all threads, lets the disabled mode skip the context variable lookup
+_active_profiler_count = 0
+_active_profiler_count_lock = Lock()
+
+_NULL_MEASUREMENT = nullcontext()
+
+
+def get_active_profiler() -> Optional["RenderProfiler"]:
+    if not _active_profiler_count:
+        return None
+    return _current_profiler.get()
+
+
+def measure(kind: str, name: str, phase: str) -> ContextManager[Any]:
+    """Measure a block with the active profiler, does nothing if no profiler is active."""
+    profiler = get_active_profiler()
+    if profiler is None:
+        return _NULL_MEASUREMENT
+    return profiler.measure(kind, name, phase)
+
+
+class PhaseStats:
+    __slots__ = ("count", "total_seconds", "max_seconds", "allocated_blocks")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.allocated_blocks = 0
+
+    def add(self, seconds: float, allocated_blocks: int) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.allocated_blocks += allocated_blocks
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+            "allocated_blocks": self.allocated_blocks,
+        }
+
+
+class _Measurement:
+    __slots__ = ("profiler", "key", "start", "start_blocks")
+
+    def __init__(self, profiler: "RenderProfiler", key: Tuple[str, str, str]):
+        self.profiler = profiler
+        self.key = key
+
+    def __enter__(self) -> "_Measurement":
+        self.start_blocks = sys.getallocatedblocks() if self.profiler.track_allocations else 0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        seconds = time.perf_counter() - self.start
+        blocks = sys.getallocatedblocks() - self.start_blocks if self.profiler.track_allocations else 0
+        self.profiler.record(*self.key, seconds, blocks)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RenderProfiler:
+    """
+    Records timings and allocation counts of rendering phases while active, aggregated by template name
+    and context provider name. Nothing is recorded, and rendering is not slowed down, when no profiler is active.
+
+    Phases of `Template.render`, `Template.arender` and `Template.render_many` calls, by template name:
+        providers: Resolving context provider data
+        context: Building the context passed to Jinja and comparing it with the previous render
+        compile: Getting the compiled template, compiling content on a cache miss
+        execute: Running the compiled template
+        render: The whole call, including skipped renders
+
+    Phases of context providers, by provider name:
+        yield_data: Resolving the data the provider yields for rendering
+
+    Allocation counts are the net change of `sys.getallocatedblocks()` over a phase.
+
+    Usage:
+        with RenderProfiler() as profiler:
+            template.render(context)
+        profiler.get_stats()
+
+    Args:
+        track_allocations: Record allocation counts in addition to timings
+        hook: Called with kind ("template" or "provider"), name, phase, seconds and allocated blocks
+            after each measurement
+    """
+
+    def __init__(self, track_allocations: bool = True, hook: Optional[ProfilerHook] = None):
+        self.track_allocations = track_allocations
+        self.hook = hook
+        self._stats: Dict[Tuple[str, str, str], PhaseStats] = {}
+        self._lock = Lock()
+        self._tokens: List[Token] = []
+
+    def __enter__(self) -> "RenderProfiler":
+        global _active_profiler_count
+        with _active_profiler_count_lock:
+            _active_profiler_count += 1
+        self._tokens.append(_current_profiler.set(self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global _active_profiler_count
+        _current_profiler.reset(self._tokens.pop())
+        with _active_profiler_count_lock:
+            _active_profiler_count -= 1
+
+    def measure(self, kind: str, name: str, phase: str) -> _Measurement:
+        return _Measurement(self, (kind, name, phase))
+
+    def record(self, kind: str, name: str, phase: str, seconds: float, allocated_blocks: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.get((kind, name, phase))
+            if stats is None:
+                stats = self._stats[(kind, name, phase)] = PhaseStats()
+            stats.add(seconds, allocated_blocks)
+        if self.hook is not None:
+            self.hook(kind, name, phase, seconds, allocated_blocks)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Returns:
+            Stats by kind ("templates", "providers"), name and phase, each with `count`, `total_seconds`,
+            `max_seconds` and `allocated_blocks`
+        """
+        result: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {"templates": {}, "providers": {}}
+        with self._lock:
+            for (kind, name, phase), stats in self._stats.items():
+                result[f"{kind}s"].setdefault(name, {})[phase] = stats.to_dict()
+        return result
+
+    def to_prometheus(self, prefix: str = "mat3ra_ade") -> str:
+        """Export the stats in the Prometheus text exposition format."""
+        metrics = [
+            ("phase_seconds_total", "counter", "Time spent in the phase", "total_seconds"),
+            ("phase_calls_total", "counter", "Number of measurements of the phase", "count"),
+            ("phase_max_seconds", "gauge", "Longest measurement of the phase", "max_seconds"),
+            (
+                "phase_allocated_blocks",
+                "gauge",
+                "Net number of memory blocks allocated in the phase",
+                "allocated_blocks",
+            ),
+        ]
+        with self._lock:
+            items = sorted((key, stats.to_dict()) for key, stats in self._stats.items())
+        lines = []
+        for kind in ("template", "provider"):
+            for suffix, metric_type, description, field in metrics:
+                metric = f"{prefix}_{kind}_{suffix}"
+                lines.append(f"# HELP {metric} {description}, by {kind}")
+                lines.append(f"# TYPE {metric} {metric_type}")
+                for (item_kind, name, phase), stats in items:
+                    if item_kind == kind:
+                        labels = f'{kind}="{_escape_label(name)}",phase="{_escape_label(phase)}"'
+                        lines.append(f"{metric}{{{labels}}} {stats[field]}")
+        return "\n".join(lines) + "\n"
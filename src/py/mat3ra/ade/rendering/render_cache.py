@@ -0,0 +1,251 @@
+import json
+import os
+import sqlite3
+import time
+from contextvars import ContextVar, Token
+from importlib import metadata
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set
+
+import jinja2
+
+from .fingerprint import get_stable_fingerprint
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# stored entries are dropped when the format, Jinja or this package change, as rendered text may change with them
+RENDER_CACHE_FORMAT = 2
+# number of writes between checks of the total size of stored text
+EVICTION_INTERVAL = 64
+
+_current_cache: ContextVar[Optional["PersistentRenderCache"]] = ContextVar(
+    "mat3ra_ade_persistent_render_cache", default=None
+)
+# number of active caches in all threads, lets rendering without a cache skip the context variable lookup
+_active_cache_count = 0
+_active_cache_count_lock = Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS rendered (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rendered_accessed ON rendered (accessed);
+CREATE TABLE IF NOT EXISTS variables (content_hash TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def get_active_render_cache() -> Optional["PersistentRenderCache"]:
+    if not _active_cache_count:
+        return None
+    return _current_cache.get()
+
+
+def _get_version() -> str:
+    try:
+        package_version = metadata.version("mat3ra-ade")
+    except metadata.PackageNotFoundError:
+        package_version = "unknown"
+    return f"{RENDER_CACHE_FORMAT}:{jinja2.__version__}:{package_version}"
+
+
+class PersistentRenderCache:
+    """
+    Rendered template content stored in an SQLite file, shared between runs and between processes.
+    While the cache is active, `Template.render` and the methods based on it look up the rendered text
+    by a stable hash of content and the context passed to Jinja, and run Jinja only on a miss.
+    The variables content references are stored by content hash as well, so warm renders do not parse content.
+
+    Writes are atomic and the file may be used by several processes at once (SQLite write-ahead logging).
+    When the stored text grows over `max_size`, the least recently used entries are removed.
+    Renders with errors, and renders whose context has values without a stable encoding, are not stored.
+
+    The cache is active inside a `with` block and follows the current thread or asyncio task.
+
+    Usage:
+        with PersistentRenderCache("~/.cache/mat3ra/renders.sqlite") as cache:
+            template.render(context)
+        cache.get_stats()
+
+    Args:
+        path: Path of the SQLite file, created with its directory if missing
+        max_size: Maximum total size of stored rendered text, in bytes
+        timeout: Seconds to wait for other processes holding a lock on the file
+
+    Attributes:
+        hits: Number of renders served from the cache
+        misses: Number of renders that ran Jinja
+    """
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE, timeout: float = 30.0):
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        # process the connection was opened in, connections must not be used in forked processes
+        self._pid: Optional[int] = None
+        # keys read since access times were last written, written in batches to keep reads lock-free
+        self._accessed: Set[str] = set()
+        self._writes = 0
+        self._lock = Lock()
+        self._tokens: List[Token] = []
+
+    def __enter__(self) -> "PersistentRenderCache":
+        global _active_cache_count
+        with _active_cache_count_lock:
+            _active_cache_count += 1
+        self._tokens.append(_current_cache.set(self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global _active_cache_count
+        _current_cache.reset(self._tokens.pop())
+        with _active_cache_count_lock:
+            _active_cache_count -= 1
+        if not self._tokens:
+            self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._get_connection().execute("SELECT COUNT(*) FROM rendered").fetchone()[0]
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # autocommit mode, transactions are opened explicitly
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        version = _get_version()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != version:
+                connection.execute("DELETE FROM rendered")
+                connection.execute("DELETE FROM variables")
+                connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+        self._connection = connection
+        self._pid = os.getpid()
+        self._accessed.clear()
+        return connection
+
+    @staticmethod
+    def get_key(content_hash: str, context: Mapping[str, Any]) -> Optional[str]:
+        """Return the key of content rendered against context, None if the context cannot be hashed stably."""
+        return get_stable_fingerprint([content_hash, context])
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the rendered text stored under key, None on a miss."""
+        with self._lock:
+            row = self._get_connection().execute("SELECT value FROM rendered WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._accessed.add(key)
+            return row[0]
+
+    def set(self, key: str, rendered: str) -> None:
+        """Store rendered text under key, removing the least recently used entries if the cache is full."""
+        size = len(rendered.encode("utf-8"))
+        if size > self.max_size:
+            return
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO rendered (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, rendered, size, time.time()),
+                )
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL == 0:
+                self._evict(connection)
+
+    def get_required_variables(self, content_hash: str) -> Optional[FrozenSet[str]]:
+        """Return the stored variables referenced by content with the hash, None on a miss."""
+        with self._lock:
+            row = (
+                self._get_connection()
+                .execute("SELECT value FROM variables WHERE content_hash = ?", (content_hash,))
+                .fetchone()
+            )
+        return None if row is None else frozenset(json.loads(row[0]))
+
+    def set_required_variables(self, content_hash: str, variables: FrozenSet[str]) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO variables (content_hash, value) VALUES (?, ?)",
+                    (content_hash, json.dumps(sorted(variables))),
+                )
+
+    def _flush_accessed(self, connection: sqlite3.Connection) -> None:
+        if not self._accessed:
+            return
+        now = time.time()
+        connection.executemany("UPDATE rendered SET accessed = ? WHERE key = ?", [(now, key) for key in self._accessed])
+        self._accessed.clear()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._flush_accessed(connection)
+            total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM rendered").fetchone()[0]
+            if total_size <= self.max_size:
+                return
+            excess = total_size - self.max_size
+            removed_keys = []
+            for key, size in connection.execute("SELECT key, size FROM rendered ORDER BY accessed"):
+                removed_keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM rendered WHERE key = ?", removed_keys)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the stored text fits into `max_size`."""
+        with self._lock:
+            self._evict(self._get_connection())
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("DELETE FROM rendered")
+                connection.execute("DELETE FROM variables")
+            self._accessed.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Write pending access times and close the file, it is opened again on the next use."""
+        with self._lock:
+            if self._connection is None or self._pid != os.getpid():
+                self._connection = None
+                return
+            self._evict(self._connection)
+            self._connection.close()
+            self._connection = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = (
+                self._get_connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM rendered").fetchone()
+            )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": count,
+            "bytes": size,
+        }
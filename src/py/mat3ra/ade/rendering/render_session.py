@@ -0,0 +1,109 @@
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .fingerprint import get_snapshot_fingerprint, get_structural_fingerprint
+from .profiler import measure
+
+if TYPE_CHECKING:
+    from ..context.context_provider import ContextProvider
+
+_current_session: ContextVar[Optional["RenderSession"]] = ContextVar("mat3ra_ade_render_session", default=None)
+
+
+def provider_data_resolver(provider: "ContextProvider", provider_context: Dict[str, Any]) -> Dict[str, Any]:
+    with measure("provider", provider.name_str, "yield_data"):
+        return provider.yield_data_for_rendering(provider_context)
+
+
+async def async_provider_data_resolver(provider: "ContextProvider", provider_context: Dict[str, Any]) -> Dict[str, Any]:
+    with measure("provider", provider.name_str, "yield_data"):
+        return await provider.yield_data_for_rendering_async(provider_context)
+
+
+def get_current_render_session() -> Optional["RenderSession"]:
+    return _current_session.get()
+
+
+class RenderSession:
+    """
+    Shares data yielded by context providers between all templates rendered while the session is active.
+    Providers of the same class with equal fields, resolved against the same external context values,
+    are resolved once per session, even when they are separate instances in different templates.
+
+    The session is active inside a `with` block and follows the current thread or asyncio task.
+    Shared data must not be modified.
+
+    Usage:
+        with RenderSession() as session:
+            for template in templates:
+                template.render(context)
+        session.get_stats()
+
+    Attributes:
+        hits: Number of provider resolutions served from the session
+        misses: Number of provider resolutions that called the provider
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tokens: List[Token] = []
+
+    def __enter__(self) -> "RenderSession":
+        self._tokens.append(_current_session.set(self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        _current_session.reset(self._tokens.pop())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get_context_fingerprint(self, provider: "ContextProvider", provider_context: Dict[str, Any]) -> str:
+        keys = provider.get_context_keys()
+        if keys is None:
+            # providers overriding yield_data may read any key, the whole context is fingerprinted on every call,
+            # as cheaply as possible, so that contexts modified in place are resolved again
+            return get_snapshot_fingerprint(provider_context)
+        # providers fall back to their stored context when the external one is empty
+        return get_structural_fingerprint(
+            [bool(provider_context), {key: provider_context[key] for key in keys if key in provider_context}]
+        )
+
+    def _get_key(self, provider: "ContextProvider", provider_context: Dict[str, Any]) -> Tuple[str, str]:
+        return provider.fingerprint, self._get_context_fingerprint(provider, provider_context)
+
+    def get_provider_data(self, provider: "ContextProvider", provider_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the data the provider yields for rendering, resolving it only on the first request in the session."""
+        key = self._get_key(provider, provider_context)
+        data = self._data.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = self._data[key] = provider_data_resolver(provider, provider_context)
+        return data
+
+    async def aget_provider_data(self, provider: "ContextProvider", provider_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Asynchronous version of `get_provider_data`."""
+        key = self._get_key(provider, provider_context)
+        data = self._data.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = self._data[key] = await async_provider_data_resolver(provider, provider_context)
+        return data
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+        }
@@ -1,15 +1,66 @@
-from copy import deepcopy
-from typing import Any, Dict, List, Optional
+import asyncio
+import io
+import os
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
+from jinja2 import Template as JinjaTemplate
+from jinja2 import TemplateError
 from mat3ra.code.entity import InMemoryEntitySnakeCase
 from mat3ra.esse.models.software.template import TemplateSchema
-from mat3ra.utils.extra.jinja import render_jinja_with_error_handling
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
-from .context.context_provider import ContextProvider
+from .context.context_provider import ContextProvider, merge_providers_context_data
+from .model_equality import fields_equal
+from .rendering.atomic_file import open_atomic
+from .rendering.compiled_template_cache import (
+    compiled_template_cache,
+    get_content_hash,
+    get_rendering_error_message,
+)
+from .rendering.content_store import content_store
+from .rendering.context_view import ExcludedKeysView
+from .rendering.fingerprint import get_snapshot_fingerprint
+from .rendering.incremental_context import IncrementalRenderingContext
+from .rendering.json_stream import DEFAULT_CHUNK_SIZE, awrite_json, write_json
+from .rendering.profiler import get_active_profiler, measure
+from .rendering.render_cache import get_active_render_cache
+from .trusted_construction import TrustedConstructionMixin, get_field_values
 
+# Keys of the rendering context that are never passed to Jinja
+EXCLUDED_RENDERING_CONTEXT_KEYS = frozenset({"job"})
 
-class Template(TemplateSchema, InMemoryEntitySnakeCase):
+# external context of renders without one, shared by all of them and never modified
+_EMPTY_CONTEXT: Dict[str, Any] = {}
+
+
+class _RenderInput(NamedTuple):
+    """Everything one render passes to Jinja or looks up, built once per render."""
+
+    provider_context: Dict[str, Any]
+    # context passed to Jinja, with only the variables content references
+    context: Mapping[str, Any]
+    # key in the active `PersistentRenderCache`
+    cache_key: Optional[str]
+    # fingerprint of content and context, used to skip unchanged renders
+    fingerprint: Optional[str]
+
+
+class Template(TemplateSchema, InMemoryEntitySnakeCase, TrustedConstructionMixin):
     """
     Template class representing a template for application input files.
 
@@ -29,11 +80,78 @@ class Template(TemplateSchema, InMemoryEntitySnakeCase):
         default_factory=list, description="List of context providers for this template"
     )
 
+    _content_hash: Optional[str] = PrivateAttr(default=None)
+    _content_hash_source: Optional[str] = PrivateAttr(default=None)
+    _rendering_context: IncrementalRenderingContext = PrivateAttr(default_factory=IncrementalRenderingContext)
+    # fingerprint of content and cleaned context of the last render, and the text it produced
+    _render_fingerprint: Optional[str] = PrivateAttr(default=None)
+    _fingerprinted_rendered: Optional[str] = PrivateAttr(default=None)
+    _skipped_render_count: int = PrivateAttr(default=0)
+    # content the required variables were found for, followed by the variables
+    _required_variables: Optional[Tuple[str, Optional[FrozenSet[str]]]] = PrivateAttr(default=None)
+
+    def __eq__(self, other: Any) -> bool:
+        # rendering state and caches differ between templates with equal data, e.g. between a template and its clone
+        return fields_equal(self, other)
+
+    def model_post_init(self, context: Any) -> None:
+        # content of templates built from trusted data is not checked until it is used
+        if isinstance(self.content, str):
+            self._intern_content(self.content)
+
+    def _intern_content(self, text: str) -> None:
+        """Store the text shared with all templates of equal content as content, along with its hash."""
+        content, content_hash = content_store.intern(text)
+        self.__dict__["content"] = content
+        private = self.__pydantic_private__
+        private["_content_hash"] = content_hash
+        private["_content_hash_source"] = content
+
+    @property
+    def content_hash(self) -> str:
+        """
+        SHA-256 hash of content, computed when the content is set.
+        Templates with equal content share one string object from `content_store`.
+        """
+        # private state is read directly, pydantic's attribute lookup for private attributes is comparatively slow
+        private = self.__pydantic_private__
+        if private["_content_hash"] is None or private["_content_hash_source"] is not self.content:
+            private["_content_hash"] = get_content_hash(self.content)
+            private["_content_hash_source"] = self.content
+        return private["_content_hash"]
+
+    @property
+    def skipped_render_count(self) -> int:
+        """Number of `render` calls that reused the previous result because content and context were unchanged."""
+        return self.__pydantic_private__["_skipped_render_count"]
+
+    def fork(self, **updates: Any) -> "Template":
+        """
+        Return a lightweight copy of the template, e.g. to render it for one job, instead of a deep `clone`.
+
+        The copy shares content, compiled template and the list of context providers with this template.
+        `set_content`, `add_context_provider`, `remove_context_provider` and rendering replace the values
+        on the copy only, the shared context providers and the list itself must not be modified in place.
+
+        Args:
+            updates: Field values to set on the copy, under field names or aliases as in the constructor
+
+        Returns:
+            Copy of the template with its own rendering state
+        """
+        forked = self.model_copy(update=get_field_values(type(self), updates))
+        private = forked.__pydantic_private__
+        private["_rendering_context"] = IncrementalRenderingContext()
+        private["_render_fingerprint"] = None
+        private["_fingerprinted_rendered"] = None
+        private["_skipped_render_count"] = 0
+        return forked
+
     def get_rendered(self) -> str:
         return self.rendered if self.rendered is not None else self.content
 
     def set_content(self, text: str) -> None:
-        self.content = text
+        self._intern_content(text)
 
     def set_rendered(self, text: str) -> None:
         self.rendered = text
@@ -43,39 +161,431 @@ class Template(TemplateSchema, InMemoryEntitySnakeCase):
 
     def remove_context_provider(self, provider: ContextProvider) -> None:
         self.context_providers = [
-            p
-            for p in self.context_providers
-            if not (p.name == provider.name and p.domain == provider.domain)
+            p for p in self.context_providers if not (p.name == provider.name and p.domain == provider.domain)
         ]
 
-    def _clean_rendering_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        cleaned = deepcopy(context)
-        cleaned.pop("job", None)
-        return cleaned
+    def _clean_rendering_context(self, context: Dict[str, Any]) -> Mapping[str, Any]:
+        return ExcludedKeysView(context, EXCLUDED_RENDERING_CONTEXT_KEYS)
 
     def get_data_from_providers_for_rendering_context(
         self, provider_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        result: Dict[str, Any] = {}
-        for provider in self.context_providers:
-            provider.merge_context_data(result, provider_context)
-        return result
+        """
+        Merge data of all context providers in order.
+        Only providers that changed since the previous call, or whose keys changed in provider_context, are resolved.
+        """
+        return dict(self._get_data_from_providers(provider_context or _EMPTY_CONTEXT))
 
-    def _get_rendering_context(
-        self, external_context: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        provider_context = external_context or {}
+    def _get_data_from_providers(self, provider_context: Dict[str, Any]) -> Dict[str, Any]:
+        return self._rendering_context.get_provider_data(self.context_providers, provider_context)
+
+    def _get_rendering_context(self, external_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        provider_context = external_context or _EMPTY_CONTEXT
         return {
-            **(external_context or {}),
-            **self.get_data_from_providers_for_rendering_context(provider_context),
+            **provider_context,
+            **self._get_data_from_providers(provider_context),
         }
 
-    def render(self, external_context: Optional[Dict[str, Any]] = None) -> None:
-        rendering_context = self._get_rendering_context(external_context)
-        if not self.isManuallyChanged:
-            cleaned_context = self._clean_rendering_context(rendering_context)
-            rendered = render_jinja_with_error_handling(self.content, **cleaned_context)
-            self.rendered = rendered or self.content
+    def get_cleaned_rendering_context(self, external_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the context passed to Jinja as a plain dictionary, sharing values with the rendering context."""
+        return dict(self._clean_rendering_context(self._get_rendering_context(external_context)))
+
+    def get_compiled_template(self) -> JinjaTemplate:
+        """
+        Return the compiled form of content from the process-wide compiled template cache.
+        It is looked up by content hash on every call and not kept on the instance,
+        so that templates can be copied and pickled.
+        """
+        return compiled_template_cache.get(self.content, self.content_hash)
+
+    @property
+    def required_variables(self) -> Optional[FrozenSet[str]]:
+        """
+        Names of the variables that content takes from the rendering context, found by static analysis
+        and cached by content. None if content cannot be parsed.
+        """
+        private = self.__pydantic_private__
+        cached = private["_required_variables"]
+        if cached is None or cached[0] is not self.content:
+            cached = (self.content, self._find_required_variables())
+            private["_required_variables"] = cached
+        return cached[1]
+
+    def _find_required_variables(self) -> Optional[FrozenSet[str]]:
+        render_cache = get_active_render_cache()
+        if render_cache is None:
+            return compiled_template_cache.get_required_variables(self.content, self.content_hash)
+        variables = render_cache.get_required_variables(self.content_hash)
+        if variables is None:
+            variables = compiled_template_cache.get_required_variables(self.content, self.content_hash)
+            if variables is not None:
+                render_cache.set_required_variables(self.content_hash, variables)
+        return variables
+
+    def get_referenced_context_providers(self) -> List[ContextProvider]:
+        """Return the context providers whose data content references, all of them if that cannot be determined."""
+        variables = self.required_variables
+        if variables is None:
+            return list(self.context_providers)
+        # providers with known context keys yield data only under these keys
+        return [
+            provider
+            for provider in self.context_providers
+            if (keys := provider.get_context_keys()) is None or not variables.isdisjoint(keys)
+        ]
+
+    def _get_required_rendering_context(
+        self, provider_context: Dict[str, Any], provider_data: Dict[str, Any]
+    ) -> Mapping[str, Any]:
+        """Build the context passed to Jinja from only the variables that content references."""
+        variables = self.required_variables
+        if variables is None:
+            return self._clean_rendering_context({**provider_context, **provider_data})
+        context = {}
+        for key in variables:
+            if key in EXCLUDED_RENDERING_CONTEXT_KEYS:
+                continue
+            if key in provider_data:
+                context[key] = provider_data[key]
+            elif key in provider_context:
+                context[key] = provider_context[key]
+        return context
+
+    def get_required_rendering_context(self, external_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return the context passed to Jinja as a plain dictionary, with only the variables that content references
+        and the data of only the context providers it references, e.g. to send it to another process.
+        """
+        provider_context = external_context or _EMPTY_CONTEXT
+        providers = self.get_referenced_context_providers()
+        provider_data = self._rendering_context.get_provider_data(providers, provider_context)
+        return dict(self._get_required_rendering_context(provider_context, provider_data))
+
+    def _get_full_rendering_context(self, provider_context: Dict[str, Any]) -> Mapping[str, Any]:
+        data: Dict[str, Any] = {}
+        merge_providers_context_data(data, self.context_providers, provider_context)
+        return self._clean_rendering_context({**provider_context, **data})
+
+    def _render_content(self, context: Mapping[str, Any], provider_context: Optional[Dict[str, Any]] = None) -> str:
+        try:
+            return self.get_compiled_template().render(context)
+        except TemplateError as e:
+            # the error message lists the full rendering context, not only the variables passed to Jinja
+            if provider_context is not None:
+                context = self._get_full_rendering_context(provider_context)
+            return get_rendering_error_message(e, self.content, context)
+
+    def _get_render_cache_key(self, context: Mapping[str, Any]) -> Optional[str]:
+        """Return the key of the render in the active `PersistentRenderCache`, None if there is none."""
+        render_cache = get_active_render_cache()
+        return None if render_cache is None else render_cache.get_key(self.content_hash, context)
+
+    def _render_content_cached(
+        self, context: Mapping[str, Any], provider_context: Dict[str, Any], cache_key: Optional[str]
+    ) -> str:
+        """Same as `_render_content`, served from the active `PersistentRenderCache` under cache_key if given."""
+        render_cache = get_active_render_cache()
+        if render_cache is None or cache_key is None:
+            return self._render_content(context, provider_context)
+        rendered = render_cache.get(cache_key)
+        if rendered is None:
+            try:
+                rendered = self.get_compiled_template().render(context)
+            except TemplateError:
+                # errors are not stored, the message is built as without the cache
+                return self._render_content(context, provider_context)
+            render_cache.set(cache_key, rendered)
+        return rendered
+
+    def render(self, external_context: Optional[Dict[str, Any]] = None, force: bool = False) -> None:
+        """
+        Render content against the context providers' data and the external context into `rendered`.
+        Only the providers and variables that content references are resolved and passed to Jinja,
+        see `required_variables`.
+        Rendering is skipped when content and these variables are the same as on the previous render
+        and `rendered` was not changed since.
+        While a `PersistentRenderCache` is active, the rendered text is looked up there before running Jinja.
+
+        Args:
+            external_context: Context passed to Jinja and to the context providers
+            force: Render even if nothing changed since the previous render
+        """
+        with measure("template", self.name, "render"):
+            if self.isManuallyChanged:
+                return
+            provider_context = external_context or _EMPTY_CONTEXT
+            provider_data = self._get_provider_data(provider_context)
+            self._render_if_changed(self._get_render_input(provider_context, provider_data, True), force)
+
+    async def arender(self, external_context: Optional[Dict[str, Any]] = None, force: bool = False) -> None:
+        """
+        Asynchronous version of `render`. Providers are resolved concurrently with
+        `ContextProvider.yield_data_for_rendering_async`, so I/O-backed providers do not block each other.
+        """
+        with measure("template", self.name, "render"):
+            if self.isManuallyChanged:
+                return
+            provider_context = external_context or _EMPTY_CONTEXT
+            with measure("template", self.name, "providers"):
+                providers = self.get_referenced_context_providers()
+                provider_data = await self._rendering_context.aget_provider_data(providers, provider_context)
+            self._render_if_changed(self._get_render_input(provider_context, provider_data, True), force)
+
+    def _get_provider_data(
+        self,
+        provider_context: Dict[str, Any],
+        rendering_context: Optional[IncrementalRenderingContext] = None,
+        providers: Optional[List[ContextProvider]] = None,
+    ) -> Dict[str, Any]:
+        """Resolve data of the referenced context providers, or of the given ones, with the rendering context."""
+        with measure("template", self.name, "providers"):
+            if rendering_context is None:
+                rendering_context = self._rendering_context
+            if providers is None:
+                providers = self.get_referenced_context_providers()
+            return rendering_context.get_provider_data(providers, provider_context)
+
+    def _get_render_input(
+        self, provider_context: Dict[str, Any], provider_data: Dict[str, Any], with_fingerprint: bool = False
+    ) -> _RenderInput:
+        """
+        Build the context passed to Jinja with its key in the active `PersistentRenderCache`,
+        and with its fingerprint, used to skip unchanged renders, if requested.
+        """
+        with measure("template", self.name, "context"):
+            context = self._get_required_rendering_context(provider_context, provider_data)
+            cache_key = self._get_render_cache_key(context)
+            fingerprint = None
+            if with_fingerprint:
+                # the cache key identifies content and context as well, the context is encoded once
+                fingerprint = cache_key or get_snapshot_fingerprint(
+                    [self.content_hash, context if isinstance(context, dict) else dict(context)]
+                )
+            return _RenderInput(provider_context, context, cache_key, fingerprint)
+
+    def _render_if_changed(self, render_input: _RenderInput, force: bool) -> None:
+        private = self.__pydantic_private__
+        if (
+            not force
+            and render_input.fingerprint == private["_render_fingerprint"]
+            and self.rendered is private["_fingerprinted_rendered"]
+        ):
+            private["_skipped_render_count"] += 1
+            return
+        self._set_rendered_with_fingerprint(self._execute(render_input), render_input.fingerprint)
+
+    def _set_rendered_with_fingerprint(self, rendered: str, fingerprint: Optional[str]) -> None:
+        private = self.__pydantic_private__
+        self.rendered = rendered
+        private["_render_fingerprint"] = fingerprint
+        private["_fingerprinted_rendered"] = self.rendered
+
+    def _compile_measured(self) -> None:
+        """Compile content ahead of the execute phase, so that the active `RenderProfiler` measures it separately."""
+        if get_active_render_cache() is None and get_active_profiler() is not None:
+            # with a persistent render cache, content is compiled only on a miss, as part of the execute phase
+            with measure("template", self.name, "compile"):
+                try:
+                    self.get_compiled_template()
+                except TemplateError:
+                    # raised again and reported when content is rendered
+                    pass
+
+    def _execute(self, render_input: _RenderInput) -> str:
+        """Return the rendered text, content itself if it renders to nothing."""
+        self._compile_measured()
+        with measure("template", self.name, "execute"):
+            # the rendered text is not kept in a local, frames of failed renders stay referenced until collected
+            return (
+                self._render_content_cached(render_input.context, render_input.provider_context, render_input.cache_key)
+                or self.content
+            )
+
+    def _iter_executed_pieces(self, render_input: _RenderInput) -> Iterator[str]:
+        """
+        Same as `_execute`, yielding the rendered text piece by piece as Jinja produces it.
+
+        Raises:
+            jinja2.TemplateError: if content cannot be rendered, possibly after pieces were yielded
+        """
+        self._compile_measured()
+        with measure("template", self.name, "execute"):
+            render_cache = get_active_render_cache()
+            if render_cache is not None and render_input.cache_key is not None:
+                cached = render_cache.get(render_input.cache_key)
+                if cached is not None:
+                    yield cached or self.content
+                    return
+            is_empty = True
+            for piece in self.get_compiled_template().generate(render_input.context):
+                is_empty = is_empty and not piece
+                yield piece
+            if is_empty:
+                yield self.content
+
+    def _create_batch_renderer(self) -> Callable[[Optional[Dict[str, Any]]], str]:
+        """
+        Return a function that renders content against one external context per call.
+        Provider data that does not depend on the external context is resolved once and reused between calls.
+        """
+        providers = self.get_referenced_context_providers()
+        rendering_context = IncrementalRenderingContext()
+
+        def render(external_context: Optional[Dict[str, Any]] = None) -> str:
+            if self.isManuallyChanged:
+                return self.get_rendered()
+            with measure("template", self.name, "render"):
+                provider_context = external_context or _EMPTY_CONTEXT
+                provider_data = self._get_provider_data(provider_context, rendering_context, providers)
+                return self._execute(self._get_render_input(provider_context, provider_data))
+
+        return render
+
+    def render_many(
+        self, contexts: Iterable[Optional[Dict[str, Any]]], as_templates: bool = False
+    ) -> Iterator[Union[str, "Template"]]:
+        """
+        Render the template against each of the external contexts without modifying this template.
+
+        Args:
+            contexts: External contexts, one per rendering
+            as_templates: Yield copies of this template with `rendered` set instead of rendered strings
+
+        Yields:
+            Rendered content or rendered template copy for each context, in order
+        """
+        render = self._create_batch_renderer()
+        for context in contexts:
+            rendered = render(context)
+            yield self.fork(rendered=rendered) if as_templates else rendered
+
+    def _iter_rendered_pieces(
+        self, external_context: Optional[Dict[str, Any]], render_inputs: Optional[List[_RenderInput]] = None
+    ) -> Iterator[str]:
+        """
+        Yield rendered text piece by piece as Jinja produces it, see `_iter_executed_pieces`.
+
+        Args:
+            external_context: Context passed to Jinja and to the context providers
+            render_inputs: List to append the input of the render to, e.g. to fingerprint the rendered text
+        """
+        if self.isManuallyChanged:
+            yield self.get_rendered()
+            return
+        with measure("template", self.name, "render"):
+            provider_context = external_context or _EMPTY_CONTEXT
+            provider_data = self._get_provider_data(provider_context)
+            render_input = self._get_render_input(provider_context, provider_data, render_inputs is not None)
+            if render_inputs is not None:
+                render_inputs.append(render_input)
+            yield from self._iter_executed_pieces(render_input)
+
+    def _iter_chunks(
+        self,
+        external_context: Optional[Dict[str, Any]],
+        chunk_size: int,
+        render_inputs: Optional[List[_RenderInput]] = None,
+    ) -> Iterator[str]:
+        """Same as `_iter_rendered_pieces`, with pieces joined into chunks of about chunk_size characters."""
+        pieces: List[str] = []
+        size = 0
+        for piece in self._iter_rendered_pieces(external_context, render_inputs):
+            pieces.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(pieces)
+                pieces, size = [], 0
+        if pieces:
+            yield "".join(pieces)
+
+    def _get_rendering_error_message(self, external_context: Optional[Dict[str, Any]]) -> str:
+        provider_context = external_context or _EMPTY_CONTEXT
+        # rendering again raises the same error, the message lists the full rendering context as in `render`
+        return self._render_content(self._get_full_rendering_context(provider_context), provider_context)
+
+    def iter_rendered_chunks(
+        self, external_context: Optional[Dict[str, Any]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        """
+        Render the template and yield the text in chunks, without building it as one string.
+        The chunks join into the text `render` sets to `rendered`, which is left unchanged.
+        Rendered text is read from an active `PersistentRenderCache`, but not stored there.
+        If rendering fails, the error message `render` would set is yielded after the chunks rendered before.
+
+        Args:
+            external_context: Context passed to Jinja and to the context providers
+            chunk_size: Approximate size of the chunks in characters
+        """
+        yield from self._iter_chunks_with_error(external_context, chunk_size)
+
+    def _iter_chunks_with_error(
+        self,
+        external_context: Optional[Dict[str, Any]],
+        chunk_size: int,
+        render_inputs: Optional[List[_RenderInput]] = None,
+    ) -> Iterator[str]:
+        try:
+            yield from self._iter_chunks(external_context, chunk_size, render_inputs)
+        except TemplateError:
+            yield self._get_rendering_error_message(external_context)
+
+    def render_to(
+        self,
+        target: Union[str, "os.PathLike[str]", TextIO, BinaryIO],
+        external_context: Optional[Dict[str, Any]] = None,
+        keep_rendered: bool = False,
+        encoding: str = "utf-8",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Render the template straight into a file chunk by chunk, see `iter_rendered_chunks`.
+        Files given by path are replaced atomically, and contain only the error message if rendering fails.
+
+        Args:
+            target: Path of the file, or a text or binary file-like object
+            external_context: Context passed to Jinja and to the context providers
+            keep_rendered: Also set the rendered text to `rendered`, which otherwise is left unchanged
+            encoding: Encoding of files given by path and of binary file-like objects
+            chunk_size: Approximate size of the chunks in characters
+        """
+        kept: Optional[List[str]] = [] if keep_rendered else None
+        # the fingerprint of the render is computed only to keep the rendered text
+        render_inputs: Optional[List[_RenderInput]] = [] if keep_rendered else None
+        if isinstance(target, (str, os.PathLike)):
+            self._render_to_path(os.fspath(target), external_context, kept, render_inputs, encoding, chunk_size)
+        else:
+            is_binary = isinstance(target, (io.RawIOBase, io.BufferedIOBase))
+            for chunk in self._iter_chunks_with_error(external_context, chunk_size, render_inputs):
+                target.write(chunk.encode(encoding) if is_binary else chunk)
+                if kept is not None:
+                    kept.append(chunk)
+        if kept is not None:
+            # as after `render`, the next render with the same context is skipped
+            fingerprint = render_inputs[0].fingerprint if render_inputs else None
+            self._set_rendered_with_fingerprint("".join(kept), fingerprint)
+
+    def _render_to_path(
+        self,
+        path: str,
+        external_context: Optional[Dict[str, Any]],
+        kept: Optional[List[str]],
+        render_inputs: Optional[List[_RenderInput]],
+        encoding: str,
+        chunk_size: int,
+    ) -> None:
+        with open_atomic(path, "w", prefix=".render-", encoding=encoding, newline="") as file:
+            try:
+                for chunk in self._iter_chunks(external_context, chunk_size, render_inputs):
+                    file.write(chunk)
+                    if kept is not None:
+                        kept.append(chunk)
+            except TemplateError:
+                message = self._get_rendering_error_message(external_context)
+                file.seek(0)
+                file.truncate()
+                file.write(message)
+                if kept is not None:
+                    kept[:] = [message]
 
     def get_rendered_dict(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         self.render(context)
@@ -84,3 +594,57 @@ class Template(TemplateSchema, InMemoryEntitySnakeCase):
     def get_rendered_json(self, context: Optional[Dict[str, Any]] = None) -> str:
         self.render(context)
         return self.to_json()
+
+    async def aget_rendered_dict(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        await self.arender(context)
+        return self.to_dict()
+
+    def write_rendered_json(
+        self,
+        file: TextIO,
+        context: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_orjson: bool = False,
+    ) -> None:
+        """
+        Render the template and write it as JSON to a file-like object chunk by chunk.
+        The output is the same as `get_rendered_json` unless `orjson` is used, see `write_json`.
+        """
+        self.render(context)
+        write_json(self, file, chunk_size, use_orjson)
+
+    async def awrite_rendered_json(
+        self,
+        writer: Any,
+        context: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_orjson: bool = False,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """Render the template and write it as JSON to an asynchronous writer, see `awrite_json`."""
+        await self.arender(context)
+        await awrite_json(self, writer, chunk_size, use_orjson, encoding)
+
+
+def render_batch(
+    templates: Iterable[Template], contexts: Iterable[Optional[Dict[str, Any]]], as_templates: bool = False
+) -> Iterator[List[Union[str, Template]]]:
+    """
+    Render every template against each of the external contexts, see `Template.render_many`.
+
+    Yields:
+        List with rendered content or rendered template copies of all templates, one list per context
+    """
+    templates = list(templates)
+    renderers = [template._create_batch_renderer() for template in templates]
+    for context in contexts:
+        rendered = [render(context) for render in renderers]
+        if as_templates:
+            yield [template.fork(rendered=text) for template, text in zip(templates, rendered)]
+        else:
+            yield rendered
+
+
+async def arender_templates(templates: Iterable[Template], external_context: Optional[Dict[str, Any]] = None) -> None:
+    """Render templates, such as the inputs of a unit, concurrently with `Template.arender`."""
+    await asyncio.gather(*(template.arender(external_context) for template in templates))
@@ -0,0 +1,205 @@
+import copy
+import enum
+import functools
+import typing
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from pydantic.alias_generators import to_snake
+from pydantic_core import PydanticUndefined
+
+T = TypeVar("T", bound=BaseModel)
+
+Converter = Callable[[Any], Any]
+
+# default values stored on instances as they are, others are copied or created per instance
+_IMMUTABLE_TYPES = (type(None), bool, int, float, str, bytes, enum.Enum)
+
+
+def _get_union_converter(members: Tuple[Any, ...]) -> Optional[Converter]:
+    models = [member for member in members if isinstance(member, type) and issubclass(member, BaseModel)]
+    enums = [member for member in members if isinstance(member, type) and issubclass(member, enum.Enum)]
+    if len(models) > 1 or len(enums) > 1 or len(models) + len(enums) == 0:
+        # ambiguous or plain values, kept as given until validation
+        return None
+    if models:
+        model = models[0]
+        return lambda value: construct_trusted(model, value) if isinstance(value, dict) else value
+    enum_cls = enums[0]
+
+    members_by_value = enum_cls._value2member_map_
+
+    def convert_enum(value: Any) -> Any:
+        try:
+            return members_by_value.get(value, value)
+        except TypeError:
+            # unhashable values
+            return value
+
+    return convert_enum
+
+
+def _get_converter(annotation: Any) -> Optional[Converter]:
+    """Return a function building nested models and enums of a field from plain values, None if none are needed."""
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        arguments = typing.get_args(annotation)
+        item_converter = _get_converter(arguments[0]) if arguments else None
+        if item_converter is None:
+            return None
+        return lambda value: [item_converter(item) for item in value] if isinstance(value, list) else value
+    if origin is typing.Union:
+        members = tuple(member for member in typing.get_args(annotation) if member is not type(None))
+        if len(members) == 1:
+            return _get_converter(members[0])
+        return _get_union_converter(members)
+    if origin is None:
+        return _get_union_converter((annotation,))
+    return None
+
+
+def _split_defaults(attributes: Mapping[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Tuple[Callable, bool]]]:
+    """
+    Split fields or private attributes with defaults into immutable default values
+    and functions creating the default per instance, with whether they take the values of other fields.
+    """
+    static_defaults: Dict[str, Any] = {}
+    default_factories: Dict[str, Tuple[Callable, bool]] = {}
+    for name, attribute in attributes.items():
+        if attribute.default_factory is not None:
+            # checking the signature of the factory is slow, done once here instead of on every call
+            default_factories[name] = (attribute.default_factory, attribute.default_factory_takes_validated_data)
+        elif isinstance(attribute.default, _IMMUTABLE_TYPES):
+            static_defaults[name] = attribute.default
+        elif attribute.default is not PydanticUndefined:
+            default_factories[name] = (functools.partial(copy.deepcopy, attribute.default), False)
+    return static_defaults, default_factories
+
+
+class _ConstructionPlan:
+    """Field lookup, converters and defaults of a model class, computed once per class."""
+
+    def __init__(self, cls: Type[BaseModel]):
+        # field name and converter of the value, by every key the field can be given under
+        self.fields: Dict[str, Tuple[str, Optional[Converter]]] = {}
+        for name, field in cls.model_fields.items():
+            entry = (name, _get_converter(field.annotation))
+            for key in (to_snake(name), field.alias, field.validation_alias, name):
+                if isinstance(key, str):
+                    self.fields[key] = entry
+        self.defaults, self.default_factories = _split_defaults(
+            {name: field for name, field in cls.model_fields.items() if not field.is_required()}
+        )
+        self.private_defaults, self.private_default_factories = _split_defaults(cls.__private_attributes__)
+        self.allows_extra = cls.model_config.get("extra") == "allow"
+        self.has_post_init = cls.__pydantic_post_init__ is not None
+
+
+_plans: Dict[type, _ConstructionPlan] = {}
+_set_attribute = object.__setattr__
+
+
+def _get_plan(cls: Type[BaseModel]) -> _ConstructionPlan:
+    plan = _plans.get(cls)
+    if plan is None:
+        plan = _plans[cls] = _ConstructionPlan(cls)
+    return plan
+
+
+def get_field_values(cls: Type[BaseModel], values: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return values given under field names or aliases, as `construct_trusted` accepts them, by field name,
+    with nested models and enums built from plain values. Keys of no field are returned as they are.
+    """
+    plan = _plans.get(cls) or _get_plan(cls)
+    field_values: Dict[str, Any] = {}
+    for key, value in values.items():
+        entry = plan.fields.get(key)
+        if entry is None:
+            field_values[key] = value
+            continue
+        name, converter = entry
+        field_values[name] = value if converter is None or value is None else converter(value)
+    return field_values
+
+
+def construct_trusted(cls: Type[T], config: Mapping[str, Any]) -> T:
+    """
+    Build a model from data that is known to be valid, without validation.
+    Equivalent to `model_construct` with fields accepted under their names and aliases,
+    nested models and enums are built from plain values, other values are stored as given.
+    """
+    plan = _plans.get(cls) or _get_plan(cls)
+    values = dict(plan.defaults)
+    fields_set = set()
+    extra: Optional[Dict[str, Any]] = {} if plan.allows_extra else None
+    for key, value in config.items():
+        entry = plan.fields.get(key)
+        if entry is None:
+            if extra is not None:
+                extra[key] = value
+            continue
+        name, converter = entry
+        values[name] = value if converter is None or value is None else converter(value)
+        fields_set.add(name)
+    for name, (factory, takes_values) in plan.default_factories.items():
+        if name not in fields_set:
+            values[name] = factory(values) if takes_values else factory()
+
+    instance = cls.__new__(cls)
+    _set_attribute(instance, "__dict__", values)
+    _set_attribute(instance, "__pydantic_fields_set__", fields_set)
+    _set_attribute(instance, "__pydantic_extra__", extra)
+    private: Optional[Dict[str, Any]] = None
+    if plan.private_defaults or plan.private_default_factories:
+        private = dict(plan.private_defaults)
+        for name, (factory, takes_values) in plan.private_default_factories.items():
+            private[name] = factory({**values, **private}) if takes_values else factory()
+    _set_attribute(instance, "__pydantic_private__", private)
+    if plan.has_post_init:
+        # private attributes are already set, the default initialization leaves them as they are
+        instance.model_post_init(None)
+    return instance
+
+
+class TrustedConstructionMixin:
+    """
+    Construction of entities from trusted data, such as definitions that were validated when they were published.
+    Skipping validation pays off for entities with nested data, such as templates with context providers.
+    Small models, such as `Flavor`, `FlavorInput` and `Executable`, are validated by pydantic-core
+    faster than they are constructed in Python and are always validated.
+    Instances are not checked until `validate_trusted` is called, invalid data leads to errors on use.
+    """
+
+    @classmethod
+    def from_trusted(cls: Type[T], config: Mapping[str, Any]) -> T:
+        """Build an entity from a trusted config without validation, see `construct_trusted`."""
+        return construct_trusted(cls, config)
+
+    @classmethod
+    def from_trusted_many(cls: Type[T], configs: Iterable[Mapping[str, Any]]) -> List[T]:
+        """Build entities from trusted configs without validation, see `construct_trusted`."""
+        return [construct_trusted(cls, config) for config in configs]
+
+    def validate_trusted(self: T) -> T:
+        """
+        Validate the data of an entity built from trusted data.
+
+        Returns:
+            Validated copy of the entity
+
+        Raises:
+            pydantic.ValidationError: if the data is invalid
+        """
+        return type(self).model_validate(self.model_dump(warnings=False))
@@ -0,0 +1,11 @@
+import pytest
+from rendering_pipeline import RUN_ENV_VARIABLE, is_run_enabled
+
+
+def pytest_collection_modifyitems(config, items):
+    if is_run_enabled():
+        return
+    skip = pytest.mark.skip(reason=f"wall-clock benchmark, set {RUN_ENV_VARIABLE}=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,340 @@
+"""
+Benchmark cases for the template rendering pipeline, shared by `test_rendering_pipeline_benchmarks.py`
+and `run_benchmarks.py`. Templates and contexts are synthetic, sized after Quantum ESPRESSO pw.x inputs.
+"""
+
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from mat3ra.ade import ContextProvider, Executable, Flavor, FlavorInput, Template
+from mat3ra.ade.context.context_provider import merge_providers_context_data
+from mat3ra.esse.models.context_provider import Name
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+THRESHOLD_ENV_VARIABLE = "ADE_BENCHMARK_THRESHOLD"
+# tests marked as benchmark compare wall-clock timings, which fail under load, and run only if this is set
+RUN_ENV_VARIABLE = "ADE_RUN_BENCHMARKS"
+# relative slowdown or memory growth over the baseline reported as a regression
+DEFAULT_THRESHOLD = 1.0
+
+PROVIDER_COUNTS = (1, 10, 50)
+# number of atoms in the material of the external context
+CONTEXT_SIZES = {"small": 8, "medium": 128, "large": 1024}
+
+PW_SCF_CONTENT = """&CONTROL
+    calculation = 'scf'
+    title = '{{ material.name }}'
+    prefix = '__prefix__'
+    outdir = {{ JOB_WORK_DIR }}/outdir
+    pseudo_dir = {{ JOB_WORK_DIR }}/pseudo
+/
+&SYSTEM
+    ibrav = {{ input.IBRAV }}
+    nat = {{ input.NAT }}
+    ntyp = {{ input.NTYP }}
+    ecutwfc = {{ PlanewaveCutoffDataManager.wavefunction }}
+    ecutrho = {{ PlanewaveCutoffDataManager.density }}
+    occupations = 'smearing'
+    degauss = 0.005
+/
+&ELECTRONS
+    diagonalization = 'david'
+    conv_thr = 1.d-6
+/
+ATOMIC_SPECIES
+{% for species in material.species -%}
+{{ species.element }} {{ species.mass }} {{ species.pseudo }}
+{% endfor -%}
+CELL_PARAMETERS angstrom
+{% for vector in material.lattice.vectors -%}
+{{ vector | join(' ') }}
+{% endfor -%}
+ATOMIC_POSITIONS crystal
+{% for atom in material.atoms -%}
+{{ atom.element }} {{ '%14.9f' | format(atom.coordinate[0]) }} {{ '%14.9f' | format(atom.coordinate[1]) }} \
+{{ '%14.9f' | format(atom.coordinate[2]) }}
+{% endfor -%}
+K_POINTS automatic
+{{ KGridFormDataManager.dimensions | join(' ') }} {{ KGridFormDataManager.shifts | join(' ') }}
+"""
+
+PROVIDER_NAMES = list(Name)
+
+# e.g. "render[providers=10,context=medium]": {"throughput": ..., "p50_us": ..., ...}
+BenchmarkResults = Dict[str, Dict[str, float]]
+
+
+def create_context(n_atoms: int, index: int = 0) -> Dict[str, Any]:
+    return {
+        "JOB_WORK_DIR": f"/scratch/job-{index}",
+        "job": {"_id": f"job-{index}", "workflow": {"units": [{"name": f"unit-{i}"} for i in range(20)]}},
+        "input": {"IBRAV": 0, "NAT": n_atoms, "NTYP": 2},
+        "material": {
+            "name": f"Si{n_atoms // 2}Ge{n_atoms // 2}",
+            "species": [
+                {"element": "Si", "mass": 28.0855, "pseudo": "si_pbe_gbrv_1.0.upf"},
+                {"element": "Ge", "mass": 72.63, "pseudo": "ge_pbe_gbrv_1.4.upf"},
+            ],
+            "lattice": {"vectors": [[5.43 * n_atoms ** (1 / 3), 0, 0], [0, 5.43, 0], [0, 0, 5.43]]},
+            "atoms": [
+                {
+                    "element": "Si" if i % 2 else "Ge",
+                    "coordinate": [(i * 0.137) % 1, (i * 0.291) % 1, (i * 0.533) % 1],
+                }
+                for i in range(n_atoms)
+            ],
+        },
+    }
+
+
+def create_providers(count: int) -> List[ContextProvider]:
+    providers = [
+        ContextProvider(name=Name.KGridFormDataManager, data={"dimensions": [4, 4, 4], "shifts": [0, 0, 0]}),
+        ContextProvider(name=Name.PlanewaveCutoffDataManager, data={"wavefunction": 40, "density": 320}),
+    ][:count]
+    # the rest are providers whose data the template does not use, some sharing names with the ones above
+    for index in range(len(providers), count):
+        name = PROVIDER_NAMES[index % len(PROVIDER_NAMES)]
+        providers.append(ContextProvider(name=name, data={"values": list(range(10)), "index": index}))
+    return providers
+
+
+def create_template_config(providers: int) -> Dict[str, Any]:
+    return {
+        "name": "pw_scf.in",
+        "content": PW_SCF_CONTENT,
+        "applicationName": "espresso",
+        "executableName": "pw.x",
+        "contextProviders": create_providers(providers),
+    }
+
+
+FLAVOR_CONFIG = {
+    "name": "pw_scf",
+    "applicationName": "espresso",
+    "executableName": "pw.x",
+    "input": [{"name": "pw_scf.in"}, {"templateName": "pw_scf.in", "name": "pw_nscf.in"}],
+    "results": [{"name": "total_energy"}, {"name": "fermi_energy"}],
+    "monitors": [{"name": "standard_output"}, {"name": "convergence_electronic"}],
+}
+
+EXECUTABLE_CONFIG = {
+    "name": "pw.x",
+    "isDefault": True,
+    "results": [{"name": "total_energy"}, {"name": "fermi_energy"}],
+    "monitors": [{"name": "standard_output"}, {"name": "convergence_electronic"}],
+    "postProcessors": [{"name": "remove_non_zero_weight_kpoints"}],
+}
+
+
+def create_cases() -> Dict[str, Callable[[], Callable[[int], Any]]]:
+    """
+    Return benchmark cases by name. Each case is a setup function returning the benchmarked operation,
+    which takes the iteration index.
+    """
+    cases: Dict[str, Callable[[], Callable[[int], Any]]] = {}
+
+    for providers in PROVIDER_COUNTS:
+        for size_name, n_atoms in CONTEXT_SIZES.items():
+
+            def setup_render(providers: int = providers, n_atoms: int = n_atoms) -> Callable[[int], Any]:
+                template = Template(**create_template_config(providers))
+                contexts = [create_context(n_atoms, index) for index in range(2)]
+                # alternating contexts, so that no render is skipped
+                return lambda index: template.render(contexts[index % 2])
+
+            cases[f"render[providers={providers},context={size_name}]"] = setup_render
+
+        def setup_merge(providers: int = providers) -> Callable[[int], Any]:
+            provider_list = create_providers(providers)
+            context = create_context(CONTEXT_SIZES["small"])
+
+            def merge(index: int) -> Dict[str, Any]:
+                result: Dict[str, Any] = {}
+                for provider in provider_list:
+                    provider.merge_context_data(result, context)
+                return result
+
+            return merge
+
+        cases[f"merge_context_data[providers={providers}]"] = setup_merge
+
+        def setup_merge_at_once(providers: int = providers) -> Callable[[int], Any]:
+            provider_list = create_providers(providers)
+            context = create_context(CONTEXT_SIZES["small"])
+
+            def merge(index: int) -> Dict[str, Any]:
+                result: Dict[str, Any] = {}
+                merge_providers_context_data(result, provider_list, context)
+                return result
+
+            return merge
+
+        cases[f"merge_providers_context_data[providers={providers}]"] = setup_merge_at_once
+
+    def setup_template_construction() -> Callable[[int], Any]:
+        config = {**create_template_config(10), "contextProviders": [p.to_dict() for p in create_providers(10)]}
+        return lambda index: Template(**config)
+
+    def setup_flavor_construction() -> Callable[[int], Any]:
+        return lambda index: Flavor(**FLAVOR_CONFIG)
+
+    def setup_trusted_template_construction() -> Callable[[int], Any]:
+        config = {**create_template_config(10), "contextProviders": [p.to_dict() for p in create_providers(10)]}
+        return lambda index: Template.from_trusted(config)
+
+    def setup_flavor_input_construction() -> Callable[[int], Any]:
+        return lambda index: FlavorInput(**FLAVOR_CONFIG["input"][1])
+
+    def setup_executable_construction() -> Callable[[int], Any]:
+        return lambda index: Executable(**EXECUTABLE_CONFIG)
+
+    cases["construct[Template]"] = setup_template_construction
+    cases["construct[Flavor]"] = setup_flavor_construction
+    cases["construct_trusted[Template]"] = setup_trusted_template_construction
+    cases["construct[FlavorInput]"] = setup_flavor_input_construction
+    cases["construct[Executable]"] = setup_executable_construction
+    return cases
+
+
+class Measurement(NamedTuple):
+    result: Any
+    seconds: float
+    # memory allocated by the call and still referenced after it, and the peak while it ran
+    current_bytes: int
+    peak_bytes: int
+
+
+def measure(func: Callable[[], Any]) -> Measurement:
+    """Call func once while tracing memory, which slows it down, see `best_time` to compare timings."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(result, seconds, current_bytes, peak_bytes)
+
+
+def best_time(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the shortest time of repeated calls of func in seconds, garbage is collected before each."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_case(setup: Callable[[], Callable[[int], Any]], iterations: int = 200, warmup: int = 10) -> Dict[str, float]:
+    """
+    Measure one case.
+
+    Returns:
+        Throughput in operations per second, latency percentiles in microseconds and peak traced memory in bytes
+    """
+    operation = setup()
+    for index in range(warmup):
+        operation(index)
+
+    latencies = []
+    start = time.perf_counter()
+    for index in range(iterations):
+        operation_start = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - operation_start)
+    elapsed = time.perf_counter() - start
+
+    # memory is traced in a separate pass, tracing slows the operations down
+    operation = setup()
+    tracemalloc.start()
+    try:
+        for index in range(min(iterations, 20)):
+            operation(index)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "throughput": iterations / elapsed,
+        "p50_us": quantiles[49] * 1e6,
+        "p90_us": quantiles[89] * 1e6,
+        "p99_us": quantiles[98] * 1e6,
+        "peak_bytes": float(peak),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, iterations: int = 200) -> BenchmarkResults:
+    cases = create_cases()
+    return {
+        name: run_case(setup, iterations)
+        for name, setup in cases.items()
+        if names is None or any(pattern in name for pattern in names)
+    }
+
+
+def is_run_enabled() -> bool:
+    return bool(os.environ.get(RUN_ENV_VARIABLE))
+
+
+def get_threshold() -> float:
+    return float(os.environ.get(THRESHOLD_ENV_VARIABLE, DEFAULT_THRESHOLD))
+
+
+def load_baseline(path: str = BASELINE_PATH) -> BenchmarkResults:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_baseline(results: BenchmarkResults, path: str = BASELINE_PATH) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=4, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(
+    results: BenchmarkResults, baseline: BenchmarkResults, threshold: float
+) -> List[Tuple[str, str, float, float]]:
+    """
+    Compare median latency and peak memory with the baseline.
+
+    Returns:
+        Case name, metric, baseline value and current value of each metric that grew by more than the threshold
+    """
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric in ("p50_us", "peak_bytes"):
+            expected = baseline[name][metric]
+            if metrics[metric] > expected * (1 + threshold):
+                regressions.append((name, metric, expected, metrics[metric]))
+    return regressions
+
+
+def format_results(results: BenchmarkResults, baseline: Optional[BenchmarkResults] = None) -> str:
+    baseline = baseline or {}
+    header = (
+        f"{'case':48} {'ops/s':>10} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'peak KiB':>10} {'p50 vs base':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, metrics in results.items():
+        ratio = ""
+        if name in baseline:
+            ratio = f"{metrics['p50_us'] / baseline[name]['p50_us']:.2f}x"
+        lines.append(
+            f"{name:48} {metrics['throughput']:10.0f} {metrics['p50_us']:10.1f} {metrics['p90_us']:10.1f} "
+            f"{metrics['p99_us']:10.1f} {metrics['peak_bytes'] / 1024:10.1f} {ratio:>12}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,57 @@
+"""
+Run the rendering pipeline benchmarks and compare them with the stored baseline.
+
+Usage:
+    python tests/py/benchmarks/run_benchmarks.py [--filter render] [--threshold 0.5] [--save-baseline]
+
+Exits with status 1 if median latency or peak memory of any case grew by more than the threshold.
+The threshold defaults to the ADE_BENCHMARK_THRESHOLD environment variable.
+Baselines are only comparable between runs on the same machine, save one before comparing changes.
+"""
+
+import argparse
+import os
+import sys
+
+BENCHMARKS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# same paths as configured for pytest, the package does not need to be installed
+sys.path[:0] = [BENCHMARKS_DIRECTORY, os.path.join(BENCHMARKS_DIRECTORY, "..", "..", "..", "src", "py")]
+
+from rendering_pipeline import (  # noqa: E402
+    BASELINE_PATH,
+    find_regressions,
+    format_results,
+    get_threshold,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None, help="Allowed relative regression, e.g. 0.25")
+    parser.add_argument("--filter", action="append", help="Run only cases whose name contains the text")
+    parser.add_argument("--iterations", type=int, default=200, help="Measured iterations per case")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = run_benchmarks(args.filter, args.iterations)
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    threshold = get_threshold() if args.threshold is None else args.threshold
+    regressions = find_regressions(results, baseline, threshold)
+    for name, metric, expected, actual in regressions:
+        print(f"REGRESSION {name} {metric}: {actual:.1f} vs baseline {expected:.1f} (threshold {threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
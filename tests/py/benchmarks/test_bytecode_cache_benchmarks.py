@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from mat3ra.ade.rendering.bytecode_cache import BYTECODE_CACHE_DIR_ENV_VARIABLE
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIRECTORY = os.path.abspath(os.path.join(BENCHMARK_DIRECTORY, "..", "..", "..", "src", "py"))
+
+# first render and a later render of the same template with another context, in a fresh worker process
+WORKER_SCRIPT = """
+import json, time
+from mat3ra.ade import Template
+from rendering_pipeline import create_context, create_template_config
+
+template = Template(**create_template_config(10))
+contexts = [create_context(8, index) for index in range(3)]
+start = time.perf_counter()
+template.render(contexts[0])
+first = time.perf_counter() - start
+start = time.perf_counter()
+template.render(contexts[1])
+warm = time.perf_counter() - start
+print(json.dumps({"first": first, "warm": warm}))
+"""
+
+
+def run_worker(bytecode_directory):
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([SOURCE_DIRECTORY, BENCHMARK_DIRECTORY, os.environ.get("PYTHONPATH", "")]),
+        BYTECODE_CACHE_DIR_ENV_VARIABLE: bytecode_directory,
+    }
+    process = subprocess.run([sys.executable, "-c", WORKER_SCRIPT], env=env, capture_output=True, text=True, check=True)
+    return json.loads(process.stdout)
+
+
+@pytest.mark.benchmark
+def test_first_render_in_fresh_process(tmp_path):
+    bytecode_directory = str(tmp_path / "bytecode")
+    cold = min((run_worker(bytecode_directory + str(index)) for index in range(3)), key=lambda times: times["first"])
+    run_worker(bytecode_directory)
+    warm = min((run_worker(bytecode_directory) for _ in range(3)), key=lambda times: times["first"])
+    print(
+        f"\nfirst render in a fresh process: {cold['first'] * 1e3:.2f}ms without cached bytecode, "
+        f"{warm['first'] * 1e3:.2f}ms with cached bytecode, warm render {warm['warm'] * 1e3:.2f}ms"
+    )
+    assert warm["first"] * 2 < cold["first"]
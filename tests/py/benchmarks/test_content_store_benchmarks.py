@@ -0,0 +1,24 @@
+import json
+
+from mat3ra.ade import Template
+from rendering_pipeline import PW_SCF_CONTENT, measure
+
+N_TEMPLATES = 1000
+# configs of the same template in several application versions, each loaded with its own content string
+CONFIGS_JSON = json.dumps(
+    [{"name": "pw_scf.in", "content": PW_SCF_CONTENT * 10, "applicationVersion": str(i)} for i in range(N_TEMPLATES)]
+)
+
+
+def test_templates_memory_with_shared_content():
+    loaded_bytes = measure(lambda: json.loads(CONFIGS_JSON)).current_bytes
+    # configs are loaded while memory is traced, copies of their content kept by templates are counted
+    templates, _, current_bytes, _ = measure(lambda: [Template(**config) for config in json.loads(CONFIGS_JSON)])
+    content_bytes = len(PW_SCF_CONTENT * 10) * N_TEMPLATES
+    print(
+        f"\n{N_TEMPLATES} templates: loaded configs {loaded_bytes / 1024:.0f}KiB, "
+        f"templates {current_bytes / 1024:.0f}KiB, content of all copies {content_bytes / 1024:.0f}KiB"
+    )
+
+    assert len({id(template.content) for template in templates}) == 1
+    assert current_bytes * 4 < content_bytes
@@ -0,0 +1,112 @@
+import timeit
+
+import pytest
+from mat3ra.ade import ContextProvider
+from mat3ra.ade.context.context_provider import merge_providers_context_data
+from mat3ra.esse.models.context_provider import Name
+
+N_CALLS = 20000
+N_REPEATS = 5
+
+PROVIDER = ContextProvider(
+    name=Name.KGridFormDataManager,
+    data={"dimensions": [4, 4, 4], "shifts": [0, 0, 0]},
+    extraData={"materialHash": "abc"},
+    isEdited=False,
+)
+
+EXTERNAL_CONTEXT = {
+    "KGridFormDataManager": {"dimensions": [8, 8, 8], "shifts": [0, 0, 0]},
+    "isKGridFormDataManagerEdited": True,
+    "material": {"formula": "Si2"},
+}
+
+
+def yield_data_with_repeated_lookups(provider, context=None):
+    """Resolution as done before key names were cached: one context lookup per effective value."""
+
+    def get_data_from_context(ctx):
+        if not ctx:
+            return {}
+        result = {}
+        data = ctx.get(f"{provider.name.value}")
+        is_edited = ctx.get(f"is{provider.name.value}Edited")
+        extra_data = ctx.get(f"{provider.name.value}ExtraData")
+        if data is not None:
+            result["data"] = data
+        if is_edited is not None:
+            result["is_edited"] = is_edited
+        if extra_data is not None:
+            result["extra_data"] = extra_data
+        return result
+
+    data = get_data_from_context(context or provider.context).get("data", provider.data)
+    is_edited = get_data_from_context(context or provider.context).get("is_edited", provider.is_edited)
+    extra_data = get_data_from_context(context or provider.context).get("extra_data", provider.extra_data)
+    result = {f"{provider.name.value}": data, f"is{provider.name.value}Edited": is_edited}
+    if extra_data:
+        result[f"{provider.name.value}ExtraData"] = extra_data
+    return result
+
+
+def measure_per_call_seconds(func):
+    return min(timeit.repeat(func, number=N_CALLS, repeat=N_REPEATS)) / N_CALLS
+
+
+def test_yield_data_matches_repeated_lookups():
+    assert PROVIDER.yield_data(EXTERNAL_CONTEXT) == yield_data_with_repeated_lookups(PROVIDER, EXTERNAL_CONTEXT)
+
+
+@pytest.mark.benchmark
+def test_yield_data_per_provider_cost():
+    single_pass = measure_per_call_seconds(lambda: PROVIDER.yield_data(EXTERNAL_CONTEXT))
+    repeated_lookups = measure_per_call_seconds(lambda: yield_data_with_repeated_lookups(PROVIDER, EXTERNAL_CONTEXT))
+    print(f"\nyield_data per provider: {single_pass * 1e6:.2f}us (repeated lookups: {repeated_lookups * 1e6:.2f}us)")
+    assert single_pass < repeated_lookups
+
+
+def create_providers_with_shared_key(count):
+    """Providers of the same name, each contributing five entries to one object key."""
+    return [
+        ContextProvider(
+            name=Name.KGridFormDataManager,
+            data={f"entry_{index}_{entry}": entry for entry in range(5)},
+        )
+        for index in range(count)
+    ]
+
+
+def merge_one_by_one(providers):
+    result = {}
+    for provider in providers:
+        provider.merge_context_data(result)
+    return result
+
+
+def merge_at_once(providers):
+    result = {}
+    merge_providers_context_data(result, providers)
+    return result
+
+
+def test_merge_providers_context_data_matches_merge_one_by_one():
+    providers = create_providers_with_shared_key(800)
+    assert merge_at_once(providers) == merge_one_by_one(providers)
+
+
+@pytest.mark.benchmark
+def test_merge_providers_context_data_scales_linearly():
+    small, large = create_providers_with_shared_key(100), create_providers_with_shared_key(800)
+
+    def measure(func, providers):
+        return min(timeit.repeat(lambda: func(providers), number=5, repeat=N_REPEATS)) / 5
+
+    at_once = {len(providers): measure(merge_at_once, providers) for providers in (small, large)}
+    one_by_one = {len(providers): measure(merge_one_by_one, providers) for providers in (small, large)}
+    print(
+        f"\nmerge 100/800 providers into one key: at once {at_once[100] * 1e3:.2f}/{at_once[800] * 1e3:.2f}ms, "
+        f"one by one {one_by_one[100] * 1e3:.2f}/{one_by_one[800] * 1e3:.2f}ms"
+    )
+    # 8 times the providers, linear cost grows about 8 times, quadratic cost about 64 times
+    assert at_once[800] < at_once[100] * 16
+    assert at_once[800] < one_by_one[800]
@@ -0,0 +1,45 @@
+import json
+
+from mat3ra.ade import Template
+from mat3ra.ade.definition_store import DefinitionStore, write_definition_store
+from rendering_pipeline import measure
+
+N_TEMPLATES = 2000
+
+TEMPLATE_CONTENT = "&CONTROL\n    calculation = 'scf'\n/\n" + "{{ input.SYSTEM }}\n" * 200
+
+TEMPLATE_CONFIGS = [
+    {
+        "applicationName": "espresso",
+        "executableName": "pw.x",
+        "name": f"pw_{index}.in",
+        "content": TEMPLATE_CONTENT,
+        "contextProviders": [{"name": "KGridFormDataManager"}, {"name": "PlanewaveCutoffDataManager"}],
+    }
+    for index in range(N_TEMPLATES)
+]
+
+
+def test_definition_store_cold_start(tmp_path):
+    json_path = tmp_path / "templates.json"
+    json_path.write_text(json.dumps(TEMPLATE_CONFIGS))
+    store_path = str(tmp_path / "templates.bin")
+    write_definition_store(store_path, {"templates": TEMPLATE_CONFIGS})
+
+    def load_from_json():
+        return [Template(**config) for config in json.loads(json_path.read_text())]
+
+    def load_from_store():
+        store = DefinitionStore(store_path)
+        template = store.get_template(store.find("templates", "pw_7.in", "espresso", "pw.x")[0])
+        store.close()
+        return template
+
+    templates, json_seconds, _, json_peak = measure(load_from_json)
+    template, store_seconds, _, store_peak = measure(load_from_store)
+    print(
+        f"\nload {N_TEMPLATES} templates: json+models {json_seconds * 1e3:.1f}ms {json_peak}B, "
+        f"store lookup {store_seconds * 1e3:.1f}ms {store_peak}B"
+    )
+    assert template.to_dict() == templates[7].to_dict()
+    assert store_peak * 10 < json_peak
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from mat3ra.ade.rendering.filters import create_environment
+from rendering_pipeline import CONTEXT_SIZES, best_time, create_context
+
+LOOP_CONTENT = """CELL_PARAMETERS angstrom
+{% for vector in material.lattice.vectors -%}
+{{ vector | join(' ') }}
+{% endfor -%}
+ATOMIC_POSITIONS crystal
+{% for atom in material.atoms -%}
+{{ atom.element }} {{ '%14.9f' | format(atom.coordinate[0]) }} {{ '%14.9f' | format(atom.coordinate[1]) }} \
+{{ '%14.9f' | format(atom.coordinate[2]) }}
+{% endfor -%}
+"""
+
+FILTER_CONTENT = """CELL_PARAMETERS angstrom
+{{ lattice | format_array('%s') }}
+ATOMIC_POSITIONS crystal
+{{ coordinates | format_table(elements) }}
+
+"""
+
+
+def create_array_context(context):
+    material = context["material"]
+    return {
+        "lattice": material["lattice"]["vectors"],
+        "coordinates": np.array([atom["coordinate"] for atom in material["atoms"]]),
+        "elements": [atom["element"] for atom in material["atoms"]],
+    }
+
+
+def test_filters_output_is_identical_to_loops():
+    context = create_context(CONTEXT_SIZES["large"])
+    environment = create_environment()
+    loop_template = environment.from_string(LOOP_CONTENT)
+    filter_template = environment.from_string(FILTER_CONTENT)
+    assert filter_template.render(create_array_context(context)) == loop_template.render(context)
+
+
+@pytest.mark.benchmark
+def test_filters_format_large_supercell_faster():
+    context = create_context(CONTEXT_SIZES["large"])
+    array_context = create_array_context(context)
+    environment = create_environment()
+    loop_template = environment.from_string(LOOP_CONTENT)
+    filter_template = environment.from_string(FILTER_CONTENT)
+    loop_time = best_time(lambda: loop_template.render(context), repeat=20)
+    filter_time = best_time(lambda: filter_template.render(array_context), repeat=20)
+    print(f"\n{CONTEXT_SIZES['large']} atoms: loops {loop_time * 1e3:.2f}ms, array filters {filter_time * 1e3:.2f}ms")
+    assert filter_time * 3 < loop_time
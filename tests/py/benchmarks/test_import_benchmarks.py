@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import mat3ra.ade
+import pytest
+
+SOURCE_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src", "py"))
+
+DEFERRED_MODULES = ["jinja2", "mat3ra.ade.template", "mat3ra.ade.rendering"]
+
+
+def get_import_times(statement):
+    """Run statement in a fresh interpreter with `-X importtime`, return cumulative microseconds by module."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SOURCE_DIRECTORY, os.environ.get("PYTHONPATH", "")])}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], env=env, capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from mat3ra.ade import Application",
+        "from mat3ra.ade import Executable, Flavor",
+    ],
+)
+def test_import_defers_template_machinery(statement):
+    import_times = get_import_times(statement)
+    print(f"\n{statement}: {import_times['mat3ra.ade'] / 1e3:.1f}ms for mat3ra.ade")
+    for module in DEFERRED_MODULES:
+        assert module not in import_times
+
+
+def test_template_machinery_loaded_on_first_use():
+    import_times = get_import_times("import mat3ra.ade; mat3ra.ade.Template")
+    assert "jinja2" in import_times
+    # modules loaded through `importlib.import_module` are not timed themselves, only their imports
+    assert "mat3ra.ade.rendering" in import_times
+
+
+def test_dir_lists_public_names():
+    # loaded names are added to the module globals
+    mat3ra.ade.Template
+    assert dir(mat3ra.ade) == sorted(mat3ra.ade.__all__)
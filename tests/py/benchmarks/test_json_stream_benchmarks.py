@@ -0,0 +1,35 @@
+import os
+
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.json_stream import write_json
+from rendering_pipeline import measure
+
+N_TEMPLATES = 20
+
+# about 2MB of atomic positions per template
+POSITIONS = "\n".join(f"Si {index * 0.001:.6f} 0.250000 0.750000" for index in range(60000))
+
+
+def test_streaming_serialization_memory(tmp_path):
+    templates = [
+        Template(name=f"pw_{index}.in", content="{{ positions }}", rendered=POSITIONS) for index in range(N_TEMPLATES)
+    ]
+    json_path = tmp_path / "templates.json"
+    stream_path = tmp_path / "templates_stream.json"
+
+    def serialize_whole():
+        with open(json_path, "w") as file:
+            file.write("[" + ", ".join(template.to_json() for template in templates) + "]")
+
+    def serialize_streaming():
+        with open(stream_path, "w") as file:
+            write_json(templates, file)
+
+    _, whole_seconds, _, whole_peak = measure(serialize_whole)
+    _, stream_seconds, _, stream_peak = measure(serialize_streaming)
+    print(
+        f"\nserialize {N_TEMPLATES} templates, {os.path.getsize(json_path)}B: "
+        f"to_json {whole_seconds * 1e3:.1f}ms {whole_peak}B, streaming {stream_seconds * 1e3:.1f}ms {stream_peak}B"
+    )
+    assert stream_path.read_text() == json_path.read_text()
+    assert stream_peak * 10 < whole_peak
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.parallel_renderer import ParallelRenderer
+from rendering_pipeline import (
+    CONTEXT_SIZES,
+    best_time,
+    create_context,
+    create_template_config,
+)
+
+N_RENDERS = 400
+N_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(N_WORKERS < 2, reason="parallel speedup needs at least 2 CPUs")
+def test_parallel_render_speedup():
+    template = Template(**create_template_config(10))
+    contexts = [create_context(CONTEXT_SIZES["large"], index) for index in range(N_RENDERS)]
+    templates = [template] * N_RENDERS
+    chunk_size = N_RENDERS // (N_WORKERS * 4)
+
+    with ParallelRenderer(max_workers=1) as renderer:
+        expected = renderer.render(templates, contexts)
+        serial_seconds = best_time(lambda: renderer.render(templates, contexts))
+    with ParallelRenderer(max_workers=N_WORKERS, chunk_size=chunk_size) as renderer:
+        # starts the pool and compiles the template in the workers
+        assert renderer.render(templates, contexts) == expected
+        parallel_seconds = best_time(lambda: renderer.render(templates, contexts))
+    print(
+        f"\nrender {N_RENDERS} large contexts: 1 process {serial_seconds * 1e3:.0f}ms, "
+        f"{N_WORKERS} workers {parallel_seconds * 1e3:.0f}ms, speedup {serial_seconds / parallel_seconds:.1f}x"
+    )
+    # contexts are pruned and pickled in the calling process, which keeps the speedup below linear
+    assert serial_seconds / parallel_seconds > N_WORKERS * 0.5
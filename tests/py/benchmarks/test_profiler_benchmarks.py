@@ -0,0 +1,30 @@
+import timeit
+
+import pytest
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.rendering.profiler import RenderProfiler
+from mat3ra.esse.models.context_provider import Name
+
+N_RENDERS = 2000
+
+
+@pytest.mark.benchmark
+def test_profiler_overhead():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    template = Template(name="pw.in", content="{{ KGridFormDataManager.kgrid }} {{ a }}", contextProviders=[provider])
+
+    def render():
+        for index in range(N_RENDERS):
+            template.render({"a": index})
+
+    def render_profiled():
+        with RenderProfiler():
+            render()
+
+    disabled_seconds = min(timeit.repeat(render, number=1, repeat=5))
+    enabled_seconds = min(timeit.repeat(render_profiled, number=1, repeat=5))
+    print(
+        f"\n{N_RENDERS} renders: profiler disabled {disabled_seconds / N_RENDERS * 1e6:.1f}us per render, "
+        f"enabled {enabled_seconds / N_RENDERS * 1e6:.1f}us per render"
+    )
+    assert disabled_seconds < enabled_seconds
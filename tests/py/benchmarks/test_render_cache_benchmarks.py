@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.render_cache import PersistentRenderCache
+from rendering_pipeline import CONTEXT_SIZES, create_context, create_template_config
+
+N_TEMPLATES = 50
+
+
+def render_all(contexts):
+    templates = [Template(**create_template_config(10)) for _ in contexts]
+    start = time.perf_counter()
+    for template, context in zip(templates, contexts):
+        template.render(context)
+    return time.perf_counter() - start, [template.rendered for template in templates]
+
+
+def render_cold_and_warm(path, contexts):
+    with PersistentRenderCache(path):
+        cold_seconds, cold = render_all(contexts)
+    with PersistentRenderCache(path) as cache:
+        warm_seconds, warm = render_all(contexts)
+    return cold_seconds, cold, warm_seconds, warm, cache
+
+
+def test_warm_render_cache_output_is_identical(tmp_path):
+    contexts = [create_context(CONTEXT_SIZES["small"], index) for index in range(5)]
+    _, expected = render_all(contexts)
+    _, cold, _, warm, cache = render_cold_and_warm(str(tmp_path / "renders.sqlite"), contexts)
+    assert cold == warm == expected
+    assert cache.hits == len(contexts)
+
+
+@pytest.mark.benchmark
+def test_warm_render_cache(tmp_path):
+    contexts = [create_context(CONTEXT_SIZES["large"], index) for index in range(N_TEMPLATES)]
+    uncached_seconds, _ = render_all(contexts)
+    cold_seconds, _, warm_seconds, _, _ = render_cold_and_warm(str(tmp_path / "renders.sqlite"), contexts)
+    print(
+        f"\nrender {N_TEMPLATES} templates, {CONTEXT_SIZES['large']} atoms: no cache {uncached_seconds * 1e3:.1f}ms, "
+        f"cold cache {cold_seconds * 1e3:.1f}ms, warm cache {warm_seconds * 1e3:.1f}ms"
+    )
+    assert warm_seconds < uncached_seconds
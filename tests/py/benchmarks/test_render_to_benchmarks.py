@@ -0,0 +1,30 @@
+from mat3ra.ade import Template
+from rendering_pipeline import measure
+
+CONTENT = """ATOMIC_POSITIONS crystal
+{% for atom in atoms -%}
+{{ atom.element }} {{ '%14.9f' | format(atom.x) }} {{ '%14.9f' | format(atom.y) }} {{ '%14.9f' | format(atom.z) }}
+{% endfor -%}
+"""
+# about 2.4MB of rendered text
+CONTEXT = {"atoms": [{"element": "Si", "x": i * 1e-5, "y": 0.25, "z": 0.75} for i in range(50000)]}
+
+
+def test_render_to_memory(tmp_path):
+    template = Template(name="pw.in", content=CONTENT)
+    template.get_compiled_template()
+    rendered_path = tmp_path / "rendered.in"
+    streamed_path = tmp_path / "streamed.in"
+
+    def render_and_write():
+        template.render(CONTEXT, force=True)
+        with open(rendered_path, "w") as file:
+            file.write(template.rendered)
+
+    rendered_peak = measure(render_and_write).peak_bytes
+    template.rendered = None
+    streamed_peak = measure(lambda: template.render_to(streamed_path, CONTEXT)).peak_bytes
+    size = rendered_path.stat().st_size
+    print(f"\nwrite {size}B input: render and write {rendered_peak}B peak, render_to {streamed_peak}B peak")
+    assert streamed_path.read_text() == rendered_path.read_text()
+    assert streamed_peak * 5 < rendered_peak
@@ -0,0 +1,85 @@
+from copy import deepcopy
+
+import pytest
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.esse.models.context_provider import Name
+from mat3ra.utils.extra.jinja import render_jinja_with_error_handling
+from rendering_pipeline import best_time, measure
+
+N_ATOMS = 5000
+
+CONFIG_TEMPLATE = {
+    "name": "pw_scf.in",
+    "content": (
+        "ATOMIC_POSITIONS crystal\n"
+        "{% for atom in material.atoms %}{{ atom.element }} {{ atom.coordinate | join(' ') }}\n{% endfor %}"
+    ),
+}
+
+LARGE_CONTEXT = {
+    "job": {"_id": "job-id", "workflow": {"units": [{"name": f"unit-{i}"} for i in range(1000)]}},
+    "material": {
+        "atoms": [{"element": "Si", "coordinate": [i * 0.001, 0.25, 0.5]} for i in range(N_ATOMS)],
+    },
+}
+
+
+def deepcopy_clean_rendering_context(context):
+    cleaned = deepcopy(context)
+    cleaned.pop("job", None)
+    return cleaned
+
+
+def test_clean_rendering_context_output_is_identical_to_deepcopy_path():
+    template = Template(**CONFIG_TEMPLATE)
+    expected = render_jinja_with_error_handling(template.content, **deepcopy_clean_rendering_context(LARGE_CONTEXT))
+    template.render(LARGE_CONTEXT)
+    assert template.rendered == expected
+
+
+def test_clean_rendering_context_allocation_savings():
+    template = Template(**CONFIG_TEMPLATE)
+    deepcopy_peak = measure(lambda: deepcopy_clean_rendering_context(LARGE_CONTEXT)).peak_bytes
+    view_peak = measure(lambda: dict(template._clean_rendering_context(LARGE_CONTEXT))).peak_bytes
+    print(f"\n_clean_rendering_context peak allocation: deepcopy={deepcopy_peak}B view={view_peak}B")
+    assert view_peak * 100 < deepcopy_peak
+
+
+def create_template_with_all_providers():
+    providers = [ContextProvider(name=name, data={"kgrid": list(range(100))}) for name in Name]
+    return Template(name="pw.in", content="{{ KGridFormDataManager.kgrid[0] }}", contextProviders=providers)
+
+
+PROVIDER_CONTEXTS = [{"KGridFormDataManager": {"kgrid": [index]}} for index in range(200)]
+
+
+def render_referenced(template):
+    return list(template.render_many(PROVIDER_CONTEXTS))
+
+
+def render_all(template):
+    return [
+        render_jinja_with_error_handling(template.content, **template._get_full_rendering_context(context))
+        for context in PROVIDER_CONTEXTS
+    ]
+
+
+def test_render_of_referenced_providers_is_identical():
+    template = create_template_with_all_providers()
+    expected = [
+        render_jinja_with_error_handling(template.content, **template.get_cleaned_rendering_context(context))
+        for context in PROVIDER_CONTEXTS
+    ]
+    assert render_referenced(template) == render_all(template) == expected
+
+
+@pytest.mark.benchmark
+def test_render_resolves_only_referenced_providers():
+    template = create_template_with_all_providers()
+    referenced_seconds = best_time(lambda: render_referenced(template), repeat=5)
+    all_seconds = best_time(lambda: render_all(template), repeat=5)
+    print(
+        f"\nrender {len(PROVIDER_CONTEXTS)} contexts with {len(Name)} providers: "
+        f"referenced providers {referenced_seconds * 1e3:.1f}ms, all providers {all_seconds * 1e3:.1f}ms"
+    )
+    assert referenced_seconds < all_seconds
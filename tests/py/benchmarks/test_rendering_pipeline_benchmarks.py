@@ -0,0 +1,20 @@
+import pytest
+from rendering_pipeline import (
+    create_cases,
+    find_regressions,
+    format_results,
+    get_threshold,
+    load_baseline,
+    run_case,
+)
+
+CASES = create_cases()
+BASELINE = load_baseline()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(CASES))
+def test_rendering_pipeline_benchmark(name):
+    results = {name: run_case(CASES[name], iterations=50)}
+    print("\n" + format_results(results, BASELINE))
+    assert find_regressions(results, BASELINE, get_threshold()) == []
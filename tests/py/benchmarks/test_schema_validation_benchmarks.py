@@ -0,0 +1,81 @@
+import time
+
+import jsonschema
+import pytest
+from mat3ra.ade import JSONSchemaDataProvider, Template
+from mat3ra.esse.models.context_provider import Name
+from rendering_pipeline import create_context
+
+N_PROVIDERS = 5000
+N_RENDERS = 200
+
+KGRID_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "dimensions": {"type": "array", "items": {"type": "integer", "minimum": 1}, "minItems": 3, "maxItems": 3},
+        "shifts": {"type": "array", "items": {"type": "number"}, "minItems": 3, "maxItems": 3},
+    },
+    "required": ["dimensions", "shifts"],
+}
+
+
+def create_providers(count, validate_on_render=True):
+    return [
+        JSONSchemaDataProvider(
+            name=Name.KGridFormDataManager,
+            data={"dimensions": [index % 8 + 1] * 3, "shifts": [0, 0, 0]},
+            json_schema=dict(KGRID_SCHEMA),
+            validate_on_render=validate_on_render,
+        )
+        for index in range(count)
+    ]
+
+
+def test_validate_many_providers_output():
+    providers = create_providers(100)
+    assert JSONSchemaDataProvider.validate_many(providers) == []
+    providers[3].data = {"dimensions": [0, 4, 4], "shifts": [0, 0, 0]}
+    assert [error["index"] for error in JSONSchemaDataProvider.validate_many(providers)] == [3]
+
+
+@pytest.mark.benchmark
+def test_validate_many_providers():
+    providers = create_providers(N_PROVIDERS)
+    # validating with a new validator per call is slow, measured on a tenth of the providers
+    start = time.perf_counter()
+    for provider in providers[: N_PROVIDERS // 10]:
+        jsonschema.validate(provider.data, provider.json_schema)
+    per_call_time = (time.perf_counter() - start) * 10
+
+    start = time.perf_counter()
+    errors = JSONSchemaDataProvider.validate_many(providers)
+    bulk_time = time.perf_counter() - start
+    start = time.perf_counter()
+    JSONSchemaDataProvider.validate_many(providers)
+    unchanged_time = time.perf_counter() - start
+    print(
+        f"\n{N_PROVIDERS} providers: jsonschema.validate {per_call_time * 1e3:.1f}ms, "
+        f"validate_many {bulk_time * 1e3:.1f}ms, unchanged {unchanged_time * 1e3:.1f}ms"
+    )
+    assert errors == []
+    assert bulk_time * 5 < per_call_time
+
+
+def measure_renders(validate_on_render):
+    template = Template(name="pw.in", content="{{ KGridFormDataManager.dimensions | join(' ') }} {{ JOB_WORK_DIR }}")
+    for provider in create_providers(10, validate_on_render):
+        template.add_context_provider(provider)
+    contexts = [create_context(8, index) for index in range(2)]
+    template.render(contexts[1])
+    start = time.perf_counter()
+    for index in range(N_RENDERS):
+        template.render(contexts[index % 2])
+    return (time.perf_counter() - start) / N_RENDERS
+
+
+@pytest.mark.benchmark
+def test_validation_overhead_per_render():
+    unvalidated = min(measure_renders(False) for _ in range(3))
+    validated = min(measure_renders(True) for _ in range(3))
+    print(f"\nrender with 10 providers: {unvalidated * 1e6:.1f}us unvalidated, {validated * 1e6:.1f}us validated")
+    assert validated < unvalidated * 1.25
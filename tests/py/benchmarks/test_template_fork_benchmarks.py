@@ -0,0 +1,19 @@
+from mat3ra.ade import Template
+from rendering_pipeline import create_context, create_template_config, measure
+
+N_JOBS = 1000
+
+
+def test_fork_memory_per_job():
+    template = Template(**create_template_config(10))
+    context = create_context(8)
+
+    cloned, _, clone_bytes, _ = measure(lambda: [template.clone() for _ in range(N_JOBS)])
+    forked, _, fork_bytes, _ = measure(lambda: [template.fork() for _ in range(N_JOBS)])
+    print(f"\n{N_JOBS} per-job templates: deep clone {clone_bytes / N_JOBS:.0f}B, fork {fork_bytes / N_JOBS:.0f}B each")
+
+    forked[0].render(context)
+    cloned[0].render(context)
+    assert forked[0].rendered == cloned[0].rendered
+    assert template.rendered is None
+    assert fork_bytes * 5 < clone_bytes
@@ -0,0 +1,54 @@
+import pytest
+from mat3ra.ade import Executable, Flavor, FlavorInput, Template
+from mat3ra.ade.trusted_construction import TrustedConstructionMixin, construct_trusted
+from rendering_pipeline import (
+    EXECUTABLE_CONFIG,
+    FLAVOR_CONFIG,
+    best_time,
+    create_providers,
+    create_template_config,
+)
+
+N_TEMPLATES = 2000
+
+
+def create_configs(count):
+    providers = [provider.to_dict() for provider in create_providers(10)]
+    return [
+        {**create_template_config(0), "name": f"pw_{index}.in", "contextProviders": providers} for index in range(count)
+    ]
+
+
+def test_trusted_construction_is_identical():
+    config = create_configs(1)[0]
+    assert Template.from_trusted(config).to_dict() == Template(**config).to_dict()
+
+
+@pytest.mark.benchmark
+def test_trusted_construction_speedup():
+    configs = create_configs(N_TEMPLATES)
+    validated_seconds = best_time(lambda: [Template(**config) for config in configs])
+    trusted_seconds = best_time(lambda: Template.from_trusted_many(configs))
+    print(
+        f"\nconstruct {N_TEMPLATES} templates with 10 providers: validated {validated_seconds * 1e3:.1f}ms, "
+        f"trusted {trusted_seconds * 1e3:.1f}ms"
+    )
+    assert trusted_seconds < validated_seconds * 0.75
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "cls,config",
+    [(Flavor, FLAVOR_CONFIG), (FlavorInput, FLAVOR_CONFIG["input"][1]), (Executable, EXECUTABLE_CONFIG)],
+)
+def test_small_models_are_validated_faster(cls, config):
+    configs = [config] * N_TEMPLATES
+    validated_seconds = best_time(lambda: [cls(**config) for config in configs])
+    trusted_seconds = best_time(lambda: [construct_trusted(cls, config) for config in configs])
+    print(
+        f"\nconstruct {N_TEMPLATES} {cls.__name__}: validated {validated_seconds * 1e3:.1f}ms, "
+        f"trusted {trusted_seconds * 1e3:.1f}ms"
+    )
+    # trusted construction is offered only where it is faster than validation
+    assert not issubclass(cls, TrustedConstructionMixin)
+    assert validated_seconds < trusted_seconds * 1.25
@@ -0,0 +1,179 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mat3ra.ade import ApplicationRegistry, Executable
+from mat3ra.utils import assertion
+
+DEFINITIONS = {
+    "applications": {
+        "espresso": {
+            "shortName": "qe",
+            "summary": "Quantum ESPRESSO",
+            "defaultVersion": "6.3",
+            "versions": [
+                {"version": "6.3", "build": "GNU"},
+                {"version": "6.3", "build": "Intel", "isDefault": True},
+                {"version": "7.2", "build": "GNU"},
+            ],
+        },
+        "vasp": {
+            "defaultVersion": "5.4.4",
+            "versions": [{"version": "5.4.4", "build": "Default"}],
+        },
+    },
+    "executables": {
+        "espresso": {
+            "pw.x": {
+                "isDefault": True,
+                "flavors": {
+                    "pw_scf": {"isDefault": True, "input": [{"name": "pw_scf.in"}]},
+                    "pw_nscf": {"input": [{"templateName": "pw_scf.in", "name": "pw_nscf.in"}]},
+                },
+            },
+            "ph.x": {
+                "supportedApplicationVersions": ["7.2"],
+                "flavors": {"ph_path": {"input": [{"name": "ph_path.in"}]}},
+            },
+        },
+    },
+    "templates": [
+        {
+            "applicationName": "espresso",
+            "executableName": "pw.x",
+            "name": "pw_scf.in",
+            "content": "ecutwfc = {{ cutoff }}",
+        },
+        {
+            "applicationName": "espresso",
+            "executableName": "ph.x",
+            "name": "ph_path.in",
+            "content": "ph",
+        },
+    ],
+}
+
+EXPECTED_DEFAULT_APPLICATION_CONFIG = {
+    "name": "espresso",
+    "shortName": "qe",
+    "summary": "Quantum ESPRESSO",
+    "version": "6.3",
+    "build": "Intel",
+    "isDefault": True,
+}
+
+
+@pytest.fixture
+def registry():
+    return ApplicationRegistry(DEFINITIONS)
+
+
+def test_definitions_are_loaded_lazily_once():
+    calls = []
+    registry = ApplicationRegistry(lambda: calls.append(1) or DEFINITIONS)
+    assert calls == []
+    registry.get_unique_available_application_names()
+    registry.get_application_config("vasp")
+    assert calls == [1]
+
+
+def test_definitions_are_loaded_once_by_concurrent_calls():
+    calls = []
+    start = threading.Barrier(4)
+
+    def load_definitions():
+        calls.append(1)
+        # keeps the build running while the other threads call the registry
+        time.sleep(0.05)
+        return DEFINITIONS
+
+    def get_all_applications():
+        start.wait()
+        return registry.get_all_applications()
+
+    registry = ApplicationRegistry(load_definitions)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: get_all_applications(), range(4)))
+    assert calls == [1]
+    assert all(len(array) == 4 for _, array in results)
+
+
+def test_get_application_config(registry):
+    assertion.assert_deep_almost_equal(EXPECTED_DEFAULT_APPLICATION_CONFIG, registry.get_application_config("espresso"))
+    assert registry.get_application_config("espresso", "6.3", "GNU")["build"] == "GNU"
+    assert registry.get_application_config("espresso", "7.2")["build"] == "GNU"
+    assert registry.get_application_config("espresso", "1.0") is None
+
+
+def test_get_application_config_unknown_application(registry):
+    with pytest.raises(ValueError):
+        registry.get_application_config("unknown")
+
+
+def test_create_application(registry):
+    application = registry.create_application("espresso", version="7.2")
+    assert (application.name, application.version, application.build) == ("espresso", "7.2", "GNU")
+    assert application.get_short_name() == "qe"
+
+
+def test_get_all_applications(registry):
+    tree, array = registry.get_all_applications()
+    assert tree["espresso"]["defaultVersion"] == "6.3"
+    assert set(tree["espresso"]["6.3"]) == {"GNU", "Intel"}
+    assert len(array) == 4
+
+
+@pytest.mark.parametrize(
+    "version,expected_names",
+    [
+        (None, ["pw.x"]),
+        ("6.3", ["pw.x"]),
+        ("7.2", ["pw.x", "ph.x"]),
+    ],
+)
+def test_get_executables(registry, version, expected_names):
+    assert [executable.name for executable in registry.get_executables("espresso", version)] == expected_names
+
+
+def test_get_executable_by_name(registry):
+    assert registry.get_executable_by_name("espresso").name == "pw.x"
+    assert registry.get_executable_by_name("espresso", "ph.x").name == "ph.x"
+    with pytest.raises(ValueError):
+        registry.get_executable_by_name("espresso", "unknown.x")
+
+
+def test_get_executable_flavors(registry):
+    executable = registry.get_executable_by_name("espresso", "pw.x")
+    flavors = registry.get_executable_flavors(executable)
+    assert [flavor.name for flavor in flavors] == ["pw_scf", "pw_nscf"]
+    assert all(flavor.applicationName == "espresso" and flavor.executableName == "pw.x" for flavor in flavors)
+    assert registry.get_flavor_by_name(executable).name == "pw_scf"
+    assert registry.get_flavor_by_name(executable, "pw_nscf").name == "pw_nscf"
+
+
+def test_get_executable_flavors_of_external_executable(registry):
+    executable = Executable(name="pw.x", flavors={"pw_scf": {"input": []}})
+    assert [flavor.name for flavor in registry.get_executable_flavors(executable)] == ["pw_scf"]
+
+
+def test_get_all_flavors_for_application(registry):
+    flavors = registry.get_all_flavors_for_application("espresso", "7.2")
+    assert [flavor.name for flavor in flavors] == ["pw_scf", "pw_nscf", "ph_path"]
+
+
+def test_get_input_as_templates(registry):
+    executable = registry.get_executable_by_name("espresso")
+    flavor = registry.get_flavor_by_name(executable, "pw_nscf")
+    templates = registry.get_input_as_templates(flavor)
+    assert [template.name for template in templates] == ["pw_nscf.in"]
+    rendered = registry.get_input_as_rendered_templates(flavor, {"cutoff": 40})
+    assert rendered[0]["rendered"] == "ecutwfc = 40"
+    assert registry.get_input_as_templates(flavor)[0].rendered is None
+
+
+def test_iterate_input_as_rendered_templates(registry):
+    executable = registry.get_executable_by_name("espresso")
+    flavor = registry.get_flavor_by_name(executable, "pw_scf")
+    rendered = registry.iterate_input_as_rendered_templates(flavor, {"cutoff": 40})
+    assert [template["rendered"] for template in rendered] == ["ecutwfc = 40"]
@@ -0,0 +1,47 @@
+import os
+import stat
+
+import pytest
+from mat3ra.ade.rendering.atomic_file import open_atomic
+
+
+def get_permissions(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@pytest.fixture
+def umask():
+    previous = os.umask(0o027)
+    yield 0o027
+    os.umask(previous)
+
+
+def test_new_file_has_default_permissions(tmp_path, umask):
+    path = str(tmp_path / "pw.in")
+    with open_atomic(path) as file:
+        file.write("text")
+    with open(path) as file:
+        assert file.read() == "text"
+    assert get_permissions(path) == 0o666 & ~umask
+    assert os.listdir(tmp_path) == ["pw.in"]
+
+
+def test_replaced_file_keeps_permissions(tmp_path, umask):
+    path = tmp_path / "pw.in"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    with open_atomic(str(path), "wb") as file:
+        file.write(b"new")
+    assert path.read_bytes() == b"new"
+    assert get_permissions(path) == 0o640
+
+
+def test_temporary_file_removed_on_error(tmp_path):
+    path = tmp_path / "pw.in"
+    path.write_text("old")
+    with pytest.raises(ValueError):
+        with open_atomic(str(path)) as file:
+            file.write("partial")
+            raise ValueError("encoding failed")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["pw.in"]
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.bytecode_cache import DiskBytecodeCache
+from mat3ra.ade.rendering.compiled_template_cache import (
+    CompiledTemplateCache,
+    compiled_template_cache,
+)
+
+CONTENT = "Hello {{ name }}{% for i in items %} {{ i }}{% endfor %}!"
+CONTEXT = {"name": "World", "items": [1, 2]}
+
+
+@pytest.fixture
+def bytecode_cache(tmp_path):
+    return DiskBytecodeCache(str(tmp_path / "bytecode"))
+
+
+def count_files(cache, suffix):
+    return len([name for name in os.listdir(cache.directory) if name.endswith(suffix)])
+
+
+def test_compiled_template_loaded_from_bytecode(bytecode_cache, monkeypatch):
+    first = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    assert first.get(CONTENT).render(CONTEXT) == "Hello World 1 2!"
+    assert count_files(bytecode_cache, ".cache") == 1
+
+    # a fresh cache, as in a new process, does not compile the content
+    second = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    monkeypatch.setattr(second.environment, "compile", lambda *args, **kwargs: pytest.fail("compiled"))
+    assert second.get(CONTENT).render(CONTEXT) == "Hello World 1 2!"
+
+
+def test_required_variables_loaded_from_cache(bytecode_cache, monkeypatch):
+    first = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    assert first.get_required_variables(CONTENT) == frozenset({"name", "items"})
+    assert count_files(bytecode_cache, ".variables") == 1
+
+    second = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    monkeypatch.setattr(second.environment, "parse", lambda *args, **kwargs: pytest.fail("parsed"))
+    assert second.get_required_variables(CONTENT) == frozenset({"name", "items"})
+
+
+def test_invalid_content_not_stored(bytecode_cache):
+    cache = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    assert cache.get_required_variables("Hello {{ name") is None
+    assert os.listdir(bytecode_cache.directory) == []
+
+
+def test_changed_bytecode_file_is_recompiled(bytecode_cache):
+    CompiledTemplateCache(bytecode_cache=bytecode_cache).get(CONTENT)
+    (filename,) = os.listdir(bytecode_cache.directory)
+    with open(os.path.join(bytecode_cache.directory, filename), "wb") as file:
+        file.write(b"truncated")
+
+    assert CompiledTemplateCache(bytecode_cache=bytecode_cache).get(CONTENT).render(CONTEXT) == "Hello World 1 2!"
+
+
+def list_paths(cache):
+    return sorted(os.path.join(cache.directory, name) for name in os.listdir(cache.directory))
+
+
+def test_cleanup_removes_least_recently_used(bytecode_cache):
+    cache = CompiledTemplateCache(bytecode_cache=bytecode_cache)
+    for index in range(3):
+        cache.get(f"{index}: {CONTENT}")
+    paths = list_paths(bytecode_cache)
+    for index, path in enumerate(paths):
+        os.utime(path, (index, index))
+
+    bytecode_cache.max_size = bytecode_cache.get_size() - 1
+    bytecode_cache.cleanup()
+    assert list_paths(bytecode_cache) == paths[1:]
+
+    bytecode_cache.clear()
+    assert bytecode_cache.get_size() == 0
+
+
+def test_template_renders_with_shared_bytecode_cache(bytecode_cache):
+    compiled_template_cache.clear()
+    compiled_template_cache.set_bytecode_cache(bytecode_cache)
+    try:
+        template = Template(name="a.in", content=CONTENT)
+        template.render(CONTEXT)
+    finally:
+        compiled_template_cache.set_bytecode_cache(None)
+        compiled_template_cache.clear()
+    assert template.rendered == "Hello World 1 2!"
+    assert count_files(bytecode_cache, ".cache") == 1
+    assert count_files(bytecode_cache, ".variables") == 1
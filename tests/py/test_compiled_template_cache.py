@@ -0,0 +1,106 @@
+import pytest
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.compiled_template_cache import (
+    CompiledTemplateCache,
+    compiled_template_cache,
+    get_content_hash,
+)
+
+CONTENT_A = "A: {{ value }}"
+CONTENT_B = "B: {{ value }}"
+CONTENT_C = "C: {{ value }}"
+
+CONFIG_TEMPLATE = {
+    "name": "test.in",
+    "content": "Hello {{ name }}!",
+}
+
+CONTEXT = {"name": "World"}
+
+CONFIG_INVALID_SYNTAX = {
+    "name": "test.in",
+    "content": "Hello {{ name",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    compiled_template_cache.clear()
+    yield
+    compiled_template_cache.clear()
+
+
+def test_cache_hit_and_miss_counters():
+    cache = CompiledTemplateCache(max_size=4)
+    first = cache.get(CONTENT_A)
+    second = cache.get(CONTENT_A)
+    assert first is second
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 4}
+
+
+def test_cache_lru_eviction():
+    cache = CompiledTemplateCache(max_size=2)
+    cache.get(CONTENT_A)
+    cache.get(CONTENT_B)
+    cache.get(CONTENT_A)
+    cache.get(CONTENT_C)
+    assert get_content_hash(CONTENT_A) in cache
+    assert get_content_hash(CONTENT_B) not in cache
+    assert get_content_hash(CONTENT_C) in cache
+
+
+def test_cache_resize():
+    cache = CompiledTemplateCache(max_size=3)
+    for content in (CONTENT_A, CONTENT_B, CONTENT_C):
+        cache.get(content)
+    cache.resize(1)
+    assert len(cache) == 1
+    assert get_content_hash(CONTENT_C) in cache
+
+
+def test_template_reuses_compiled_form():
+    template = Template(**CONFIG_TEMPLATE)
+    template.render(CONTEXT)
+    template.render(CONTEXT)
+    assert template.rendered == "Hello World!"
+    assert compiled_template_cache.misses == 1
+    assert compiled_template_cache.hits == 0
+
+
+def test_templates_with_same_content_share_compiled_form():
+    first = Template(**CONFIG_TEMPLATE)
+    second = Template(**CONFIG_TEMPLATE)
+    assert first.get_compiled_template() is second.get_compiled_template()
+    assert compiled_template_cache.get_stats()["hits"] == 1
+
+
+def test_set_content_invalidates_compiled_form():
+    template = Template(**CONFIG_TEMPLATE)
+    template.render(CONTEXT)
+    template.set_content("Bye {{ name }}!")
+    template.render(CONTEXT)
+    assert template.rendered == "Bye World!"
+    assert compiled_template_cache.misses == 2
+
+
+def test_render_syntax_error_message():
+    template = Template(**CONFIG_INVALID_SYNTAX)
+    template.render(CONTEXT)
+    assert template.rendered.startswith("Error rendering template:")
+    assert "Template variables:\n{'name': 'World'}" in template.rendered
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("{{ a }} {{ b.c }}", {"a", "b"}),
+        ("{% for item in items %}{{ item }}{% endfor %}{% set d = 1 %}{{ d }}", {"items"}),
+        ("plain text", set()),
+        (CONFIG_INVALID_SYNTAX["content"], None),
+    ],
+)
+def test_get_required_variables(content, expected):
+    cache = CompiledTemplateCache()
+    variables = cache.get_required_variables(content)
+    assert variables == (None if expected is None else frozenset(expected))
+    assert cache.get_required_variables(content) is variables
@@ -0,0 +1,80 @@
+import json
+
+from mat3ra.ade import Template
+from mat3ra.ade.rendering.compiled_template_cache import get_content_hash
+from mat3ra.ade.rendering.content_store import ContentStore, content_store
+
+CONTENT = "K_POINTS automatic\n{{ kgrid | join(' ') }}\n"
+OTHER_CONTENT = "ecutwfc = {{ cutoff }}\n"
+
+
+def copy_text(text: str) -> str:
+    # a distinct string object with equal value, as loading the same definition twice produces
+    return json.loads(json.dumps(text))
+
+
+def test_intern_returns_stored_text_and_hash():
+    store = ContentStore()
+    first = copy_text(CONTENT)
+    second = copy_text(CONTENT)
+    assert first is not second
+
+    interned, content_hash = store.intern(first)
+    assert interned is first
+    assert content_hash == get_content_hash(CONTENT)
+    assert store.intern(second) == (first, content_hash)
+    assert store.intern(second)[0] is first
+    assert store.get(content_hash) is first
+    assert content_hash in store
+    assert len(store) == 1
+
+
+def test_sweep_releases_unreferenced_texts():
+    store = ContentStore()
+    kept, kept_hash = store.intern(copy_text(CONTENT))
+    released_hash = store.intern(copy_text(OTHER_CONTENT))[1]
+
+    store.sweep()
+    assert kept_hash in store
+    assert released_hash not in store
+    assert store.get_stats() == {"size": 1, "characters": len(kept)}
+
+
+def test_sweep_runs_every_interval():
+    store = ContentStore(sweep_interval=4)
+    for index in range(3):
+        store.intern(f"unreferenced {index}" + "!")
+    assert len(store) == 3
+    # the text being interned is referenced by the caller during the sweep
+    kept, kept_hash = store.intern(copy_text(CONTENT) + "!")
+    assert len(store) == 1
+    assert store.get(kept_hash) is kept
+
+
+def test_templates_share_equal_content():
+    first = Template(name="a.in", content=copy_text(CONTENT))
+    second = Template.from_trusted({"name": "b.in", "content": copy_text(CONTENT)})
+    assert first.content is second.content
+    assert first.content_hash == second.content_hash == get_content_hash(CONTENT)
+    assert content_store.get(first.content_hash) is first.content
+
+
+def test_set_content_interns_new_content():
+    template = Template(name="a.in", content=copy_text(CONTENT))
+    other = Template(name="b.in", content=copy_text(OTHER_CONTENT))
+
+    template.set_content(copy_text(OTHER_CONTENT))
+    assert template.content is other.content
+    assert template.content_hash == get_content_hash(OTHER_CONTENT)
+    template.render({"cutoff": 40})
+    assert template.rendered == "ecutwfc = 40"
+
+
+def test_content_released_with_templates():
+    text = copy_text(CONTENT) + "# released\n"
+    template = Template(name="a.in", content=text)
+    content_hash = template.content_hash
+    del text, template
+
+    content_store.sweep()
+    assert content_hash not in content_store
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from mat3ra.ade import ContextProvider
 from mat3ra.esse.models.context_provider import Name
@@ -220,3 +222,118 @@ def test_get_data():
     provider = ContextProvider(**CONTEXT_PROVIDER_FOR_GET_DATA)
     data = provider._get_data_from_context(EXTERNAL_CONTEXT_FOR_GET_DATA)
     assertion.assert_deep_almost_equal(EXPECTED_DATA_FROM_GET_DATA, data)
+
+
+def test_get_context_keys():
+    provider = ContextProvider(name=Name.KPathFormDataManager)
+    expected = ("KPathFormDataManager", "isKPathFormDataManagerEdited", "KPathFormDataManagerExtraData")
+    assert provider.get_context_keys() == expected
+
+
+class ContextProviderWithCustomData(ContextProvider):
+    def yield_data(self, context=None):
+        return {self.name_str: (context or {}).get("material")}
+
+
+def test_get_context_keys_unknown_for_custom_data_resolution():
+    provider = ContextProviderWithCustomData(name=Name.KPathFormDataManager)
+    assert provider.get_context_keys() is None
+
+
+def test_keys_follow_name_change():
+    provider = ContextProvider(name=Name.KGridFormDataManager)
+    assert provider.is_edited_key == "isKGridFormDataManagerEdited"
+    provider.name = Name.KPathFormDataManager
+    assert provider.name_str == "KPathFormDataManager"
+    assert provider.is_edited_key == "isKPathFormDataManagerEdited"
+    assert provider.extra_data_key == "KPathFormDataManagerExtraData"
+
+
+@pytest.mark.parametrize(
+    "config,context",
+    [
+        (CONTEXT_PROVIDER_WITH_DEFAULT_DATA, None),
+        (CONTEXT_PROVIDER_WITH_DEFAULT_DATA, EXTERNAL_CONTEXT_OVERRIDE),
+        (CONTEXT_PROVIDER_FOR_GET_DATA, None),
+        (CONTEXT_PROVIDER_FOR_GET_DATA, EXTERNAL_CONTEXT_FOR_GET_DATA),
+    ],
+)
+def test_effective_values(config, context):
+    provider = ContextProvider(**config)
+    expected = provider._get_data_from_context(context or provider.context)
+    assert provider._get_effective_data(context) == expected.get("data", provider.data)
+    assert provider._get_effective_is_edited(context) == expected.get("is_edited", provider.is_edited)
+    assert provider._get_effective_extra_data(context) == expected.get("extra_data", provider.extra_data)
+
+
+def test_revision_changes_on_assignment():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    revision = provider.revision
+    provider.data = {"kgrid": "8 8 8"}
+    assert provider.revision > revision
+    revision = provider.revision
+    provider.is_edited = True
+    assert provider.revision > revision
+    revision = provider.revision
+    provider.mark_as_changed()
+    assert provider.revision > revision
+
+
+def test_equal_after_assignment_of_equal_value():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    other = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    provider.data = {"kgrid": "4 4 4"}
+    assert provider.revision != other.revision
+    assert provider == other
+    assert provider.clone() == provider
+    provider.data = {"kgrid": "8 8 8"}
+    assert provider != other
+
+
+class AsyncContextProvider(ContextProvider):
+    async def yield_data_async(self, context=None):
+        await asyncio.sleep(0)
+        return {self.name_str: {"source": "remote"}}
+
+
+def test_yield_data_for_rendering_async_falls_back_to_sync_path():
+    provider = ContextProvider(**CONTEXT_PROVIDER_FOR_GET_DATA)
+    assert not provider.is_async
+    data = asyncio.run(provider.yield_data_for_rendering_async(EXTERNAL_CONTEXT_FOR_GET_DATA))
+    assert data == provider.yield_data_for_rendering(EXTERNAL_CONTEXT_FOR_GET_DATA)
+
+
+@pytest.mark.parametrize(
+    "provider, result_before, provider_context, expected_after",
+    [
+        (PROVIDER_FOR_MERGE_OVERRIDE, RESULT_BEFORE_MERGE_DICT, None, EXPECTED_AFTER_MERGE_DICT),
+        (
+            PROVIDER_FOR_MERGE_DICT,
+            RESULT_BEFORE_MERGE_WITH_CONTEXT,
+            PROVIDER_CONTEXT_FOR_MERGE,
+            EXPECTED_AFTER_MERGE_WITH_CONTEXT,
+        ),
+    ],
+)
+def test_amerge_context_data(provider, result_before, provider_context, expected_after):
+    result = result_before.copy()
+    asyncio.run(provider.amerge_context_data(result, provider_context))
+    assertion.assert_deep_almost_equal(expected_after, result)
+
+
+def test_async_provider():
+    provider = AsyncContextProvider(name=Name.KPathFormDataManager)
+    assert provider.is_async
+    assert provider.get_context_keys() is None
+    result = {"KPathFormDataManager": {"path": "G-X"}}
+    asyncio.run(provider.amerge_context_data(result))
+    assert result == {"KPathFormDataManager": {"path": "G-X", "source": "remote"}}
+
+
+def test_fingerprint():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    other = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    assert provider.fingerprint == other.fingerprint
+    assert provider.fingerprint != ContextProviderWithCustomData(**provider.to_dict()).fingerprint
+    other.data = {"kgrid": "8 8 8"}
+    assert provider.fingerprint != other.fingerprint
@@ -0,0 +1,26 @@
+import pytest
+from mat3ra.ade.rendering.context_view import ExcludedKeysView
+
+CONTEXT = {"job": {"id": 1}, "material": {"formula": "Si2"}, "cutoff": 40}
+EXCLUDED_KEYS = frozenset({"job"})
+EXPECTED_VISIBLE = {"material": {"formula": "Si2"}, "cutoff": 40}
+
+
+def test_view_hides_excluded_keys():
+    view = ExcludedKeysView(CONTEXT, EXCLUDED_KEYS)
+    assert dict(view) == EXPECTED_VISIBLE
+    assert len(view) == 2
+    assert "job" not in view
+    with pytest.raises(KeyError):
+        view["job"]
+
+
+def test_view_shares_values():
+    view = ExcludedKeysView(CONTEXT, EXCLUDED_KEYS)
+    assert view["material"] is CONTEXT["material"]
+
+
+def test_view_does_not_modify_underlying_mapping():
+    context = dict(CONTEXT)
+    dict(ExcludedKeysView(context, EXCLUDED_KEYS))
+    assert context == CONTEXT
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+from mat3ra.ade import Application, Flavor, Template
+from mat3ra.ade.definition_store import (
+    DefinitionStore,
+    flatten_definitions,
+    write_definition_store,
+)
+from mat3ra.utils import assertion
+
+DEFINITIONS = {
+    "applications": {
+        "espresso": {
+            "shortName": "qe",
+            "defaultVersion": "6.3",
+            "versions": [{"version": "6.3", "build": "GNU", "isDefault": True}, {"version": "7.2", "build": "GNU"}],
+        },
+    },
+    "executables": {
+        "espresso": {
+            "pw.x": {
+                "isDefault": True,
+                "monitors": [{"name": "standard_output"}],
+                "flavors": {"pw_scf": {"input": [{"name": "pw_scf.in"}], "supportedApplicationVersions": ["6.3"]}},
+            },
+        },
+    },
+    "templates": [
+        {
+            "applicationName": "espresso",
+            "executableName": "pw.x",
+            "name": "pw_scf.in",
+            "content": "ecutwfc = {{ cutoff }}\nconv_thr = 1e-8 ✓",
+            "contextProviders": [{"name": "KGridFormDataManager"}],
+        },
+        {
+            "applicationName": "espresso",
+            "executableName": "pw.x",
+            "name": "pw_nscf.in",
+            "content": "ecutwfc = {{ cutoff }}\nconv_thr = 1e-8 ✓",
+        },
+    ],
+}
+
+CONFIG_WITH_ALL_VALUE_TYPES = {
+    "name": "test.in",
+    "content": "",
+    "values": [None, True, False, -3, 2.5, "text", {"nested": [1, {"key": "value"}]}],
+}
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = str(tmp_path / "definitions.bin")
+    write_definition_store(path, flatten_definitions(DEFINITIONS))
+    return path
+
+
+def test_store_round_trip(store_path):
+    configs = flatten_definitions(DEFINITIONS)
+    with DefinitionStore(store_path) as store:
+        for kind, kind_configs in configs.items():
+            assert store.count(kind) == len(kind_configs)
+            for index, config in enumerate(kind_configs):
+                assertion.assert_deep_almost_equal(config, store.get_config(kind, index))
+
+
+def test_store_materializes_entities(store_path):
+    with DefinitionStore(store_path) as store:
+        application = store.get_application(0)
+        flavor = store.get_flavor(0)
+        template = store.get_template(0)
+    assert isinstance(application, Application) and application.version == "6.3"
+    assert isinstance(flavor, Flavor) and flavor.executableName == "pw.x"
+    assert isinstance(template, Template) and template.context_providers[0].name_str == "KGridFormDataManager"
+
+
+def test_store_find(store_path):
+    with DefinitionStore(store_path) as store:
+        assert store.find("templates", "pw_nscf.in", "espresso", "pw.x") == [1]
+        assert store.find("executables", "pw.x", "espresso") == [0]
+        assert store.find("applications", "espresso") == [0, 1]
+        assert store.find("templates", "unknown.in", "espresso", "pw.x") == []
+
+
+def test_store_find_matches_omitted_names_with_any_value(store_path):
+    with DefinitionStore(store_path) as store:
+        assert store.find("templates", "pw_scf.in") == [0]
+        assert store.find("templates", "pw_scf.in", "espresso") == [0]
+        assert store.find("templates", "pw_scf.in", executable_name="pw.x") == [0]
+        assert store.find("templates", "pw_scf.in", "vasp") == []
+
+
+def test_store_value_types(tmp_path):
+    path = str(tmp_path / "definitions.bin")
+    write_definition_store(path, {"templates": [CONFIG_WITH_ALL_VALUE_TYPES]})
+    with DefinitionStore(path) as store:
+        assert store.get_config("templates", 0) == CONFIG_WITH_ALL_VALUE_TYPES
+        with pytest.raises(IndexError):
+            store.get_config("templates", 1)
+
+
+def test_store_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 256)
+    with pytest.raises(ValueError):
+        DefinitionStore(str(path))
+
+
+def test_store_write_removes_temporary_file_on_error(tmp_path):
+    with pytest.raises(TypeError):
+        write_definition_store(str(tmp_path / "definitions.bin"), {"templates": [{"name": object()}]})
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("value", [2**63, -(2**63) - 1])
+def test_store_write_rejects_integers_out_of_range(tmp_path, value):
+    config = {**CONFIG_WITH_ALL_VALUE_TYPES, "values": [{"nested": [value]}]}
+    with pytest.raises(ValueError, match=r"values\[0\]\.nested\[0\]"):
+        write_definition_store(str(tmp_path / "definitions.bin"), {"templates": [config]})
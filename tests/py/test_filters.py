@@ -0,0 +1,104 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from jinja2 import Environment
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.rendering.filters import create_environment, format_array, format_table
+from mat3ra.ade.rendering.incremental_context import values_equal
+from mat3ra.esse.models.context_provider import Name
+
+VECTORS = [[5.43, 0, 0], [0, 5.43, 0.5], [0, 0, 5.43]]
+ELEMENTS = ["Si", "Ge", "Si"]
+COORDINATES = [[0.0, 0.0, 0.0], [0.25, 0.25, 0.25], [0.5, 0.123456789012, 1 / 3]]
+
+LOOP_CONTENT = """CELL_PARAMETERS angstrom
+{% for vector in vectors -%}
+{{ vector | join(' ') }}
+{% endfor -%}
+ATOMIC_POSITIONS crystal
+{% for element in elements -%}
+{{ element }}{% for value in coordinates[loop.index0] %} {{ '%14.9f' | format(value) }}{% endfor %}
+{% endfor -%}
+K_POINTS automatic
+{% for k in kgrid %}{{ k }} {% endfor %}
+"""
+
+FILTER_CONTENT = """CELL_PARAMETERS angstrom
+{{ vectors | format_array('%s') }}
+ATOMIC_POSITIONS crystal
+{{ coordinates | format_table(elements) }}
+K_POINTS automatic
+{{ kgrid | format_array('%s ', '') }}
+"""
+
+
+def render(content, context, environment=None):
+    return (environment or create_environment()).from_string(content).render(context)
+
+
+@pytest.mark.parametrize(
+    "to_array",
+    [lambda value: value, np.array, lambda value: np.array(value, dtype=object if value == ELEMENTS else np.float32)],
+)
+def test_filters_match_loops(to_array):
+    context = {"vectors": VECTORS, "elements": ELEMENTS, "coordinates": COORDINATES, "kgrid": [4, 4, 2]}
+    context = {key: to_array(value) for key, value in context.items()}
+    assert render(FILTER_CONTENT, context) == render(LOOP_CONTENT, context, Environment())
+
+
+def test_format_array():
+    assert format_array([1.5, 2]) == "   1.500000000    2.000000000"
+    assert format_array(np.arange(4).reshape(2, 2), "%d", ", ") == "0, 1\n2, 3"
+    assert format_array([[1], [2, 3]], "%s") == "1\n2 3"
+    assert format_array([0.5], "%.1f%%", separator="% ") == "0.5%"
+    assert format_array([]) == ""
+
+
+def test_format_table():
+    assert format_table([[1.0, 2.0], [3.0, 4.0]], range(1, 3), "%.1f", label_format="%3d") == "  1 1.0 2.0\n  2 3.0 4.0"
+    assert format_table(np.array([[1, 2], [3, 4]]), np.array(["Si", "Ge"]), "%d") == "Si 1 2\nGe 3 4"
+    assert format_table([[1], [2, 3]], ["a", "b"], "%s") == "a 1\nb 2 3"
+    with pytest.raises(ValueError):
+        format_table([[1.0, 2.0]], ["a", "b"])
+
+
+def test_template_renders_numpy_provider_data():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"dimensions": np.array([4, 4, 4])})
+    template = Template(
+        name="pw.in",
+        content="{{ KGridFormDataManager.dimensions | format_array('%d') }}\n{{ positions | format_table(elements) }}",
+        contextProviders=[provider],
+    )
+    template.render({"positions": np.array(COORDINATES), "elements": ELEMENTS})
+    assert template.rendered == f"4 4 4\n{format_table(COORDINATES, ELEMENTS)}"
+
+    # arrays are not mistaken for lists of equal numbers, which render differently
+    template.set_content("{{ positions }}")
+    template.render({"positions": [1.0, 2.0]})
+    template.render({"positions": np.array([1.0, 2.0])})
+    assert template.rendered == "[1. 2.]"
+
+
+def test_template_with_numpy_provider_data_is_serialized():
+    provider = ContextProvider(
+        name=Name.KGridFormDataManager, data={"dimensions": np.array([4, 4, 4]), "spacing": np.float64(0.5)}
+    )
+    template = Template(name="pw.in", content="{{ KGridFormDataManager.dimensions | join(' ') }}")
+    template.add_context_provider(provider)
+    assert template.get_rendered_dict()["contextProviders"][0]["data"] == {"dimensions": [4, 4, 4], "spacing": 0.5}
+    assert json.loads(template.get_rendered_json())["rendered"] == "4 4 4"
+    text = io.StringIO()
+    template.write_rendered_json(text)
+    assert text.getvalue() == template.to_json()
+    # the provider keeps its arrays
+    assert isinstance(provider.data["dimensions"], np.ndarray)
+
+
+def test_values_equal_compares_arrays():
+    assert values_equal(np.array([1.0, 2.0]), np.array([1.0, 2.0]))
+    assert not values_equal(np.array([1.0, 2.0]), np.array([1.0, 3.0]))
+    assert not values_equal(np.array([1.0, 2.0]), np.array([1, 2]))
+    assert not values_equal(np.array([1.0, 2.0]), np.array([1.0, 2.0, 3.0]))
+    assert not values_equal(np.array([1.0, 2.0]), [1.0, 2.0])
@@ -0,0 +1,112 @@
+import hashlib
+from enum import Enum
+from typing import List
+
+import numpy as np
+import pytest
+from mat3ra.ade.rendering.context_view import ExcludedKeysView
+from mat3ra.ade.rendering.fingerprint import (
+    get_snapshot_fingerprint,
+    get_stable_fingerprint,
+    get_structural_fingerprint,
+)
+from pydantic import BaseModel
+
+CONTEXT = {"material": {"formula": "Si2", "lattice": [[0, 1], [1, 0]]}, "cutoff": 40}
+CONTEXT_REORDERED = {"cutoff": 40, "material": {"lattice": [[0, 1], [1, 0]], "formula": "Si2"}}
+
+
+def test_fingerprint_ignores_key_order():
+    assert get_structural_fingerprint(CONTEXT) == get_structural_fingerprint(CONTEXT_REORDERED)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {**CONTEXT, "cutoff": 41},
+        {**CONTEXT, "cutoff": 40.0},
+        {**CONTEXT, "material": {"formula": "Si2", "lattice": [[0, 1], [1, 1]]}},
+    ],
+)
+def test_fingerprint_detects_changes(other):
+    assert get_structural_fingerprint(CONTEXT) != get_structural_fingerprint(other)
+
+
+def test_fingerprint_of_mapping_view_and_arrays():
+    view = ExcludedKeysView({**CONTEXT, "job": {"_id": "1"}}, frozenset({"job"}))
+    assert get_structural_fingerprint(view) == get_structural_fingerprint(CONTEXT)
+    assert get_structural_fingerprint({"a": np.array([1.5, 2.5])}) == get_structural_fingerprint(
+        {"a": np.array([1.5, 2.5])}
+    )
+    # arrays render differently from lists of equal numbers
+    assert get_structural_fingerprint({"a": np.array([1.5, 2.5])}) != get_structural_fingerprint({"a": [1.5, 2.5]})
+
+
+def test_fingerprint_with_mixed_key_types():
+    assert get_structural_fingerprint({1: "a", "1": "b"}) != get_structural_fingerprint({1: "b", "1": "a"})
+
+
+def test_stable_fingerprint():
+    view = ExcludedKeysView({**CONTEXT, "job": {"_id": "1"}}, frozenset({"job"}))
+    assert get_stable_fingerprint(view) == get_stable_fingerprint(CONTEXT_REORDERED)
+    assert get_stable_fingerprint({"a": np.array([1.5, 2.5])}) == get_stable_fingerprint({"a": np.array([1.5, 2.5])})
+    assert get_stable_fingerprint({"a": np.array([1.5, 2.5])}) != get_stable_fingerprint({"a": [1.5, 2.5]})
+    assert get_stable_fingerprint({"a": np.array([1, 2])}) != get_stable_fingerprint({"a": np.array([1.0, 2.0])})
+    assert get_stable_fingerprint({**CONTEXT, "cutoff": 41}) != get_stable_fingerprint(CONTEXT)
+    # the same in every process, unlike hashes of repr
+    assert get_stable_fingerprint({"a": [1, "b", None]}) == hashlib.sha256(b'{"a":[1,"b",null]}').hexdigest()
+
+
+def test_stable_fingerprint_without_stable_encoding():
+    assert get_stable_fingerprint({"a": object()}) is None
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+class Label(str):
+    pass
+
+
+class Kpoints(BaseModel):
+    dimensions: List[int]
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        ({"x": [1, 2]}, {"x": (1, 2)}),
+        ({1: "a"}, {"1": "a"}),
+        ({"x": "red"}, {"x": Color.RED}),
+        ({"x": "red"}, {"x": Label("red")}),
+        ({"x": {"dimensions": [1]}}, {"x": Kpoints(dimensions=[1])}),
+        ({"x": {1, 2}}, {"x": [1, 2]}),
+        ({"x": ["\x00tuple", [1, 2]]}, {"x": (1, 2)}),
+    ],
+)
+def test_fingerprint_detects_type_changes(first, second):
+    assert get_structural_fingerprint(first) != get_structural_fingerprint(second)
+    assert get_stable_fingerprint(first) != get_stable_fingerprint(second)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {**CONTEXT, "cutoff": 41},
+        {**CONTEXT, "cutoff": 40.0},
+        {**CONTEXT, "cutoff": True},
+        {**CONTEXT, "material": {"formula": "Si2", "lattice": [[0, 1], (1, 0)]}},
+        {**CONTEXT, "material": {"formula": "Si2", "lattice": np.array([[0, 1], [1, 0]])}},
+    ],
+)
+def test_snapshot_fingerprint_detects_changes(other):
+    assert get_snapshot_fingerprint(CONTEXT) == get_snapshot_fingerprint(
+        {"material": {"formula": "Si2", "lattice": [[0, 1], [1, 0]]}, "cutoff": 40}
+    )
+    assert get_snapshot_fingerprint(CONTEXT) != get_snapshot_fingerprint(other)
+
+
+def test_snapshot_fingerprint_of_unpicklable_values():
+    value = {"a": lambda: 1}
+    assert get_snapshot_fingerprint(value) == get_structural_fingerprint(value)
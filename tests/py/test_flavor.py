@@ -1,4 +1,7 @@
-from mat3ra.ade import Flavor, FlavorInput
+import pytest
+from mat3ra.ade import ContextProvider, Flavor, FlavorInput, Template
+from mat3ra.ade.rendering.render_session import get_current_render_session
+from mat3ra.esse.models.context_provider import Name
 from mat3ra.utils import assertion
 
 FLAVOR_INPUT_MINIMAL_CONFIG = {
@@ -101,7 +104,6 @@ def test_flavor_to_dict():
     assertion.assert_deep_almost_equal(EXPECTED_FLAVOR_TO_DICT, flavor.to_dict())
 
 
-
 def test_flavor_from_dict():
     config = FLAVOR_FROM_DICT_CONFIG
     flavor = Flavor(**config)
@@ -116,3 +118,67 @@ def test_flavor_with_extra_fields():
     assert hasattr(flavor, "custom_field")
     assert flavor.custom_field == "custom_value"
     assert "custom_field" in flavor.to_dict()
+
+
+FLAVOR_WITH_INPUT_CONFIG = {
+    "name": "scf",
+    "executableName": "pw.x",
+    "applicationName": "espresso",
+    "input": [{"templateName": "pw_scf", "name": "pw_scf.in"}, {"name": "ph.in"}],
+}
+
+TEMPLATES_FOR_FLAVOR_INPUT = [
+    Template(name="pw_scf", content="vasp", applicationName="vasp"),
+    Template(name="pw_scf", content="pw", applicationName="espresso", executableName="pw.x"),
+    Template(name="ph.in", content="ph"),
+]
+
+
+def test_flavor_get_input_templates():
+    flavor = Flavor(**FLAVOR_WITH_INPUT_CONFIG)
+    templates = flavor.get_input_templates(TEMPLATES_FOR_FLAVOR_INPUT)
+    assert [(t.name, t.content) for t in templates] == [("pw_scf.in", "pw"), ("ph.in", "ph")]
+
+
+def test_flavor_get_input_templates_missing_template():
+    flavor = Flavor(**FLAVOR_WITH_INPUT_CONFIG)
+    with pytest.raises(ValueError):
+        flavor.get_input_templates(TEMPLATES_FOR_FLAVOR_INPUT[:2])
+
+
+def test_flavor_write_input_files(tmp_path):
+    flavor = Flavor(**FLAVOR_WITH_INPUT_CONFIG)
+    templates = [
+        Template(name="pw_scf", content="prefix = '{{ prefix }}'", applicationName="espresso"),
+        Template(name="ph.in", content="ph {{ prefix }}"),
+    ]
+    directory = tmp_path / "job"
+    written = flavor.write_input_files(templates, str(directory), {"prefix": "si"})
+    assert [template.name for template in written] == ["pw_scf.in", "ph.in"]
+    assert (directory / "pw_scf.in").read_text() == "prefix = 'si'"
+    assert (directory / "ph.in").read_text() == "ph si"
+    assert all(template.rendered is None for template in written)
+
+
+SESSIONS = []
+
+
+class SessionRecordingContextProvider(ContextProvider):
+    def yield_data(self, context=None):
+        SESSIONS.append(get_current_render_session())
+        return super().yield_data(context)
+
+
+@pytest.mark.parametrize("use_session", [True, False])
+def test_flavor_write_input_files_session(tmp_path, use_session):
+    flavor = Flavor(**FLAVOR_WITH_INPUT_CONFIG)
+    provider = SessionRecordingContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    templates = [
+        Template(name=name, content="{{ KGridFormDataManager.kgrid }}", contextProviders=[provider])
+        for name in ("pw_scf", "ph.in")
+    ]
+    SESSIONS.clear()
+    flavor.write_input_files(templates, str(tmp_path), use_session=use_session)
+    assert (tmp_path / "ph.in").read_text() == "4 4 4"
+    assert len(SESSIONS) == (1 if use_session else 2)
+    assert (SESSIONS[0] is not None) == use_session
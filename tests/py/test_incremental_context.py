@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.context.context_provider import merge_rendering_data
+from mat3ra.esse.models.context_provider import Name
+from mat3ra.utils import assertion
+
+CONTENT = "{{ KGridFormDataManager.kgrid }} {{ KPathFormDataManager.path }}"
+
+EXTERNAL_CONTEXT = {"material": {"formula": "Si2"}}
+EXTERNAL_CONTEXT_WITH_KPATH = {"material": {"formula": "Si2"}, "KPathFormDataManager": {"path": "G-L"}}
+
+
+def create_template():
+    providers = [
+        ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}, isEdited=True),
+        ContextProvider(name=Name.KPathFormDataManager, data={"path": "G-X"}, isEdited=True),
+    ]
+    return Template(name="test.in", content=CONTENT, contextProviders=providers)
+
+
+def get_provider_updates(template):
+    return template._rendering_context.provider_updates
+
+
+def get_sequentially_merged_data(template, provider_context):
+    result = {}
+    for provider in template.context_providers:
+        merge_rendering_data(result, provider.yield_data_for_rendering(provider_context))
+    return result
+
+
+def test_unchanged_providers_are_not_resolved_again():
+    template = create_template()
+    template.render(EXTERNAL_CONTEXT)
+    template.render(EXTERNAL_CONTEXT)
+    assert get_provider_updates(template) == 2
+    assert template.rendered == "4 4 4 G-X"
+
+
+def test_only_changed_provider_is_resolved_again():
+    template = create_template()
+    template.render(EXTERNAL_CONTEXT)
+    template.context_providers[0].data = {"kgrid": "8 8 8"}
+    template.render(EXTERNAL_CONTEXT)
+    assert get_provider_updates(template) == 3
+    assert template.rendered == "8 8 8 G-X"
+
+
+def test_provider_changed_in_place_is_resolved_after_mark_as_changed():
+    template = create_template()
+    template.render(EXTERNAL_CONTEXT)
+    provider = template.context_providers[1]
+    provider.data["path"] = "G-K"
+    provider.mark_as_changed()
+    template.render(EXTERNAL_CONTEXT)
+    assert get_provider_updates(template) == 3
+    assert template.rendered == "4 4 4 G-K"
+
+
+@pytest.mark.parametrize("provider_count", [1, 2])
+def test_provider_data_changed_in_place_is_rendered(provider_count):
+    providers = [
+        ContextProvider(name=Name.KGridFormDataManager, data={"a": 1}),
+        ContextProvider(name=Name.KGridFormDataManager, data={"b": 2}),
+    ][:provider_count]
+    template = Template(name="test.in", content="{{ KGridFormDataManager }}", contextProviders=providers)
+    template.render()
+    template.context_providers[0].data["a"] = 5
+    template.render()
+    assert template.rendered == str({"a": 5, "b": 2} if provider_count == 2 else {"a": 5})
+
+
+def test_provider_is_resolved_again_when_its_external_context_slice_changes():
+    template = create_template()
+    template.render(EXTERNAL_CONTEXT)
+    template.render(EXTERNAL_CONTEXT_WITH_KPATH)
+    assert get_provider_updates(template) == 3
+    assert template.rendered == "4 4 4 G-L"
+    template.render({**EXTERNAL_CONTEXT_WITH_KPATH, "material": {"formula": "Ge2"}})
+    assert get_provider_updates(template) == 3
+
+
+def test_added_and_removed_providers():
+    template = create_template()
+    template.render(EXTERNAL_CONTEXT)
+    template.add_context_provider(
+        ContextProvider(name=Name.KGridFormDataManager, data={"shift": "1 1 1"}, extraData={"hash": "abc"})
+    )
+    template.render(EXTERNAL_CONTEXT)
+    assert get_provider_updates(template) == 3
+    assertion.assert_deep_almost_equal(
+        get_sequentially_merged_data(template, EXTERNAL_CONTEXT),
+        template.get_data_from_providers_for_rendering_context(EXTERNAL_CONTEXT),
+    )
+    template.remove_context_provider(template.context_providers[1])
+    assert template.get_data_from_providers_for_rendering_context(EXTERNAL_CONTEXT) == get_sequentially_merged_data(
+        template, EXTERNAL_CONTEXT
+    )
+    assert get_provider_updates(template) == 3
+
+
+def test_merged_data_matches_sequential_merge_after_updates():
+    template = create_template()
+    template.add_context_provider(ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "2 2 2", "x": 1}))
+    template.render(EXTERNAL_CONTEXT)
+    template.context_providers[0].data = {"kgrid": "6 6 6", "y": 2}
+    result = template.get_data_from_providers_for_rendering_context(EXTERNAL_CONTEXT)
+    expected = get_sequentially_merged_data(template, EXTERNAL_CONTEXT)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_aget_provider_data_reuses_unchanged_providers():
+    template = create_template()
+    asyncio.run(template.arender(EXTERNAL_CONTEXT))
+    template.context_providers[1].data = {"path": "G-K"}
+    asyncio.run(template.arender(EXTERNAL_CONTEXT))
+    assert get_provider_updates(template) == 3
+    assert template.rendered == "4 4 4 G-K"
+    assertion.assert_deep_almost_equal(
+        get_sequentially_merged_data(template, EXTERNAL_CONTEXT),
+        template.get_data_from_providers_for_rendering_context(EXTERNAL_CONTEXT),
+    )
@@ -0,0 +1,138 @@
+import jsonschema
+import numpy as np
+import pytest
+from mat3ra.ade import JSONSchemaDataProvider, Template
+from mat3ra.ade.context import json_schema_data_provider
+from mat3ra.ade.context.schema_validation import (
+    SchemaValidationError,
+    ValidatorCache,
+    validator_cache,
+)
+from mat3ra.esse.models.context_provider import Name
+
+KGRID_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "dimensions": {"type": "array", "items": {"type": "integer", "minimum": 1}},
+        "shifts": {"type": "array", "items": {"type": "number"}},
+    },
+    "required": ["dimensions"],
+}
+
+VALID_DATA = {"dimensions": [4, 4, 4], "shifts": [0, 0, 0]}
+INVALID_DATA = {"dimensions": [4, "4", 0]}
+
+
+def create_provider(data=VALID_DATA, schema=KGRID_SCHEMA, **kwargs):
+    return JSONSchemaDataProvider(name=Name.KGridFormDataManager, data=data, json_schema=schema, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def clear_validator_cache():
+    validator_cache.clear()
+    yield
+    validator_cache.clear()
+
+
+def test_validator_cache_shares_validators_by_schema():
+    cache = ValidatorCache(max_size=1)
+    first = cache.get(KGRID_SCHEMA)
+    assert cache.get(dict(KGRID_SCHEMA)) is first
+    cache.get({"type": "string"})
+    assert cache.get_stats() == {"hits": 1, "misses": 2, "size": 1, "max_size": 1}
+    with pytest.raises(jsonschema.SchemaError):
+        cache.get({"type": 1})
+
+
+def test_validation_errors_are_structured():
+    provider = create_provider(INVALID_DATA)
+    assert provider.get_validation_errors() == [
+        {"path": ["dimensions", 1], "message": "'4' is not of type 'integer'", "validator": "type"},
+        {"path": ["dimensions", 2], "message": "0 is less than the minimum of 1", "validator": "minimum"},
+    ]
+    assert create_provider().get_validation_errors() == []
+    assert create_provider(schema=None).get_validation_errors() == []
+
+
+def test_validate_data_raises_on_invalid_data():
+    with pytest.raises(SchemaValidationError) as error:
+        create_provider(INVALID_DATA).validate_data()
+    assert len(error.value.errors) == 2
+    assert "dimensions/1: '4' is not of type 'integer'" in str(error.value)
+    assert isinstance(error.value, ValueError)
+
+    create_provider().validate_data()
+    create_provider(data=None).validate_data()
+
+
+def test_numpy_data_is_validated_as_lists():
+    provider = create_provider({"dimensions": np.array([4, 4, 4]), "shifts": np.zeros(3)})
+    provider.validate_data()
+    assert provider.get_validation_errors({"dimensions": np.array([4, 4, 0]), "shifts": [np.float64(0.5)]}) == [
+        {"path": ["dimensions", 2], "message": "0 is less than the minimum of 1", "validator": "minimum"},
+    ]
+
+
+def test_data_validated_only_when_changed(monkeypatch):
+    provider = create_provider()
+    provider.validate_data()
+    provider.validate_data()
+    assert validator_cache.get_stats()["misses"] == 1
+
+    calls = []
+    monkeypatch.setattr(
+        json_schema_data_provider, "get_validation_errors", lambda validator, data: calls.append(data) or []
+    )
+    provider.validate_data()
+    assert calls == []
+
+    provider.data["dimensions"] = [0]
+    provider.mark_as_changed()
+    provider.validate_data()
+    provider.data = dict(VALID_DATA)
+    provider.validate_data()
+    assert len(calls) == 2
+
+
+def test_render_without_validation():
+    provider = create_provider(INVALID_DATA, validate_on_render=False)
+    template = Template(name="pw.in", content="{{ KGridFormDataManager.dimensions | join(' ') }}")
+    template.add_context_provider(provider)
+    template.render()
+    assert template.rendered == "4 4 0"
+    assert "validate_on_render" not in provider.to_dict()
+
+    provider.validate_on_render = True
+    with pytest.raises(SchemaValidationError):
+        template.render(force=True)
+
+
+def test_render_validates_provider_data():
+    provider = create_provider()
+    template = Template(name="pw.in", content="{{ KGridFormDataManager.dimensions | join(' ') }}")
+    template.add_context_provider(provider)
+    template.render()
+    assert template.rendered == "4 4 4"
+
+    provider.data = INVALID_DATA
+    with pytest.raises(SchemaValidationError):
+        template.render()
+
+    # data given in the external context is validated as well
+    provider.data = VALID_DATA
+    with pytest.raises(SchemaValidationError):
+        template.render({"KGridFormDataManager": INVALID_DATA})
+
+
+def test_validate_many():
+    providers = [create_provider(), create_provider(INVALID_DATA), create_provider(schema=None), create_provider()]
+    errors = JSONSchemaDataProvider.validate_many(providers)
+    assert [(error["index"], error["name"], error["path"]) for error in errors] == [
+        (1, "KGridFormDataManager", ["dimensions", 1]),
+        (1, "KGridFormDataManager", ["dimensions", 2]),
+    ]
+    assert validator_cache.get_stats()["misses"] == 1
+
+    # valid providers are not validated again
+    assert JSONSchemaDataProvider.validate_many([providers[0], providers[3]]) == []
+    assert validator_cache.get_stats() == {"hits": 0, "misses": 1, "size": 1, "max_size": 256}
@@ -0,0 +1,87 @@
+import asyncio
+import io
+import json
+
+import pytest
+from mat3ra.ade import Flavor, Template
+from mat3ra.ade.rendering.json_stream import awrite_json, iter_json_chunks, write_json
+
+LONG_CONTENT = "\n".join(f'Si 0.{index:06d} 0.5 0.25 ✓ "quoted"' for index in range(2000))
+
+VALUES = [
+    {"name": "pw_scf.in", "content": LONG_CONTENT, "rendered": LONG_CONTENT, "tags": ["a", LONG_CONTENT, 1, None]},
+    [1, 2.5, True, None, {"nested": {"key": "value"}}],
+    LONG_CONTENT,
+    {1: "integer key", None: "null key"},
+    {},
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("chunk_size", [1, 100, 1 << 16])
+def test_iter_json_chunks_matches_json_dumps(value, chunk_size):
+    assert "".join(iter_json_chunks(value, chunk_size)) == json.dumps(value)
+
+
+def test_iter_json_chunks_size():
+    chunks = list(iter_json_chunks({"content": LONG_CONTENT}, chunk_size=1000))
+    assert len(chunks) > 1
+    # chunks are closed as soon as they reach the chunk size
+    assert max(len(chunk) for chunk in chunks) < 2 * 1000 * len(json.dumps("✓"))
+
+
+def test_iter_json_chunks_entities():
+    template = Template(name="pw_scf.in", content=LONG_CONTENT, rendered=LONG_CONTENT)
+    flavor = Flavor(name="pw_scf", input=[{"name": "pw_scf.in"}])
+    value = {"flavor": flavor, "templates": [template, template]}
+    expected = {"flavor": flavor.to_dict(), "templates": [template.to_dict(), template.to_dict()]}
+    assert "".join(iter_json_chunks(value, 100)) == json.dumps(expected)
+    assert "".join(iter_json_chunks(template, 100)) == template.to_json()
+
+
+def test_iter_json_chunks_iterator():
+    templates = [Template(name=f"{index}.in", content="{{ a }}") for index in range(3)]
+    generated = (template.get_rendered_dict({"a": 1}) for template in templates)
+    assert json.loads("".join(iter_json_chunks(generated))) == [template.to_dict() for template in templates]
+
+
+@pytest.mark.parametrize("value", VALUES[:3])
+def test_iter_json_chunks_orjson(value):
+    pytest.importorskip("orjson")
+    text = "".join(iter_json_chunks(value, 100, use_orjson=True))
+    assert json.loads(text) == json.loads(json.dumps(value))
+
+
+def test_write_json():
+    template = Template(name="pw_scf.in", content="{{ a }}")
+    file = io.StringIO()
+    template.write_rendered_json(file, {"a": 1})
+    assert file.getvalue() == template.get_rendered_json({"a": 1})
+
+    binary_file = io.BytesIO()
+    write_json(template, binary_file, encoding="utf-8")
+    assert binary_file.getvalue().decode("utf-8") == template.to_json()
+
+
+class AsyncWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self.drain_count = 0
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drain_count += 1
+
+
+def test_awrite_json():
+    template = Template(name="pw_scf.in", content=LONG_CONTENT)
+    writer = AsyncWriter()
+    asyncio.run(awrite_json(template, writer, chunk_size=1000, encoding="utf-8"))
+    assert writer.data.decode("utf-8") == template.to_json()
+    assert writer.drain_count > 1
+
+    writer = AsyncWriter()
+    asyncio.run(template.awrite_rendered_json(writer, encoding="utf-8"))
+    assert writer.data.decode("utf-8") == template.to_json()
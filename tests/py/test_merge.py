@@ -0,0 +1,68 @@
+import pytest
+from mat3ra.ade import ContextProvider
+from mat3ra.ade.context.context_provider import (
+    merge_providers_context_data,
+    merge_rendering_data,
+)
+from mat3ra.ade.rendering.merge import merge_rendering_data_list, merge_values
+from mat3ra.esse.models.context_provider import Name
+
+DATA_LIST = [
+    {"kgrid": {"dimensions": [4, 4, 4], "shifts": [0, 0, 0]}, "cutoff": 40, "path": "G-X"},
+    {"kgrid": {"shifts": [1, 1, 1]}, "cutoff": {"wavefunction": 40}},
+    {"kgrid": {"density": 0.2}, "cutoff": {"density": 320}, "path": None},
+    {"material": {"formula": "Si2"}},
+]
+
+
+def merge_sequentially(data_list):
+    result = {}
+    for data in data_list:
+        merge_rendering_data(result, data)
+    return result
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [{"a": 1}],
+        [{"a": 1}, {"b": 2}, {"a": 3}],
+        [{"a": 1}, 5, {"b": 2}, {"c": 3}],
+        [{"a": 1}, {"b": 2}, None],
+        [1, "x"],
+    ],
+)
+def test_merge_values_matches_sequential_merge(values):
+    expected = merge_sequentially([{"key": value} for value in values])["key"]
+    merged = merge_values(iter(values))
+    assert merged == expected
+    if isinstance(expected, dict):
+        assert list(merged) == list(expected)
+
+
+def test_merge_values_keeps_single_object():
+    value = {"a": 1}
+    assert merge_values([None, value]) is value
+
+
+def test_merge_rendering_data_list_matches_sequential_merge():
+    merged = merge_rendering_data_list(DATA_LIST)
+    expected = merge_sequentially(DATA_LIST)
+    assert merged == expected
+    assert list(merged) == list(expected)
+    assert list(merged["kgrid"]) == list(expected["kgrid"])
+
+
+def test_merge_providers_context_data():
+    providers = [
+        ContextProvider(name=Name.KGridFormDataManager, data={"dimensions": [4, 4, 4]}),
+        ContextProvider(name=Name.KGridFormDataManager, data={"shifts": [0, 0, 0]}, isEdited=True),
+        ContextProvider(name=Name.KPathFormDataManager, data={"path": "G-X"}),
+    ]
+    expected = {"existing": 1, "KGridFormDataManager": {"density": 0.2}}
+    result = {"existing": 1, "KGridFormDataManager": {"density": 0.2}}
+    for provider in providers:
+        provider.merge_context_data(expected)
+    merge_providers_context_data(result, providers)
+    assert result == expected
+    assert list(result) == list(expected)
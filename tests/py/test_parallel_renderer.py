@@ -0,0 +1,97 @@
+import pytest
+from mat3ra.ade import ContextProvider, Flavor, FlavorInput, Template
+from mat3ra.ade.rendering.parallel_renderer import ParallelRenderer
+from mat3ra.esse.models.context_provider import Name
+
+CONFIG_PW_TEMPLATE = {
+    "name": "pw_scf",
+    "applicationName": "espresso",
+    "executableName": "pw.x",
+    "content": "ecutwfc = {{ cutoff }}\nK_POINTS {{ KGridFormDataManager.kgrid }}",
+    "contextProviders": [ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}, isEdited=True)],
+}
+
+CONFIG_MANUALLY_CHANGED_TEMPLATE = {
+    "name": "manual.in",
+    "content": "ecutwfc = {{ cutoff }}",
+    "rendered": "ecutwfc = 100",
+    "isManuallyChanged": True,
+}
+
+CONFIG_FLAVOR = {
+    "name": "pw_scf",
+    "executableName": "pw.x",
+    "applicationName": "espresso",
+    "input": [FlavorInput(templateName="pw_scf", name="pw_scf.in")],
+}
+
+N_RENDERS = 50
+CONTEXTS = [{"cutoff": cutoff, "job": {"_id": "job"}} for cutoff in range(N_RENDERS)]
+EXPECTED_RENDERED = [f"ecutwfc = {cutoff}\nK_POINTS 4 4 4" for cutoff in range(N_RENDERS)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_parallel_render_is_ordered(max_workers):
+    template = Template(**CONFIG_PW_TEMPLATE)
+    with ParallelRenderer(max_workers=max_workers, chunk_size=7) as renderer:
+        assert renderer.render([template] * N_RENDERS, CONTEXTS) == EXPECTED_RENDERED
+
+
+def test_parallel_render_matches_sequential_render():
+    templates = [Template(**CONFIG_PW_TEMPLATE), Template(**CONFIG_MANUALLY_CHANGED_TEMPLATE)]
+    contexts = [{"cutoff": 30}, {"cutoff": 40}]
+    with ParallelRenderer(max_workers=2, chunk_size=1) as renderer:
+        rendered = renderer.render(templates, contexts)
+    for template, context in zip(templates, contexts):
+        template.render(context)
+    assert rendered == [template.get_rendered() for template in templates]
+
+
+def test_parallel_render_context_count_mismatch():
+    with pytest.raises(ValueError):
+        ParallelRenderer(max_workers=1).render([Template(**CONFIG_PW_TEMPLATE)], [])
+
+
+def test_parallel_render_flavor_inputs():
+    flavor = Flavor(**CONFIG_FLAVOR)
+    with ParallelRenderer(max_workers=2, chunk_size=10) as renderer:
+        rendered = renderer.render_flavor_inputs(flavor, [Template(**CONFIG_PW_TEMPLATE)], CONTEXTS)
+    assert rendered == [{"pw_scf.in": text} for text in EXPECTED_RENDERED]
+
+
+def test_parallel_renderer_keeps_pool():
+    template = Template(**CONFIG_PW_TEMPLATE)
+    with ParallelRenderer(max_workers=2, chunk_size=10) as renderer:
+        assert renderer.render([template] * N_RENDERS, CONTEXTS) == EXPECTED_RENDERED
+        pool = renderer._pool
+        assert pool is not None
+        assert renderer.render([template] * N_RENDERS, CONTEXTS) == EXPECTED_RENDERED
+        assert renderer._pool is pool
+    assert renderer._pool is None
+
+
+def test_parallel_render_sends_referenced_variables(monkeypatch):
+    template = Template(
+        **{
+            **CONFIG_PW_TEMPLATE,
+            "contextProviders": [
+                *CONFIG_PW_TEMPLATE["contextProviders"],
+                ContextProvider(name=Name.PlanewaveCutoffDataManager, data={"wavefunction": 40}),
+            ],
+        }
+    )
+    tasks = []
+    monkeypatch.setattr(ParallelRenderer, "_render_tasks", lambda self, contents, chunk: tasks.extend(chunk) or [])
+    ParallelRenderer(max_workers=1).render([template], [{"cutoff": 30, "unused": list(range(100))}])
+    assert tasks == [(template.content_hash, {"cutoff": 30, "KGridFormDataManager": {"kgrid": "4 4 4"}})]
+
+
+def test_parallel_render_error_matches_sequential_render():
+    templates = [Template(name="error.in", content="{{ x.y.z }}") for _ in range(2)]
+    contexts = [{"x": 1}, {"x": 1, "q": 2}]
+    with ParallelRenderer(max_workers=2, chunk_size=1) as renderer:
+        rendered = renderer.render(templates, contexts)
+    for template, context in zip(templates, contexts):
+        template.render(context)
+    assert rendered == [template.get_rendered() for template in templates]
+    assert "'q': 2" in rendered[1]
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.rendering.profiler import RenderProfiler, get_active_profiler
+from mat3ra.esse.models.context_provider import Name
+
+TEMPLATE_PHASES = {"render", "providers", "context", "compile", "execute"}
+
+
+def create_template():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"})
+    return Template(name="pw.in", content="{{ KGridFormDataManager.kgrid }} {{ a }}", contextProviders=[provider])
+
+
+def test_render_phases_are_recorded():
+    template = create_template()
+    with RenderProfiler() as profiler:
+        assert get_active_profiler() is profiler
+        template.render({"a": 1})
+        template.render({"a": 1})
+    assert get_active_profiler() is None
+    assert template.rendered == "4 4 4 1"
+
+    stats = profiler.get_stats()
+    template_stats = stats["templates"]["pw.in"]
+    assert set(template_stats) == TEMPLATE_PHASES
+    assert template_stats["render"]["count"] == 2
+    assert template_stats["context"]["count"] == 2
+    # the second render is skipped
+    assert template_stats["execute"]["count"] == 1
+    assert template_stats["render"]["total_seconds"] >= template_stats["execute"]["total_seconds"] > 0
+    assert stats["providers"]["KGridFormDataManager"]["yield_data"]["count"] == 1
+
+
+@pytest.mark.parametrize("render", ["render_many", "arender", "render_to"])
+def test_other_render_paths_are_recorded(render, tmp_path):
+    template = create_template()
+    with RenderProfiler() as profiler:
+        if render == "arender":
+            asyncio.run(template.arender({"a": 1}))
+        elif render == "render_to":
+            template.render_to(tmp_path / "pw.in", {"a": 1})
+        else:
+            list(template.render_many([{"a": 1}, {"a": 2}]))
+    assert set(profiler.get_stats()["templates"]["pw.in"]) == TEMPLATE_PHASES
+
+
+def test_nothing_is_recorded_without_active_profiler():
+    profiler = RenderProfiler()
+    create_template().render({"a": 1})
+    assert profiler.get_stats() == {"templates": {}, "providers": {}}
+
+
+def test_hook():
+    measurements = []
+    with RenderProfiler(track_allocations=False, hook=lambda *args: measurements.append(args)):
+        create_template().render({"a": 1})
+    assert ("provider", "KGridFormDataManager", "yield_data") in [measurement[:3] for measurement in measurements]
+    assert all(measurement[4] == 0 for measurement in measurements)
+
+
+def test_to_prometheus():
+    profiler = RenderProfiler()
+    profiler.record("template", 'pw "scf".in', "execute", 0.5, 10)
+    profiler.record("template", 'pw "scf".in', "execute", 0.25, -2)
+    text = profiler.to_prometheus()
+    assert "# TYPE mat3ra_ade_template_phase_seconds_total counter" in text
+    assert 'mat3ra_ade_template_phase_seconds_total{template="pw \\"scf\\".in",phase="execute"} 0.75' in text
+    assert 'mat3ra_ade_template_phase_calls_total{template="pw \\"scf\\".in",phase="execute"} 2' in text
+    assert 'mat3ra_ade_template_phase_allocated_blocks{template="pw \\"scf\\".in",phase="execute"} 8' in text
+    assert text.endswith("\n")
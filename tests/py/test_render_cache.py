@@ -0,0 +1,145 @@
+import multiprocessing
+
+import pytest
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.rendering import render_cache as render_cache_module
+from mat3ra.ade.rendering.compiled_template_cache import compiled_template_cache
+from mat3ra.ade.rendering.render_cache import (
+    PersistentRenderCache,
+    get_active_render_cache,
+)
+from mat3ra.esse.models.context_provider import Name
+
+CONTENT = "K_POINTS {{ KGridFormDataManager.dimensions | join(' ') }} {{ material.formula }}"
+CONTEXT = {"material": {"formula": "Si2"}, "job": {"_id": "job-1"}}
+EXPECTED_RENDERED = "K_POINTS 4 4 4 Si2"
+
+
+def create_template(content=CONTENT):
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"dimensions": [4, 4, 4]}, isEdited=True)
+    return Template(name="pw_scf.in", content=content, contextProviders=[provider])
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("Jinja should not be used")
+
+
+def test_cache_active_only_inside_block(tmp_path):
+    cache = PersistentRenderCache(str(tmp_path / "renders.sqlite"))
+    assert get_active_render_cache() is None
+    with cache:
+        assert get_active_render_cache() is cache
+    assert get_active_render_cache() is None
+
+
+def test_warm_render_skips_jinja(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache" / "renders.sqlite")
+    with PersistentRenderCache(path) as cache:
+        template = create_template()
+        template.render(CONTEXT)
+    assert template.rendered == EXPECTED_RENDERED
+    assert cache.get_stats() == {"hits": 0, "misses": 1, "size": 1, "bytes": len(EXPECTED_RENDERED)}
+
+    # a new process would start with empty in-memory caches
+    monkeypatch.setattr(compiled_template_cache, "get", fail)
+    monkeypatch.setattr(compiled_template_cache, "get_required_variables", fail)
+    with PersistentRenderCache(path) as cache:
+        template = create_template()
+        template.render(CONTEXT)
+    assert template.rendered == EXPECTED_RENDERED
+    assert cache.hits == 1
+
+
+def test_different_context_is_rendered(tmp_path):
+    with PersistentRenderCache(str(tmp_path / "renders.sqlite")) as cache:
+        create_template().render(CONTEXT)
+        template = create_template()
+        template.render({"material": {"formula": "Ge2"}})
+    assert template.rendered == "K_POINTS 4 4 4 Ge2"
+    assert cache.get_stats()["size"] == 2
+
+
+@pytest.mark.parametrize(
+    "context,other_context",
+    [
+        ({"material": {"formula": [1, 2]}}, {"material": {"formula": (1, 2)}}),
+        ({"material": {1: "Si2"}}, {"material": {"1": "Si2"}}),
+    ],
+)
+def test_context_of_different_types_is_rendered(tmp_path, context, other_context):
+    with PersistentRenderCache(str(tmp_path / "renders.sqlite")):
+        Template(name="test.in", content="{{ material }}").render(context)
+        template = Template(name="test.in", content="{{ material }}")
+        template.render(other_context)
+    assert template.rendered == str(other_context["material"])
+    assert PersistentRenderCache.get_key("hash", context) != PersistentRenderCache.get_key("hash", other_context)
+
+
+def test_empty_cached_render_is_streamed_as_content(tmp_path):
+    content = "{% if material.formula == 'Si2' %}{% endif %}"
+    with PersistentRenderCache(str(tmp_path / "renders.sqlite")) as cache:
+        Template(name="test.in", content=content).render(CONTEXT)
+        chunks = list(Template(name="test.in", content=content).iter_rendered_chunks(CONTEXT))
+    assert cache.hits == 1
+    assert chunks == [content]
+
+
+def test_excluded_keys_do_not_change_key(tmp_path):
+    with PersistentRenderCache(str(tmp_path / "renders.sqlite")) as cache:
+        create_template().render(CONTEXT)
+        create_template().render({**CONTEXT, "job": {"_id": "job-2"}})
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize(
+    "content,context",
+    [
+        ("{{ material.formula", CONTEXT),
+        ("{{ material.formula }}", {"material": {"formula": object()}}),
+    ],
+)
+def test_errors_and_unstable_contexts_are_not_stored(tmp_path, content, context):
+    with PersistentRenderCache(str(tmp_path / "renders.sqlite")) as cache:
+        template = create_template(content)
+        template.render(context)
+        assert len(cache) == 0
+
+
+def test_size_based_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache_module, "EVICTION_INTERVAL", 1)
+    cache = PersistentRenderCache(str(tmp_path / "renders.sqlite"), max_size=100)
+    for index in range(10):
+        cache.set(f"key-{index}", "x" * 30)
+    assert cache.get_stats()["bytes"] <= 100
+    assert cache.get("key-9") is not None
+    assert cache.get("key-0") is None
+
+
+def test_entries_dropped_on_version_change(tmp_path, monkeypatch):
+    path = str(tmp_path / "renders.sqlite")
+    cache = PersistentRenderCache(path)
+    cache.set("key", "rendered")
+    cache.close()
+    monkeypatch.setattr(render_cache_module, "_get_version", lambda: "other")
+    assert PersistentRenderCache(path).get("key") is None
+
+
+def write_entries(path, worker):
+    cache = PersistentRenderCache(path)
+    for index in range(50):
+        cache.set(f"{worker}-{index}", f"rendered {worker} {index}")
+    cache.close()
+
+
+def test_concurrent_processes(tmp_path):
+    path = str(tmp_path / "renders.sqlite")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=write_entries, args=(path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    cache = PersistentRenderCache(path)
+    assert len(cache) == 200
+    assert cache.get("3-49") == "rendered 3 49"
@@ -0,0 +1,141 @@
+import asyncio
+import weakref
+
+from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.rendering.render_session import (
+    RenderSession,
+    get_current_render_session,
+)
+from mat3ra.esse.models.context_provider import Name
+
+CONTENT = "{{ KGridFormDataManager.kgrid }} {{ PlanewaveCutoffDataManager.wavefunction }}"
+
+CONTEXT = {"material": {"formula": "Si2"}}
+CONTEXT_WITH_KGRID = {"material": {"formula": "Si2"}, "KGridFormDataManager": {"kgrid": "8 8 8"}}
+
+
+class CountingContextProvider(ContextProvider):
+    def yield_data(self, context=None):
+        YIELD_DATA_CALLS.append(self.name_str)
+        return super().yield_data(context)
+
+    def get_context_keys(self):
+        return self.name_str, self.is_edited_key, self.extra_data_key
+
+
+YIELD_DATA_CALLS = []
+
+
+def create_templates(count=3):
+    # separate but equal provider instances in every template
+    return [
+        Template(
+            name=f"pw_{index}.in",
+            content=CONTENT,
+            contextProviders=[
+                CountingContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}),
+                CountingContextProvider(name=Name.PlanewaveCutoffDataManager, data={"wavefunction": 40}),
+            ],
+        )
+        for index in range(count)
+    ]
+
+
+def test_session_resolves_equal_providers_once():
+    templates = create_templates()
+    YIELD_DATA_CALLS.clear()
+    with RenderSession() as session:
+        for template in templates:
+            template.render(CONTEXT)
+    assert [template.rendered for template in templates] == ["4 4 4 40"] * 3
+    assert len(YIELD_DATA_CALLS) == 2
+    assert session.get_stats() == {"hits": 4, "misses": 2, "size": 2}
+
+
+def test_providers_are_resolved_per_template_without_session():
+    templates = create_templates()
+    YIELD_DATA_CALLS.clear()
+    for template in templates:
+        template.render(CONTEXT)
+    assert len(YIELD_DATA_CALLS) == 6
+    assert get_current_render_session() is None
+
+
+def test_session_distinguishes_external_context_and_provider_data():
+    templates = create_templates()
+    templates[1].context_providers[1].data = {"wavefunction": 60}
+    with RenderSession() as session:
+        templates[0].render(CONTEXT)
+        templates[1].render(CONTEXT)
+        templates[2].render(CONTEXT_WITH_KGRID)
+    assert [template.rendered for template in templates] == ["4 4 4 40", "4 4 4 60", "8 8 8 40"]
+    assert session.get_stats() == {"hits": 2, "misses": 4, "size": 4}
+
+
+def test_nested_sessions():
+    outer, inner = RenderSession(), RenderSession()
+    with outer:
+        with inner:
+            assert get_current_render_session() is inner
+        assert get_current_render_session() is outer
+    assert get_current_render_session() is None
+
+
+def test_session_with_arender():
+    templates = create_templates()
+
+    async def render_all():
+        with RenderSession() as session:
+            await asyncio.gather(*(template.arender(CONTEXT) for template in templates))
+        return session
+
+    session = asyncio.run(render_all())
+    assert [template.rendered for template in templates] == ["4 4 4 40"] * 3
+    assert session.misses + session.hits == 6
+    assert len(session) == 2
+
+
+class YieldDataProvider(ContextProvider):
+    def yield_data(self, context=None):
+        return {self.name_str: {"kgrid": "4 4 4"}}
+
+
+class KGridCopyingProvider(ContextProvider):
+    def yield_data(self, context=None):
+        return {self.name_str: (context or {}).get("KGridFormDataManager", {"kgrid": "4 4 4"})}
+
+
+class Context(dict):
+    pass
+
+
+def test_session_resolves_context_modified_in_place_again():
+    template = Template(
+        name="pw.in",
+        content="{{ KGridFormDataManager.kgrid }}",
+        contextProviders=[KGridCopyingProvider(name=Name.KGridFormDataManager)],
+    )
+    context = {"KGridFormDataManager": {"kgrid": "5 5 5"}}
+    with RenderSession():
+        template.render(context)
+        assert template.rendered == "5 5 5"
+        context["KGridFormDataManager"] = {"kgrid": "6 6 6"}
+        template.render(context)
+    assert template.rendered == "6 6 6"
+
+
+def test_session_does_not_keep_external_contexts():
+    template = Template(
+        name="pw.in",
+        content="{{ KGridFormDataManager.kgrid }}",
+        contextProviders=[YieldDataProvider(name=Name.KGridFormDataManager)],
+    )
+    with RenderSession() as session:
+        context = Context(CONTEXT)
+        reference = weakref.ref(context)
+        template.render(context)
+        for _ in range(10):
+            template.render()
+        del context
+        assert reference() is None
+    assert session.get_stats() == {"hits": 9, "misses": 2, "size": 2}
@@ -1,6 +1,14 @@
+import asyncio
+import copy
+import io
 import json
+import os
+import pickle
+import stat
+
 import pytest
 from mat3ra.ade import ContextProvider, Template
+from mat3ra.ade.template import arender_templates, render_batch
 from mat3ra.esse.models.context_provider import Name
 from mat3ra.utils import assertion
 
@@ -207,6 +215,49 @@ def test_set_rendered():
     assert template.rendered == "rendered"
 
 
+@pytest.mark.parametrize(
+    "copy_template",
+    [
+        lambda template: template.clone(),
+        copy.deepcopy,
+        lambda template: pickle.loads(pickle.dumps(template)),
+    ],
+)
+def test_copy_rendered_template(copy_template):
+    template = Template(
+        name="test.in",
+        content="Value: {{ KGridFormDataManager.value }} {{ name }}",
+        contextProviders=[ContextProvider(name=Name.KGridFormDataManager, data={"value": 42})],
+    )
+    template.render({"name": "a"})
+    copied = copy_template(template)
+    assert copied.rendered == "Value: 42 a"
+    copied.render({"name": "b"})
+    assert copied.rendered == "Value: 42 b"
+    assert template.rendered == "Value: 42 a"
+
+
+@pytest.mark.parametrize(
+    "copy_template",
+    [
+        lambda template: Template(**CONFIG_WITH_PROVIDER_DATA),
+        lambda template: template.clone(),
+        copy.deepcopy,
+    ],
+)
+def test_copy_is_equal(copy_template):
+    template = Template(**CONFIG_WITH_PROVIDER_DATA)
+    copied = copy_template(template)
+    # rendering state and caches of one template are not compared
+    template.render()
+    copied.get_referenced_context_providers()
+    assert copied.rendered is None
+    copied.render()
+    assert copied == template
+    copied.set_rendered("edited")
+    assert copied != template
+
+
 def test_add_context_provider():
     template = Template(name="test.in", content="content")
     provider = ContextProvider(name=Name.KGridFormDataManager)
@@ -287,3 +338,369 @@ def test_render_with_external_context_and_provider():
     template.add_context_provider(PROVIDER_KPATH)
     template.render(EXTERNAL_CONTEXT_KPATH)
     assert template.get_rendered() == EXPECTED_EXTERNAL_CONTEXT_RENDER
+
+
+CONFIG_RENDER_MANY = {
+    "name": "pw_scf.in",
+    "content": "ecutwfc = {{ cutoff }}\nK_POINTS {{ KGridFormDataManager.kgrid }}",
+    "contextProviders": [ContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}, isEdited=True)],
+}
+
+CONTEXTS_RENDER_MANY = [
+    {"cutoff": 30},
+    {"cutoff": 40},
+    {"cutoff": 50, "KGridFormDataManager": {"kgrid": "8 8 8"}},
+]
+
+EXPECTED_RENDER_MANY = [
+    "ecutwfc = 30\nK_POINTS 4 4 4",
+    "ecutwfc = 40\nK_POINTS 4 4 4",
+    "ecutwfc = 50\nK_POINTS 8 8 8",
+]
+
+CONFIG_RENDER_BATCH_OTHER = {
+    "name": "ph.in",
+    "content": "tr2_ph = {{ threshold }}",
+}
+
+CONTEXTS_RENDER_BATCH = [{"threshold": "1e-12"}, {"threshold": "1e-14"}]
+
+EXPECTED_RENDER_BATCH = [
+    ["Hello {{ name }}!", "tr2_ph = 1e-12"],
+    ["Hello {{ name }}!", "tr2_ph = 1e-14"],
+]
+
+
+def test_render_many():
+    template = Template(**CONFIG_RENDER_MANY)
+    assert list(template.render_many(CONTEXTS_RENDER_MANY)) == EXPECTED_RENDER_MANY
+    assert template.rendered is None
+
+
+def test_render_many_matches_render():
+    template = Template(**CONFIG_RENDER_MANY)
+    for context, rendered in zip(CONTEXTS_RENDER_MANY, template.render_many(CONTEXTS_RENDER_MANY)):
+        template.render(context)
+        assert template.rendered == rendered
+
+
+class CountingContextProvider(ContextProvider):
+    def yield_data(self, context=None):
+        YIELD_DATA_CALLS.append(context)
+        return super().yield_data(context)
+
+    def get_context_keys(self):
+        return self.name_str, self.is_edited_key, self.extra_data_key
+
+
+YIELD_DATA_CALLS = []
+
+
+def test_render_many_resolves_static_provider_data_once():
+    provider = CountingContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}, isEdited=True)
+    template = Template(**{**CONFIG_RENDER_MANY, "contextProviders": [provider]})
+    YIELD_DATA_CALLS.clear()
+    assert list(template.render_many(CONTEXTS_RENDER_MANY)) == EXPECTED_RENDER_MANY
+    assert len(YIELD_DATA_CALLS) == 2
+
+
+def test_render_many_as_templates():
+    template = Template(**CONFIG_RENDER_MANY)
+    rendered_templates = list(template.render_many(CONTEXTS_RENDER_MANY, as_templates=True))
+    assert [t.rendered for t in rendered_templates] == EXPECTED_RENDER_MANY
+    assert all(t.content == template.content for t in rendered_templates)
+    assert template.rendered is None
+    # each copy renders on its own, without the rendering state of the template or of the other copies
+    rendering_contexts = {id(t._rendering_context) for t in [template, *rendered_templates]}
+    assert len(rendering_contexts) == len(rendered_templates) + 1
+    rendered_templates[0].render(CONTEXTS_RENDER_MANY[1])
+    assert rendered_templates[0].rendered == EXPECTED_RENDER_MANY[1]
+    assert rendered_templates[1].rendered == EXPECTED_RENDER_MANY[1]
+
+
+def test_render_batch():
+    templates = [Template(**CONFIG_MANUALLY_CHANGED), Template(**CONFIG_RENDER_BATCH_OTHER)]
+    assert list(render_batch(templates, CONTEXTS_RENDER_BATCH)) == EXPECTED_RENDER_BATCH
+
+
+def test_render_batch_as_templates():
+    templates = [Template(**CONFIG_MANUALLY_CHANGED), Template(**CONFIG_RENDER_BATCH_OTHER)]
+    batches = list(render_batch(templates, CONTEXTS_RENDER_BATCH, as_templates=True))
+    assert [[t.rendered for t in batch] for batch in batches] == EXPECTED_RENDER_BATCH
+    copies = [t for batch in batches for t in batch]
+    assert len({id(t._rendering_context) for t in [*templates, *copies]}) == len(templates) + len(copies)
+
+
+def test_render_skipped_when_unchanged():
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    template.render(CONTEXT_JINJA_SIMPLE)
+    rendered = template.rendered
+    template.get_rendered_dict(dict(CONTEXT_JINJA_SIMPLE))
+    assert template.skipped_render_count == 1
+    assert template.rendered is rendered
+
+
+@pytest.mark.parametrize(
+    "change,expected_rendered",
+    [
+        (lambda template: template.render({"name": "Mars"}), EXPECTED_RENDERED_JINJA_SIMPLE),
+        (lambda template: template.set_content("Bye {{ name }}!"), "Bye World!"),
+        (lambda template: template.set_rendered("edited"), EXPECTED_RENDERED_JINJA_SIMPLE),
+    ],
+)
+def test_render_not_skipped_when_changed(change, expected_rendered):
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    template.render(CONTEXT_JINJA_SIMPLE)
+    change(template)
+    template.render(CONTEXT_JINJA_SIMPLE)
+    assert template.skipped_render_count == 0
+    assert template.rendered == expected_rendered
+
+
+@pytest.mark.parametrize(
+    "first,second,expected_rendered",
+    [
+        ({"x": [1, 2]}, {"x": (1, 2)}, "(1, 2)"),
+        ({"x": {1: "a"}}, {"x": {"1": "a"}}, "{'1': 'a'}"),
+        ({"x": 1}, {"x": True}, "True"),
+    ],
+)
+def test_render_not_skipped_when_value_type_changed(first, second, expected_rendered):
+    template = Template(name="test.in", content="{{ x }}")
+    template.render(first)
+    template.render(second)
+    assert template.skipped_render_count == 0
+    assert template.rendered == expected_rendered
+
+
+def test_render_not_skipped_when_provider_changed():
+    template = Template(**CONFIG_WITH_PROVIDER_DATA)
+    template.render()
+    template.context_providers[0].data = {"value": 43}
+    template.render()
+    assert template.skipped_render_count == 0
+    assert template.rendered == "Value: 43"
+
+
+def test_render_forced():
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    template.render(CONTEXT_JINJA_SIMPLE)
+    template.render(CONTEXT_JINJA_SIMPLE, force=True)
+    assert template.skipped_render_count == 0
+
+
+class RemoteContextProvider(ContextProvider):
+    async def yield_data_async(self, context=None):
+        REMOTE_CALLS["active"] += 1
+        REMOTE_CALLS["max_active"] = max(REMOTE_CALLS["max_active"], REMOTE_CALLS["active"])
+        await asyncio.sleep(0.01)
+        REMOTE_CALLS["active"] -= 1
+        return {self.name_str: {"value": self.data["value"]}}
+
+
+REMOTE_CALLS = {"active": 0, "max_active": 0}
+
+CONFIG_ARENDER = {
+    "name": "remote.in",
+    "content": "{{ KGridFormDataManager.value }} {{ KPathFormDataManager.value }} {{ QGridFormDataManager.kgrid }}",
+}
+
+
+def create_remote_providers():
+    return [
+        RemoteContextProvider(name=Name.KGridFormDataManager, data={"value": 1}),
+        RemoteContextProvider(name=Name.KPathFormDataManager, data={"value": 2}),
+        ContextProvider(name=Name.QGridFormDataManager, data={"kgrid": "4 4 4"}),
+    ]
+
+
+def test_arender_resolves_providers_concurrently():
+    template = Template(**CONFIG_ARENDER, contextProviders=create_remote_providers())
+    REMOTE_CALLS.update(active=0, max_active=0)
+    asyncio.run(template.arender())
+    assert template.rendered == "1 2 4 4 4"
+    assert REMOTE_CALLS["max_active"] == 2
+
+
+def test_arender_matches_render():
+    template = Template(**CONFIG_RENDER_MANY)
+    other = Template(**CONFIG_RENDER_MANY)
+    for context in CONTEXTS_RENDER_MANY:
+        template.render(context)
+        asyncio.run(other.arender(context))
+        assert other.rendered == template.rendered
+
+
+def test_arender_templates():
+    templates = [Template(**CONFIG_ARENDER, contextProviders=create_remote_providers()) for _ in range(3)]
+    REMOTE_CALLS.update(active=0, max_active=0)
+    asyncio.run(arender_templates(templates))
+    assert [template.rendered for template in templates] == ["1 2 4 4 4"] * 3
+    assert REMOTE_CALLS["max_active"] == 6
+
+
+CONFIG_REQUIRED_VARIABLES = {
+    "name": "pw.in",
+    "content": "{{ KGridFormDataManager.kgrid }} {{ material.formula }}",
+}
+
+
+def create_template_with_unreferenced_provider():
+    providers = [
+        CountingContextProvider(name=Name.KGridFormDataManager, data={"kgrid": "4 4 4"}),
+        CountingContextProvider(name=Name.KPathFormDataManager, data={"path": "G-X"}),
+    ]
+    return Template(**CONFIG_REQUIRED_VARIABLES, contextProviders=providers)
+
+
+def test_required_variables():
+    template = Template(**CONFIG_REQUIRED_VARIABLES)
+    assert template.required_variables == {"KGridFormDataManager", "material"}
+    template.set_content("{{ job.id }} {{ other }}")
+    assert template.required_variables == {"job", "other"}
+
+
+def test_render_skips_unreferenced_providers():
+    template = create_template_with_unreferenced_provider()
+    assert template.get_referenced_context_providers() == template.context_providers[:1]
+    YIELD_DATA_CALLS.clear()
+    template.render({"material": {"formula": "Si2"}, "unused": 1})
+    assert template.rendered == "4 4 4 Si2"
+    assert len(YIELD_DATA_CALLS) == 1
+
+
+def test_render_skipped_when_only_unreferenced_variables_change():
+    template = create_template_with_unreferenced_provider()
+    template.render({"material": {"formula": "Si2"}, "unused": 1})
+    template.render({"material": {"formula": "Si2"}, "unused": 2})
+    assert template.skipped_render_count == 1
+
+
+def test_render_error_lists_full_rendering_context():
+    template = create_template_with_unreferenced_provider()
+    template.set_content("{{ KGridFormDataManager.kgrid }} {{ missing.value.other }}")
+    context = {"job": {"id": 1}, "material": {"formula": "Si2"}}
+    template.render(context)
+    assert template.rendered.startswith("Error rendering template:")
+    full_context = template.get_cleaned_rendering_context(context)
+    assert template.rendered.endswith(f"Template variables:\n{full_context}")
+    assert "KPathFormDataManager" in template.rendered
+
+
+def test_fork_shares_content_and_providers():
+    template = Template(**CONFIG_WITH_PROVIDER_DATA)
+    forked = template.fork(name="job.in")
+    assert forked.name == "job.in"
+    assert forked.content is template.content
+    assert forked.contextProviders is template.contextProviders
+    assert forked.get_compiled_template() is template.get_compiled_template()
+
+
+def test_fork_copies_on_write():
+    provider = ContextProvider(name=Name.KGridFormDataManager, data={"value": 42}, isEdited=True)
+    template = Template(**{**CONFIG_WITH_PROVIDER_DATA, "contextProviders": [provider]})
+    template.render()
+    forked = template.fork()
+    forked.add_context_provider(ContextProvider(name=Name.KPathFormDataManager))
+    forked.set_content("Forked {{ KGridFormDataManager.value }}")
+    forked.render(force=True)
+    assert len(template.contextProviders) == 1
+    assert template.content == CONFIG_WITH_PROVIDER_DATA["content"]
+    assert template.rendered == EXPECTED_RENDERED_WITH_PROVIDER
+    assert forked.rendered == "Forked 42"
+
+
+def test_fork_has_own_rendering_state():
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    template.render(CONTEXT_JINJA_SIMPLE)
+    forked = template.fork()
+    forked.render({"name": "Mars"})
+    template.render(CONTEXT_JINJA_SIMPLE)
+    assert forked.rendered == "Hello Mars!"
+    assert template.rendered == EXPECTED_RENDERED_JINJA_SIMPLE
+    assert template.skipped_render_count == 1
+    assert forked.skipped_render_count == 0
+
+
+@pytest.mark.parametrize("key", ["contextProviders", "context_providers"])
+def test_fork_sets_fields_by_name_or_alias(key):
+    template = Template(**CONFIG_WITH_PROVIDER_DATA)
+    forked = template.fork(**{key: [{"name": Name.KPathFormDataManager.value}]}, is_manually_changed=True)
+    assert [provider.name for provider in forked.contextProviders] == [Name.KPathFormDataManager]
+    assert isinstance(forked.contextProviders[0], ContextProvider)
+    assert forked.isManuallyChanged is True
+    assert not forked.model_extra
+    assert len(template.contextProviders) == 1
+
+
+LARGE_CONTENT = "{% for index in range(count) %}line {{ index }}\n{% endfor %}"
+
+
+def test_iter_rendered_chunks_matches_render():
+    template = Template(name="test.in", content=LARGE_CONTENT)
+    chunks = list(template.iter_rendered_chunks({"count": 1000}, chunk_size=100))
+    assert template.rendered is None
+    assert len(chunks) > 1
+    template.render({"count": 1000})
+    assert "".join(chunks) == template.rendered
+
+
+@pytest.mark.parametrize(
+    "config,context",
+    [
+        (CONFIG_WITH_PROVIDER_DATA, None),
+        (CONFIG_MANUALLY_CHANGED, CONTEXT_JINJA_SIMPLE),
+        ({"name": "test.in", "content": "{{ missing.value }}"}, CONTEXT_JINJA_SIMPLE),
+        ({"name": "test.in", "content": "{% if false %}x{% endif %}"}, None),
+    ],
+)
+def test_render_to_path_matches_render(tmp_path, config, context):
+    template = Template(**config)
+    path = tmp_path / "test.in"
+    template.render_to(str(path), context)
+    template.render(context)
+    assert path.read_text() == template.get_rendered()
+
+
+def test_render_to_file_objects():
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    text = io.StringIO()
+    binary = io.BytesIO()
+    template.render_to(text, CONTEXT_JINJA_SIMPLE)
+    template.render_to(binary, CONTEXT_JINJA_SIMPLE)
+    assert text.getvalue() == EXPECTED_RENDERED_JINJA_SIMPLE
+    assert binary.getvalue() == EXPECTED_RENDERED_JINJA_SIMPLE.encode("utf-8")
+    assert template.rendered is None
+
+
+def test_render_to_keep_rendered(tmp_path):
+    template = Template(**CONFIG_JINJA_SIMPLE)
+    template.render_to(tmp_path / "test.in", CONTEXT_JINJA_SIMPLE, keep_rendered=True)
+    assert template.rendered == EXPECTED_RENDERED_JINJA_SIMPLE
+    template.render(CONTEXT_JINJA_SIMPLE)
+    assert template.skipped_render_count == 1
+    template.render({"name": "Mars"})
+    assert template.rendered == "Hello Mars!"
+
+
+def test_render_to_path_permissions(tmp_path):
+    previous_umask = os.umask(0o022)
+    try:
+        path = tmp_path / "pw.in"
+        Template(**CONFIG_JINJA_SIMPLE).render_to(path, CONTEXT_JINJA_SIMPLE)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        os.chmod(path, 0o600)
+        Template(**CONFIG_JINJA_SIMPLE).render_to(path, CONTEXT_JINJA_SIMPLE)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    finally:
+        os.umask(previous_umask)
+
+
+def test_render_to_path_error_after_output(tmp_path):
+    template = Template(name="test.in", content=LARGE_CONTENT + "{{ missing.value }}")
+    path = tmp_path / "test.in"
+    path.write_text("previous")
+    template.render_to(path, {"count": 1000}, keep_rendered=True, chunk_size=100)
+    assert path.read_text() == template.rendered
+    assert template.rendered.startswith("Error rendering template:")
+    assert [file.name for file in tmp_path.iterdir()] == ["test.in"]
@@ -0,0 +1,57 @@
+import pytest
+from mat3ra.ade import ContextProvider, Flavor, FlavorInput, Template
+from mat3ra.ade.trusted_construction import construct_trusted
+from mat3ra.esse.models.context_provider import Name
+from pydantic import ValidationError
+
+TEMPLATE_CONFIG = {
+    "_id": "tmpl_123",
+    "name": "pw_scf.in",
+    "content": "K_POINTS {{ KGridFormDataManager.dimensions | join(' ') }}",
+    "applicationName": "espresso",
+    "executableName": "pw.x",
+    "contextProviders": [{"name": "KGridFormDataManager", "data": {"dimensions": [4, 4, 4]}}],
+}
+
+FLAVOR_CONFIG = {
+    "name": "pw_scf",
+    "applicationName": "espresso",
+    "executableName": "pw.x",
+    "input": [{"name": "pw_scf.in"}, {"templateName": "pw_scf.in", "name": "pw_nscf.in"}],
+    "results": [{"name": "total_energy"}, "fermi_energy"],
+}
+
+
+def test_template_from_trusted_matches_validated():
+    template = Template.from_trusted(TEMPLATE_CONFIG)
+    assert template.to_dict() == Template(**TEMPLATE_CONFIG).to_dict()
+    assert template.field_id == "tmpl_123"
+    provider = template.contextProviders[0]
+    assert isinstance(provider, ContextProvider)
+    assert provider.name is Name.KGridFormDataManager
+
+
+def test_template_from_trusted_snake_case_keys():
+    template = Template.from_trusted({"name": "a.in", "content": "", "application_name": "espresso"})
+    assert template.applicationName == "espresso"
+
+
+def test_template_from_trusted_renders():
+    template = Template.from_trusted(TEMPLATE_CONFIG)
+    template.render()
+    assert template.rendered == "K_POINTS 4 4 4"
+
+
+def test_construct_trusted_with_nested_models():
+    flavor = construct_trusted(Flavor, FLAVOR_CONFIG)
+    assert all(isinstance(flavor_input, FlavorInput) for flavor_input in flavor.input)
+    assert flavor.to_dict() == Flavor(**FLAVOR_CONFIG).to_dict()
+
+
+def test_validate_trusted():
+    template = Template.from_trusted(TEMPLATE_CONFIG).validate_trusted()
+    assert template.to_dict() == Template(**TEMPLATE_CONFIG).to_dict()
+
+    invalid = Template.from_trusted({"name": "a.in", "content": 1})
+    with pytest.raises(ValidationError):
+        invalid.validate_trusted()